@@ -0,0 +1,90 @@
+# ai_lod.py
+NEAR = 'near'
+MID = 'mid'
+FAR = 'far'
+
+
+class EnemyLOD:
+    """
+        Spends the enemies' AI time where the player can see and feel it.
+
+        Every gameplay step, each enemy body of the Simulation is put into a tier by its
+        distance to the player it follows. Near enemies are stepped by CustomSmoothFollow
+        every step, exactly as before.
+        Mid enemies run it every mid_interval steps and far enemies every far_interval
+        steps, with the time they skipped added to their next step, so they cover the same
+        ground in fewer, larger steps. Far enemies also skip keeping apart from each other,
+        they are spread out again once they come closer. The skipped steps are staggered
+        over the enemies, so each step runs about the same amount of work.
+
+        Health bars of near enemies are refreshed every frame, those of mid and far enemies
+        only while they are still moving from their last step. Damage and healing refresh
+        a bar directly, whatever the tier.
+
+        Attributes:
+            near_distance (float): Enemies closer to the player than this are near.
+            far_distance (float): Enemies at least this far from the player are far, the rest are mid.
+            mid_interval (int): Steps between two updates of a mid enemy.
+            far_interval (int): Steps between two updates of a far enemy.
+            tiers (dict): Maps every enemy body of the last step to its tier.
+            counts (dict): Number of enemies in each tier in the last step.
+            skipped (dict): Maps the body of a mid or far enemy to the seconds it has not been stepped for.
+            ticks (int): Steps run so far, for staggering the mid and far updates.
+
+        Methods:
+            tier_of(distance_squared): Returns the tier for a squared distance to the player.
+            step(bodies, follow, dt): Sorts the enemy bodies into tiers and steps the ones due with follow.
+            update_health_bars(enemies, steps): Refreshes the health bars that can have moved this frame.
+    """
+    def __init__(self, near_distance=30, far_distance=100, mid_interval=4, far_interval=16):
+        self.near_distance = near_distance
+        self.far_distance = far_distance
+        self.mid_interval = mid_interval
+        self.far_interval = far_interval
+        self.tiers = {}
+        self.counts = {NEAR: 0, MID: 0, FAR: 0}
+        self.skipped = {}
+        self.ticks = 0
+        self.__stepped = set()
+        self.__stepped_before = set()
+
+    def tier_of(self, distance_squared):
+        if distance_squared < self.near_distance * self.near_distance:
+            return NEAR
+        if distance_squared < self.far_distance * self.far_distance:
+            return MID
+        return FAR
+
+    def step(self, bodies, follow, dt):
+        tiers = {}
+        counts = {NEAR: 0, MID: 0, FAR: 0}
+        skipped = {}
+        target = follow.target
+        for index, body in enumerate(bodies):
+            tier = self.tier_of((target.x - body.x) ** 2 + (target.y - body.y) ** 2 + (target.z - body.z) ** 2)
+            tiers[body] = tier
+            counts[tier] += 1
+
+            # Time the enemy missed while it was further away is caught up in this step
+            body_dt = self.skipped.get(body, 0) + dt
+            if tier != NEAR and (self.ticks + index) % (self.mid_interval if tier == MID else self.far_interval):
+                skipped[body] = body_dt
+                continue
+            follow.step(body, body_dt, avoid_enemies=tier != FAR)
+            self.__stepped.add(body)
+
+        self.tiers = tiers
+        self.counts = counts
+        self.skipped = skipped
+        self.ticks += 1
+
+    def update_health_bars(self, enemies, steps):
+        # A mid or far enemy is drawn moving from the step it was updated in until the next step
+        for enemy in enemies:
+            body = enemy.body
+            if self.tiers.get(body, NEAR) == NEAR or body in self.__stepped or body in self.__stepped_before:
+                enemy.update_health_bar()
+        if steps:
+            self.__stepped_before = self.__stepped
+            self.__stepped = set()
+
@@ -0,0 +1,219 @@
+# assets.py
+from concurrent.futures import ThreadPoolExecutor
+from copy import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from ursina import load_model, load_texture, application
+from ursina.string_utilities import print_warning
+from panda3d.core import Filename
+from sound import sounds
+
+# Assets every level uses, prefetched while the level start screen is shown and converted by build_assets.py
+LEVEL_MODELS = ['assets/man.fbx', 'assets/CameraMan.glb', 'assets/arena', 'assets/MP5K']
+LEVEL_TEXTURES = ['white_cube']
+LEVEL_SOUNDS = ['assets/shoot_sound.mp3', 'assets/hit_sound.mp3', 'assets/reload_sound.mp3']
+
+# Converted assets and the manifest mapping each source asset to its build
+BUILD_FOLDER = 'assets_build'
+MANIFEST_FILE = BUILD_FOLDER + '/manifest.json'
+MODEL_EXTENSIONS = ('.bam', '.ursinamesh', '.obj', '.glb', '.gltf', '.fbx', '.blend')
+
+
+def find_source(name, folder='.'):
+    """Returns the path of an asset relative to the folder, trying model extensions when the name has none."""
+    if os.path.splitext(name)[1]:
+        return name if os.path.exists(os.path.join(folder, name)) else None
+    for extension in MODEL_EXTENSIONS:
+        if os.path.exists(os.path.join(folder, name + extension)):
+            return name + extension
+    return None
+
+
+def content_hash(path):
+    """Returns the SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest(folder='.'):
+    """Returns the build manifest's entries, or an empty dictionary when nothing has been built."""
+    try:
+        with open(os.path.join(folder, MANIFEST_FILE)) as f:
+            return json.load(f)['assets']
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+class AssetCache:
+    """
+        Preloads and shares the models, textures and sounds used by the game.
+
+        Assets are loaded once and kept as templates. Entities get a copy of a model
+        template, so creating an enemy no longer reads or converts its model file.
+        prefetch() starts loading assets on worker threads, for example while the level
+        start screen is shown, so the frame that starts the level only copies templates.
+        Asking for an asset that is still loading waits for that load instead of
+        starting a second one.
+
+        When build_assets.py has converted an asset and its source has not changed since,
+        the converted .bam model or pre-decoded .wav clip is loaded instead of the source.
+
+        Attributes:
+            models (dict): Maps a model name to its loaded template, or None if it is missing.
+            textures (dict): Maps a texture name to the loaded Texture, or None if it is missing.
+            loaded_sounds (set): Names of the sound clips loaded into the shared SoundPool.
+            load_times (dict): Maps an asset name to how long it took to load, in milliseconds.
+            hits (int): Requests served from an already loaded asset.
+            waits (int): Requests that had to wait for a prefetch still in progress.
+            misses (int): Requests for assets that were never prefetched and loaded on the spot.
+            use_build (bool): Whether converted assets from the build manifest are used.
+            built (set): Names of the assets that were loaded from their build.
+
+        Methods:
+            prefetch(models, textures, sounds): Starts loading assets on the worker threads.
+            build_of(name): Returns the path of an asset's up to date build, or None.
+            model(name): Returns a copy of a model that can be given to an Entity.
+            texture(name): Returns a shared texture.
+            sound(name): Makes sure a clip is loaded into the shared SoundPool.
+            wait(): Blocks until every prefetch has finished.
+            stats(): Returns a dictionary with the cache counters and load times.
+            report(): Returns a short text summary of the counters and load times.
+    """
+    def __init__(self, workers=2, use_build=True):
+        self.use_build = use_build
+        self.built = set()
+        self.__manifest = None
+        self.models = {}
+        self.textures = {}
+        self.loaded_sounds = set()
+        self.load_times = {}
+        self.hits = 0
+        self.waits = 0
+        self.misses = 0
+        self.__pending = {}
+        self.__lock = threading.Lock()
+        self.__executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='AssetCache')
+
+    def __timed(self, name, load):
+        start = time.perf_counter()
+        asset = load()
+        self.load_times[name] = (time.perf_counter() - start) * 1000
+        return asset
+
+    def build_of(self, name):
+        if not self.use_build:
+            return None
+        if self.__manifest is None:
+            self.__manifest = read_manifest(application.asset_folder)
+        entry = self.__manifest.get(name)
+        if entry is None:
+            return None
+        folder = application.asset_folder
+        if not os.path.exists(os.path.join(folder, entry['artefact'])) or not os.path.exists(os.path.join(folder, entry['source'])):
+            return None
+        # A source changed after the last build is loaded from the source until it is rebuilt. Only a source
+        # whose size or modification time differs from the build's is hashed, to tell an edit from a touch
+        source = os.path.join(folder, entry['source'])
+        stat = os.stat(source)
+        if (stat.st_size, stat.st_mtime_ns) != (entry.get('size'), entry.get('mtime_ns')):
+            if content_hash(source) != entry['hash']:
+                return None
+            entry['size'], entry['mtime_ns'] = stat.st_size, stat.st_mtime_ns
+        self.built.add(name)
+        return entry['artefact']
+
+    def __load_built_model(self, name):
+        artefact = self.build_of(name)
+        if artefact is None:
+            return load_model(name, application.asset_folder)
+        return application.base.loader.loadModel(Filename.fromOsSpecific(str(application.asset_folder / artefact)))
+
+    def __load_model(self, name):
+        model = self.__timed(name, lambda: self.__load_built_model(name))
+        if model is None:
+            print_warning(f"missing model: '{name}'")
+        self.models[name] = model
+
+    def __load_texture(self, name):
+        self.textures[name] = self.__timed(name, lambda: load_texture(name))
+
+    def __load_sound(self, name):
+        artefact = self.build_of(name)
+        if artefact is not None:
+            sounds.sources[name] = artefact
+        self.__timed(name, lambda: sounds.preload([name]))
+        self.loaded_sounds.add(name)
+
+    def __submit(self, key, cache, load, name):
+        with self.__lock:
+            if name in cache or key in self.__pending:
+                return
+            self.__pending[key] = self.__executor.submit(load, name)
+
+    def prefetch(self, models=(), textures=(), sounds=()):
+        for name in models:
+            self.__submit(('model', name), self.models, self.__load_model, name)
+        for name in textures:
+            self.__submit(('texture', name), self.textures, self.__load_texture, name)
+        for name in sounds:
+            self.__submit(('sound', name), self.loaded_sounds, self.__load_sound, name)
+
+    def __get(self, key, cache, load, name):
+        if name in cache:
+            self.hits += 1
+            return
+        with self.__lock:
+            future = self.__pending.get(key)
+        if future is not None:
+            self.waits += 1
+            future.result()
+            return
+        self.misses += 1
+        load(name)
+
+    def model(self, name):
+        self.__get(('model', name), self.models, self.__load_model, name)
+        template = self.models[name]
+        if template is None:
+            return None
+        instance = copy(template)
+        instance.clearTexture()
+        instance.name = name
+        return instance
+
+    def texture(self, name):
+        self.__get(('texture', name), self.textures, self.__load_texture, name)
+        return self.textures[name]
+
+    def sound(self, name):
+        self.__get(('sound', name), self.loaded_sounds, self.__load_sound, name)
+
+    def wait(self):
+        with self.__lock:
+            futures = list(self.__pending.values())
+        for future in futures:
+            future.result()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'waits': self.waits,
+            'misses': self.misses,
+            'built': sorted(self.built),
+            'load_times_ms': dict(self.load_times),
+        }
+
+    def report(self):
+        timings = ', '.join(f'{name} {ms:.1f} ms' for name, ms in sorted(self.load_times.items(), key=lambda item: -item[1]))
+        return (f'Assets: {self.hits} hits, {self.waits} waits, {self.misses} misses, {len(self.built)} loaded from the build. '
+                f'Load times: {timings}')
+
+
+# Shared cache for every model, texture and sound clip the game loads
+assets = AssetCache()
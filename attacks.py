@@ -0,0 +1,75 @@
+# attacks.py
+import random
+
+
+class AttackResolver:
+    """
+        Resolves the attacks of every enemy on the player in one pass per gameplay step.
+
+        Instead of every enemy measuring its own distance to the player, the resolver asks
+        the enemy grid for the enemies around the player once and only checks the exact
+        distance of those, so enemies that are nowhere near the player cost nothing. Enemies
+        within attack_range whose cooldown has ended attack together: their damage is summed
+        and taken from the player at once, each one starts its cooldown timer, and the ones
+        that siphon (FancyEnemy and FancyCameraMan) heal themselves by the damage they dealt.
+        The player and the enemies are the Simulation's bodies, so this runs without Ursina;
+        the attacks made are returned for the Simulation to report.
+
+        The grid is built at the start of the step, before the enemies move, so the query
+        reaches margin further than the attack range to catch enemies that moved into it.
+
+        Attributes:
+            timers (TimerWheel): The timers that end the enemies' cooldowns.
+            random (Random): The generator the damage of each attack is drawn from.
+            attack_range (float): Enemies closer to the player than this attack.
+            cooldown (float): Seconds of game time an enemy waits between two attacks.
+            damage (tuple): The lowest and highest damage of one attack.
+            margin (float): How far an enemy can have moved since the grid was built.
+            in_range (dict): The enemies within attack range after the last resolve, as keys.
+            attacks (int): Number of attacks resolved so far.
+
+        Methods:
+            resolve(player, grid, attacks): Finds the enemies in range, lets the ones that are ready
+                                            attack if attacks is True and returns their (enemy, damage).
+    """
+    def __init__(self, timers, rng=random, attack_range=3, cooldown=1, damage=(3, 5), margin=1):
+        self.timers = timers
+        self.random = rng
+        self.attack_range = attack_range
+        self.cooldown = cooldown
+        self.damage = damage
+        self.margin = margin
+        self.in_range = {}
+        self.attacks = 0
+
+    def resolve(self, player, grid, attacks=True):
+        x, y, z = player.x, player.y, player.z
+        range_squared = self.attack_range * self.attack_range
+
+        in_range = {}
+        for enemy in grid.query((x, y, z), self.attack_range + self.margin):
+            # The grid can still hold enemies killed since it was built
+            if enemy.health > 0 and (x - enemy.x) ** 2 + (y - enemy.y) ** 2 + (z - enemy.z) ** 2 < range_squared:
+                in_range[enemy] = None
+        self.in_range = in_range
+
+        made = []
+        if not attacks or player.health <= 0:
+            return made
+        total_damage = 0
+        for enemy in in_range:
+            if enemy.attack_cooldown is not None:
+                continue
+            damage = self.random.randint(*self.damage)
+            total_damage += damage
+            self.attacks += 1
+            enemy.attack_cooldown = self.timers.schedule(self.cooldown, enemy.end_attack_cooldown, owner=enemy)
+            made.append((enemy, damage))
+        if not total_damage:
+            return made
+
+        player.health = max(player.health - total_damage, 0)
+        for enemy, damage in made:
+            if enemy.siphons:
+                enemy.health = min(enemy.health + damage, enemy.max_health)
+        return made
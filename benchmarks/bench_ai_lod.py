@@ -0,0 +1,114 @@
+# bench_ai_lod.py
+"""
+    Benchmark for the distance-based AI level of detail of the enemies.
+
+    Runs main.py with an offscreen window and scatters enemies over the arena
+    around the player, a fifth of them within the near tier and the rest spread up
+    to 400 units away. For every enemy count, the same layout is stepped for a few
+    seconds of game time twice: once with every enemy in the near tier (as if there
+    were no level of detail) and once with the default tiers. Reports the mean
+    milliseconds per gameplay step for the enemies following the player and the health bars, the
+    enemies per tier at the end, and how far the enemies ended up from where they
+    end up without level of detail, for the enemies that started in the near tier
+    and for the others.
+
+    Run from the repository root:
+        python benchmarks/bench_ai_lod.py
+"""
+import argparse
+import math
+import random
+import time
+
+from offscreen import finish, run_main
+
+DT = 1 / 60
+
+
+def layout(count, seed):
+    """Positions around the origin, a fifth of them within 25 units and the rest between 25 and 400."""
+    rng = random.Random(seed)
+    positions = []
+    for index in range(count):
+        distance = rng.uniform(5, 25) if index % 5 == 0 else rng.uniform(25, 400)
+        angle = rng.uniform(0, 2 * math.pi)
+        positions.append((math.cos(angle) * distance, 0.5, math.sin(angle) * distance))
+    return positions
+
+
+def run(game, positions, lod, steps):
+    from ursina import Vec3
+    from enemy import StandardEnemy, FancyEnemy, StandardCameraMan, FancyCameraMan
+    for enemy in game.enemies:
+        game.enemy_pool.release(enemy)
+    classes = [StandardEnemy, FancyEnemy, StandardCameraMan, FancyCameraMan]
+    spawned = []
+    for index, position in enumerate(positions):
+        enemy = game.enemy_pool.acquire(classes[index % len(classes)], Vec3(*position), game.player.controller, game.enemies)
+        game.enemies.add(enemy)
+        spawned.append(enemy)
+
+    simulation = game.game_simulation
+    bodies = [enemy.body for enemy in spawned]
+    lod.ticks = 0
+    lod.skipped = {}
+    follow_time = bars_time = 0
+    for _ in range(steps):
+        simulation.rebuild_grid()
+        start = time.perf_counter()
+        lod.step(bodies, simulation.follow, DT)
+        follow_time += time.perf_counter() - start
+        start = time.perf_counter()
+        lod.update_health_bars(game.enemies, 1)
+        bars_time += time.perf_counter() - start
+    return {
+        'follow_ms': follow_time / steps * 1000,
+        'bars_ms': bars_time / steps * 1000,
+        'counts': dict(lod.counts),
+        'positions': [body.position for body in bodies],
+    }
+
+
+def benchmark(args):
+    def run_benchmark(app, game):
+        from ursina import Vec3
+        from ai_lod import EnemyLOD
+        game.start_level(0)
+        app.step()
+        # Keep the player still at the origin, so both runs follow the same target
+        game.player.controller.position = Vec3(0, 0, 0)
+        simulation_player = game.game_simulation.player
+        simulation_player.x, simulation_player.y, simulation_player.z = 0, 0, 0
+
+        steps = int(args.seconds / DT)
+        print(f"{'enemies':>8} {'tiers':>10} {'follow ms':>10} {'bars ms':>8} {'near/mid/far':>14} "
+              f"{'near drift':>11} {'other drift':>12}")
+        for count in args.counts:
+            positions = layout(count, args.seed)
+            full = run(game, positions, EnemyLOD(near_distance=float('inf')), steps)
+            tiered = run(game, positions, EnemyLOD(), steps)
+            near_distance = EnemyLOD().near_distance
+            drift = {True: 0.0, False: 0.0}
+            for start, exact, approximate in zip(positions, full['positions'], tiered['positions']):
+                near = math.hypot(start[0], start[2]) < near_distance
+                drift[near] = max(drift[near], math.dist(exact, approximate))
+            for label, result in (('none', full), ('default', tiered)):
+                counts = result['counts']
+                print(f"{count:>8} {label:>10} {result['follow_ms']:>10.2f} {result['bars_ms']:>8.2f} "
+                      f"{counts['near']:>4}/{counts['mid']}/{counts['far']:<5} "
+                      f"{'' if result is full else f'{drift[True]:.4f}':>11} {'' if result is full else f'{drift[False]:.3f}':>12}")
+        finish()
+
+    run_main(run_benchmark)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[100, 1000])
+    parser.add_argument('--seconds', type=float, default=2)
+    parser.add_argument('--seed', type=int, default=1)
+    benchmark(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
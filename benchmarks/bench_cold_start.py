@@ -0,0 +1,73 @@
+# bench_cold_start.py
+"""
+    Benchmark for cold starts with and without the asset build.
+
+    Starts a fresh process per run that opens an offscreen window, loads the
+    level's models, texture and sound clips through AssetCache, creates entities
+    for them and renders the first frame. Runs are made once loading from the
+    source assets and once from the builds made by build_assets.py.
+
+    Run from the repository root, after python build_assets.py:
+        python benchmarks/bench_cold_start.py
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+def first_frame(use_build):
+    from pathlib import Path
+    from ursina import Ursina, Entity, application
+    from assets import AssetCache, LEVEL_MODELS, LEVEL_TEXTURES, LEVEL_SOUNDS
+
+    app = Ursina(window_type='offscreen')
+    application.asset_folder = Path(ROOT)
+    start = time.perf_counter()
+    assets = AssetCache(use_build=use_build)
+    for name in LEVEL_MODELS:
+        Entity(model=assets.model(name))
+    for name in LEVEL_TEXTURES:
+        Entity(model='plane', texture=assets.texture(name))
+    for name in LEVEL_SOUNDS:
+        assets.sound(name)
+    app.step()
+    print('assets_ms', (time.perf_counter() - start) * 1000)
+
+
+def run(use_build):
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, __file__, '--child', '--use-build' if use_build else '--no-build'],
+                            cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    total_ms = (time.perf_counter() - start) * 1000
+    assets_ms = float(next(line for line in output.splitlines() if line.startswith('assets_ms')).split()[1])
+    return total_ms, assets_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--use-build', dest='use_build', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--no-build', dest='use_build', action='store_false', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        first_frame(args.use_build)
+        return
+
+    print(f"{'assets':>8} {'first frame (ms)':>17} {'asset loading (ms)':>19}")
+    for use_build in (False, True):
+        results = [run(use_build) for _ in range(args.runs)]
+        total_ms = statistics.median(total for total, _ in results)
+        assets_ms = statistics.median(assets for _, assets in results)
+        print(f"{'build' if use_build else 'source':>8} {total_ms:>17.0f} {assets_ms:>19.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+# bench_hot_paths.py
+"""
+    Micro-benchmarks for the code that runs every frame.
+
+    Runs main.py with an offscreen window, then for every combination of enemy
+    count and bullet count times:
+      - the game simulation's grid rebuild and CustomSmoothFollow.step for every enemy,
+      - update_health_bar of each enemy class,
+      - the attack resolver's pass over the enemies around the player,
+      - the projectile system's pass over the bullets in flight, and Player.update,
+      - save_game_state and load_game_state.
+
+    Times are the median milliseconds per call over the repeats. The results are
+    printed, can be written as JSON, and are compared against a stored baseline;
+    the run fails when a timing is slower than the baseline by more than the
+    threshold and by at least MIN_REGRESSION_MS. Every scenario also times a fixed pure Python workload, and timings
+    are compared relative to it, so a machine that is slower or busier as a whole
+    does not show up as a regression.
+
+    Run from the repository root:
+        python benchmarks/bench_hot_paths.py
+        python benchmarks/bench_hot_paths.py --save-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+
+from offscreen import ROOT, finish, run_main
+
+BASELINE_FILE = os.path.join(ROOT, 'benchmarks', 'baseline_hot_paths.json')
+DT = 1 / 60
+# A timing has to grow by at least this many milliseconds to count as a regression, smaller changes are noise
+MIN_REGRESSION_MS = .05
+
+
+def median_ms(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def calibrate(repeat):
+    """Times a fixed workload that only depends on the machine and the interpreter."""
+    def workload():
+        total = 0.0
+        for index in range(20000):
+            total += (index * .5) ** .5
+        return total
+    return median_ms(workload, repeat)
+
+
+def spawn(game, count):
+    """Places count enemies, cycling through the four classes, on a grid in front of the player."""
+    from ursina import Vec3
+    from enemy import StandardEnemy, FancyEnemy, StandardCameraMan, FancyCameraMan
+    classes = [StandardEnemy, FancyEnemy, StandardCameraMan, FancyCameraMan]
+    side = max(1, int(count ** 0.5))
+    for index in range(count):
+        row, column = divmod(index, side)
+        position = Vec3((column - side / 2) * 3, 0.5, 4 + row * 3)
+        enemy = game.enemy_pool.acquire(classes[index % len(classes)], position, game.player.controller, game.enemies)
+        game.enemies.add(enemy)
+
+
+def clear(game):
+    for enemy in game.enemies:
+        game.enemy_pool.release(enemy)
+    for bullet in list(game.player.weapon.bullet_pool.active):
+        bullet.destroy_bullet()
+
+
+def fire(game, count):
+    from ursina import Vec3
+    pool = game.player.weapon.bullet_pool
+    pool.capacity = max(pool.capacity, count)
+    # Straight up, so the bullets stay in flight for the whole scenario
+    for _ in range(count):
+        pool.acquire(game.player.controller.position + Vec3(0, 2, 0), Vec3(0, 1, 0))
+
+
+def run_scenario(game, enemy_count, bullet_count, repeat):
+    from enemy import StandardEnemy, FancyEnemy, StandardCameraMan, FancyCameraMan
+    clear(game)
+    spawn(game, enemy_count)
+    fire(game, bullet_count)
+    player = game.player
+    simulation = game.game_simulation
+    # Enough health to survive every attack during the scenario
+    player.set_health(10 ** 9)
+    simulation.player.health = 10 ** 9
+    simulation.player.x, simulation.player.y, simulation.player.z = player.controller.position
+    game.simulation_view.sync_bullets(player.weapon.bullet_pool.active)
+    enemies = list(game.enemies)
+    bodies = [enemy.body for enemy in enemies]
+
+    def follow():
+        for body in bodies:
+            simulation.follow.step(body, DT)
+
+    results = {
+        'calibration': calibrate(repeat),
+        'grid_rebuild': median_ms(simulation.rebuild_grid, repeat),
+        'follow_step': median_ms(follow, repeat),
+    }
+    for enemy_class in [StandardEnemy, FancyEnemy, StandardCameraMan, FancyCameraMan]:
+        of_class = [enemy for enemy in enemies if type(enemy) is enemy_class]
+        results[f'{enemy_class.__name__}.update_health_bar'] = median_ms(lambda: [enemy.update_health_bar() for enemy in of_class], repeat)
+    simulation.rebuild_grid()
+    results['attack_resolver'] = median_ms(lambda: simulation.attacks.resolve(simulation.player, simulation.grid), repeat)
+    results['projectiles'] = median_ms(lambda: simulation.projectiles.step(simulation.bullets, simulation.grid, DT), repeat)
+    results['Player.update'] = median_ms(player.update, repeat)
+
+    filename = os.path.join(tempfile.mkdtemp(), 'bench.sav')
+    results['save_game_state'] = median_ms(lambda: (game.save_game_state(filename), game.background_saver.wait()), repeat)
+    results['load_game_state'] = median_ms(lambda: game.load_game_state(filename), repeat)
+    os.remove(filename)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Prints every timing next to its baseline and returns the ones slower than threshold times the baseline."""
+    regressions = []
+    print(f"{'scenario':<22} {'timing':<36} {'ms':>9} {'baseline':>9} {'ratio':>6}")
+    for scenario, timings in results.items():
+        base_timings = baseline.get(scenario, {})
+        # How much slower the machine ran the fixed workload than when the baseline was stored
+        speed = timings['calibration'] / base_timings['calibration'] if 'calibration' in base_timings else 1
+        for name, ms in timings.items():
+            base = base_timings.get(name)
+            ratio = ms / base / speed if base else None
+            flag = ''
+            if ratio is not None and ratio > threshold and ms / speed - base >= MIN_REGRESSION_MS:
+                regressions.append((scenario, name))
+                flag = ' REGRESSION'
+            print(f"{scenario:<22} {name:<36} {ms:>9.4f} {base if base is not None else float('nan'):>9.4f} "
+                  f"{ratio if ratio is not None else float('nan'):>6.2f}{flag}")
+    return regressions
+
+
+def benchmark(args):
+    def run(app, game):
+        game.start_level(0)
+        app.step()
+
+        results = {}
+        for enemy_count in args.enemies:
+            for bullet_count in args.bullets:
+                results[f'enemies={enemy_count},bullets={bullet_count}'] = run_scenario(game, enemy_count, bullet_count, args.repeat)
+
+        report = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'results': results,
+        }
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(report, f, indent=4)
+        if args.save_baseline:
+            with open(BASELINE_FILE, 'w') as f:
+                json.dump(report, f, indent=4)
+            print(f'baseline written to {BASELINE_FILE}')
+
+        baseline = {}
+        if os.path.exists(BASELINE_FILE):
+            with open(BASELINE_FILE) as f:
+                baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.threshold)
+        print(f'{len(regressions)} regression(s) over {args.threshold:.2f}x the baseline')
+        finish(1 if regressions else 0)
+
+    run_main(run)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--enemies', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--bullets', type=int, nargs='+', default=[0, 64])
+    parser.add_argument('--repeat', type=int, default=21)
+    parser.add_argument('--json', help='also write the results to this file')
+    parser.add_argument('--save-baseline', action='store_true', help='store the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=1.5, help='slowdown over the baseline that counts as a regression')
+    benchmark(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+# bench_save_format.py
+"""
+    Benchmark for the save file format.
+
+    Compares the old pickle saves (Ursina Vec3 positions) with the binary save
+    format, plain and zlib compressed. Reports save time, load time and file size
+    for 10, 1,000 and 100,000 enemies.
+
+    Run from the repository root:
+        python benchmarks/bench_save_format.py
+"""
+import argparse
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ursina import Vec3
+from savegame import ENEMY_TYPES, read_game_state, write_atomic, write_game_state
+
+
+def make_game_state(count):
+    return {
+        "player_position": Vec3(1.5, 2, -3),
+        "player_health": 87,
+        "enemies": [(random.choice(ENEMY_TYPES), Vec3(random.uniform(-50, 50), 0.5, random.uniform(-50, 50)),
+                     random.randint(1, 100)) for _ in range(count)],
+        "current_level_index": 2,
+    }
+
+
+def save_pickle(game_state, filename):
+    write_atomic(filename, pickle.dumps(game_state))
+
+
+def load_pickle(filename):
+    with open(filename, "rb") as f:
+        return pickle.load(f)
+
+
+def time_call(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[10, 1000, 100000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    formats = [
+        ("pickle", save_pickle, load_pickle),
+        ("binary", write_game_state, read_game_state),
+        ("binary+zlib", lambda state, filename: write_game_state(state, filename, compress=True), read_game_state),
+    ]
+
+    random.seed(1)
+    print(f"{'enemies':>8} {'format':>12} {'save (ms)':>10} {'load (ms)':>10} {'size (bytes)':>13}")
+    with tempfile.TemporaryDirectory() as folder:
+        for count in args.counts:
+            game_state = make_game_state(count)
+            for name, save, load in formats:
+                filename = os.path.join(folder, name)
+                save_ms = time_call(lambda: save(game_state, filename), args.repeat)
+                load_ms = time_call(lambda: load(filename), args.repeat)
+                size = os.path.getsize(filename)
+                print(f"{count:>8} {name:>12} {save_ms:>10.2f} {load_ms:>10.2f} {size:>13}")
+
+
+if __name__ == '__main__':
+    main()
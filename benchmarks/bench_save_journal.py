@@ -0,0 +1,88 @@
+# bench_save_journal.py
+"""
+    Benchmark for journaled saves.
+
+    Compares rewriting the full binary save with appending to the save journal
+    when only a few enemies and the player changed between saves. Reports the
+    time per save and the bytes written per save for 1,000, 10,000 and 100,000
+    enemies.
+
+    Run from the repository root:
+        python benchmarks/bench_save_journal.py
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from registry import EnemyRegistry
+from savegame import SaveJournal, write_game_state
+
+
+class _StubEntity:
+    def __init__(self, position):
+        self.position = position
+
+
+class StandardEnemy:
+    def __init__(self, position):
+        self.entity = _StubEntity(position)
+        self.health = 100
+
+
+class FancyEnemy(StandardEnemy):
+    pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--changes', type=int, default=5, help='enemies damaged between two saves')
+    parser.add_argument('--saves', type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(1)
+    print(f"{'enemies':>8} {'full (ms)':>10} {'journal (ms)':>13} {'full (bytes)':>13} {'journal (bytes)':>16}")
+    with tempfile.TemporaryDirectory() as folder:
+        for count in args.counts:
+            enemies = EnemyRegistry()
+            for _ in range(count):
+                enemies.add(random.choice([StandardEnemy, FancyEnemy])((random.uniform(-50, 50), 0.5, random.uniform(-50, 50))))
+            enemy_list = list(enemies)
+            full_file = os.path.join(folder, f"full{count}.sav")
+            journal = SaveJournal(os.path.join(folder, f"journal{count}.sav"), os.path.join(folder, f"journal{count}.journal"))
+            journal.save((0, 0, 0), 100, 0, enemies)
+
+            full_seconds = journal_seconds = 0
+            journal_start = os.path.getsize(journal.journal_file)
+            for save in range(args.saves):
+                for enemy in random.sample(enemy_list, args.changes):
+                    enemy.health -= 1
+                    journal.touch(enemy)
+                player_position = (save, 0, 0)
+
+                start = time.perf_counter()
+                write_game_state({
+                    "player_position": player_position,
+                    "player_health": 100,
+                    "enemies": [(enemy.__class__.__name__, enemy.entity.position, enemy.health) for enemy in enemies],
+                    "current_level_index": 0,
+                }, full_file)
+                full_seconds += time.perf_counter() - start
+
+                start = time.perf_counter()
+                journal.save(player_position, 100, 0, enemies)
+                journal_seconds += time.perf_counter() - start
+
+            full_bytes = os.path.getsize(full_file)
+            journal_bytes = (os.path.getsize(journal.journal_file) - journal_start) / args.saves
+            print(f"{count:>8} {full_seconds / args.saves * 1000:>10.2f} {journal_seconds / args.saves * 1000:>13.2f} "
+                  f"{full_bytes:>13} {journal_bytes:>16.0f}")
+
+
+if __name__ == '__main__':
+    main()
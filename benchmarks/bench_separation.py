@@ -0,0 +1,63 @@
+# bench_separation.py
+"""
+    Benchmark for the enemy separation pass in CustomSmoothFollow.
+
+    Compares the per-frame cost of the original all-enemies loop with the
+    SpatialHashGrid neighbour query at 50, 500 and 5,000 enemies.
+
+    Run from the repository root:
+        python benchmarks/bench_separation.py
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from follow import CustomSmoothFollow
+from simulation import EnemyBody
+from spatial_grid import SpatialHashGrid
+
+
+def make_bodies(count):
+    """Spreads enemy bodies over a square that grows with the count so density stays similar."""
+    side = (count ** 0.5) * 3
+    return [EnemyBody('StandardEnemy', (random.uniform(-side, side), 0.5, random.uniform(-side, side)), 100, 100, False, ((0, 0, 0), (0, 0, 0)))
+            for _ in range(count)]
+
+
+def time_frames(bodies, follow, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        if follow.grid is not None:
+            follow.grid.rebuild(bodies)
+        for body in bodies:
+            follow.separate(body, 1 / 60)
+    return (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[50, 500, 5000])
+    parser.add_argument('--frames', type=int, default=5)
+    args = parser.parse_args()
+
+    random.seed(1)
+    print(f"{'enemies':>8} {'list loop (ms)':>15} {'grid (ms)':>10} {'speedup':>8}")
+    for count in args.counts:
+        # the list loop is quadratic, so only time a single frame for big waves
+        list_frames = 1 if count > 1000 else args.frames
+        bodies = make_bodies(count)
+        list_ms = time_frames(bodies, CustomSmoothFollow(None, offset=(0, 2, 0), speed=.5, all_enemies=bodies), list_frames) * 1000
+
+        bodies = make_bodies(count)
+        grid = SpatialHashGrid(cell_size=2.5)
+        grid_ms = time_frames(bodies, CustomSmoothFollow(None, offset=(0, 2, 0), speed=.5, grid=grid), args.frames) * 1000
+
+        print(f"{count:>8} {list_ms:>15.2f} {grid_ms:>10.2f} {list_ms / grid_ms:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# bench_simulation.py
+"""
+    Benchmark for the headless simulation core.
+
+    Runs levels in Simulation without Ursina or a window: enemies are laid out
+    the way LevelThree places them, repeated to reach each enemy count, and the
+    player stands at the spawn point firing at the closest enemy every 0.1
+    seconds, like the MP5K, without ever dying. Reports simulated ticks per
+    second at 60 ticks per simulated second, and runs every level twice with
+    the same seed to check that the results are identical.
+
+    Run from the repository root:
+        python benchmarks/bench_simulation.py
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation import Simulation
+
+KINDS = ['StandardEnemy', 'FancyEnemy', 'StandardCameraMan', 'FancyCameraMan']
+
+
+def build_level(count, seed):
+    simulation = Simulation(seed=seed)
+    # Enough health for the player to outlast every run, so each one simulates the same ticks
+    simulation.player.health = simulation.player.max_health = 10 ** 9
+    for index in range(count):
+        row, column = divmod(index // len(KINDS), 3)
+        kind = KINDS[index % len(KINDS)]
+        x = {0: 10 + column * 5, 1: -2 - column * 5, 2: 15 + column * 5, 3: -10 - column * 5}[index % len(KINDS)]
+        simulation.add_enemy(kind, (x, 0.5, 2 + row * 5))
+    return simulation
+
+
+def play(simulation, ticks):
+    player = simulation.player
+    for tick in range(ticks):
+        if tick % 6 == 0 and simulation.enemies:
+            target = min(simulation.enemies, key=lambda enemy: (enemy.x - player.x) ** 2 + (enemy.z - player.z) ** 2)
+            origin = (player.x, player.y + 1.5, player.z)
+            simulation.fire(origin, (target.x - origin[0], target.y + 1 - origin[1], target.z - origin[2]))
+        simulation.run(1)
+        if simulation.level_complete:
+            break
+    return simulation
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[12, 48, 120])
+    parser.add_argument('--ticks', type=int, default=3600)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'enemies':>8} {'ticks':>7} {'ticks/s':>10} {'killed':>7} {'damage taken':>13} {'deterministic':>14}")
+    for count in args.counts:
+        start = time.perf_counter()
+        first = play(build_level(count, args.seed), args.ticks)
+        elapsed = time.perf_counter() - start
+        second = play(build_level(count, args.seed), args.ticks)
+        deterministic = first.snapshot() == second.snapshot()
+        print(f"{count:>8} {first.ticks:>7} {first.ticks / elapsed:>10.0f} {count - len(first.enemies):>7} "
+              f"{first.player.max_health - first.player.health:>13} {'yes' if deterministic else 'NO':>14}")
+
+    # Nothing above may have needed the engine
+    if 'ursina' in sys.modules or 'panda3d' in sys.modules:
+        raise SystemExit('the simulation imported Ursina or Panda3D')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# bench_spawning.py
+"""
+    Benchmark for spawning a large wave of enemies.
+
+    Runs main.py with an offscreen window and spawns a wave of each size through
+    the enemy spawner, once with no time budget (every enemy is created in the first
+    frame, like the levels used to do) and once with the spawner's per-frame budget.
+    Reports how many frames it took until every enemy was created, the most time
+    the spawner took in a single frame, and the slowest whole frame (which also
+    includes moving and drawing the enemies created so far). The pool is emptied
+    before every run, so every enemy is built from scratch.
+
+    Run from the repository root:
+        python benchmarks/bench_spawning.py
+        python benchmarks/bench_spawning.py --counts 500 --budget 2
+"""
+import argparse
+import statistics
+import time
+
+from offscreen import finish, run_main
+
+
+def wave_plan(count):
+    """One wave of count enemies in four columns, cycling through the enemy types like the levels do."""
+    from spawner import SpawnGroup
+    per_group = -(-count // 4)
+    return [[
+        SpawnGroup('StandardEnemy', (10, 0.5, 2), (0, 0, 3), per_group, 0),
+        SpawnGroup('FancyEnemy', (-2, 0.5, 2), (0, 0, 3), per_group, 0),
+        SpawnGroup('StandardCameraMan', (15, 0.5, 2), (0, 0, 3), per_group, 0),
+        SpawnGroup('FancyCameraMan', (-10, 0.5, 2), (0, 0, 3), per_group, 0),
+    ]]
+
+
+def reset(game):
+    for enemy in game.enemies:
+        game.enemy_pool.release(enemy)
+    for parked in game.enemy_pool.parked.values():
+        for enemy in parked:
+            game.destroy(enemy.entity)
+        parked.clear()
+    # The interpolator would still hold the destroyed entities until the next frame is shown
+    game.render_interpolator.states.clear()
+
+
+def run_wave(app, game, count, budget_ms, max_frames):
+    from spawner import enemy_spawner
+    reset(game)
+    enemy_spawner.budget_ms = budget_ms
+    enemy_spawner.start(wave_plan(count), game.player.controller, game.enemies)
+
+    spawn_ms = []
+    spawner_update = enemy_spawner.update
+
+    def timed_update():
+        start = time.perf_counter()
+        spawner_update()
+        spawn_ms.append((time.perf_counter() - start) * 1000)
+
+    frame_ms = []
+    enemy_spawner.update = timed_update
+    try:
+        while not enemy_spawner.done and len(frame_ms) < max_frames:
+            start = time.perf_counter()
+            app.step()
+            frame_ms.append((time.perf_counter() - start) * 1000)
+    finally:
+        del enemy_spawner.update
+    return {
+        'enemies': len(game.enemies),
+        'frames': len(frame_ms),
+        'worst_spawn_ms': max(spawn_ms),
+        'median_spawn_ms': statistics.median(spawn_ms),
+        'worst_frame_ms': max(frame_ms),
+    }
+
+
+def benchmark(args):
+    def run(app, game):
+        game.start_level(0)
+        # The player can't die, so the level keeps running while the waves attack
+        game.player.decrement_health = lambda number: None
+        app.step()
+
+        print(f"{'enemies':>8} {'budget':>10} {'frames':>7} {'worst spawn ms':>15} {'median spawn ms':>16} {'worst frame ms':>15}")
+        for count in args.counts:
+            for label, budget_ms in (('none', float('inf')), (f'{args.budget:g} ms', args.budget)):
+                result = run_wave(app, game, count, budget_ms, args.max_frames)
+                print(f"{result['enemies']:>8} {label:>10} {result['frames']:>7} {result['worst_spawn_ms']:>15.1f} "
+                      f"{result['median_spawn_ms']:>16.1f} {result['worst_frame_ms']:>15.1f}")
+        finish()
+
+    run_main(run)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[100, 400, 1000])
+    parser.add_argument('--budget', type=float, default=4, help='per-frame spawn budget in milliseconds')
+    parser.add_argument('--max-frames', type=int, default=2000)
+    benchmark(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# bench_startup.py
+"""
+    Benchmark for the startup of main.py.
+
+    Starts main.py in a fresh process per run, with an offscreen window, and
+    reports how long the imports take (until main.py creates the Ursina app),
+    the time until the first frame has been rendered, and which of the rarely
+    used modules (customtkinter, tkinter, pickle) were imported on the way.
+
+    Run from the repository root:
+        python benchmarks/bench_startup.py
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from offscreen import ROOT, finish, run_main
+
+DEFERRED_MODULES = ['customtkinter', 'tkinter', 'pickle']
+
+
+def first_frame():
+    start = time.perf_counter()
+    timings = {}
+
+    def created():
+        timings['import_ms'] = (time.perf_counter() - start) * 1000
+
+    def run(app, game):
+        app.step()
+        timings['first_frame_ms'] = (time.perf_counter() - start) * 1000
+        timings['deferred_imported'] = [name for name in DEFERRED_MODULES if name in sys.modules]
+        print(json.dumps(timings))
+        finish()
+
+    run_main(run, on_create=created)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        first_frame()
+        return
+
+    results = []
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), '--child'], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    print(f"imports (ms):     {statistics.median(result['import_ms'] for result in results):.0f}")
+    print(f"first frame (ms): {statistics.median(result['first_frame_ms'] for result in results):.0f}")
+    print(f"deferred modules imported at startup: {', '.join(results[-1]['deferred_imported']) or 'none'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+# bench_swarm.py
+"""
+    Benchmark for the NumPy enemy swarm.
+
+    Times EnemySwarm.step (follow, yaw lerp, separation and write-back) for
+    1,000, 5,000 and 10,000 enemies.
+
+    Run from the repository root:
+        python benchmarks/bench_swarm.py
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation import EnemyBody
+from swarm import EnemySwarm
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--counts', type=int, nargs='+', default=[1000, 5000, 10000])
+    parser.add_argument('--frames', type=int, default=20)
+    args = parser.parse_args()
+
+    random.seed(1)
+    target = (0, 2, 0)
+    print(f"{'enemies':>8} {'step (ms)':>10}")
+    for count in args.counts:
+        side = (count ** 0.5) * 3
+        enemies = [EnemyBody('StandardEnemy', (random.uniform(-side, side), 0.5, random.uniform(-side, side)), 100, 100, False, ((0, 0, 0), (0, 0, 0)))
+                   for _ in range(count)]
+        swarm = EnemySwarm()
+        swarm.sync(enemies)
+
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            swarm.step(target, 1 / 60)
+        step_ms = (time.perf_counter() - start) / args.frames * 1000
+        print(f"{count:>8} {step_ms:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
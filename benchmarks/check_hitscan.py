@@ -0,0 +1,63 @@
+# check_hitscan.py
+"""
+    Check that hitscan shots hit enemies and nothing else.
+
+    Places an enemy in front of the origin of an offscreen Ursina window, next to
+    a ground plane, casts one hitscan shot at it and one at the ground, and checks
+    that the first one damaged the enemy, the second one hit nothing, and that the
+    rays only ever collided with enemy colliders. Exits with status 1 if not.
+
+    Run from the repository root:
+        python benchmarks/check_hitscan.py
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pathlib import Path
+from ursina import Ursina, Entity, Vec3, application, scene
+from panda3d.core import BitMask32, CollisionHandlerQueue, CollisionNode, CollisionRay, CollisionTraverser
+from enemy import ENEMY_COLLIDE_MASK, StandardEnemy
+from registry import EnemyRegistry
+from weapon import HitscanResolver
+
+
+def main():
+    app = Ursina(window_type='offscreen')
+    application.asset_folder = Path(ROOT)
+    Entity(model='plane', scale=100, collider='box')
+    enemies = EnemyRegistry()
+    enemy = StandardEnemy(position=Vec3(0, 0.5, 10), player_entity=Entity(), all_enemies=enemies)
+    enemies.add(enemy)
+    app.step()
+
+    # Cast the same rays the resolver casts and count everything they collide with
+    traverser = CollisionTraverser()
+    queue = CollisionHandlerQueue()
+    for direction in (Vec3(0, 0, 1), Vec3(0, -1, 0)):
+        node = CollisionNode('check_ray')
+        node.setFromCollideMask(ENEMY_COLLIDE_MASK)
+        node.setIntoCollideMask(BitMask32.allOff())
+        node.addSolid(CollisionRay(Vec3(0, 1.5, 0), direction))
+        traverser.addCollider(scene.attachNewNode(node), queue)
+    traverser.traverse(scene)
+    hits = [entry.getIntoNodePath() for entry in queue.getEntries()]
+    stray = [hit for hit in hits if getattr(hit.parent.getPythonTag('Entity'), 'parent_enemy', None) is not enemy]
+
+    resolver = HitscanResolver()
+    resolver.queue_shot(origin=Vec3(0, 1.5, 0), direction=Vec3(0, 0, 1))
+    resolver.queue_shot(origin=Vec3(0, 1.5, 0), direction=Vec3(0, -1, 0))
+    resolver.resolve()
+
+    print(f"enemy health: {enemy.health}, ray hits: {len(hits)}, hits on other nodes: {len(stray)}")
+    passed = enemy.health == enemy.max_health - resolver.damage and len(hits) == 1 and not stray
+    print('ok' if passed else 'FAILED')
+    sys.stdout.flush()
+    # Skip the interpreter teardown, it can abort while Panda3D threads are still running
+    os._exit(0 if passed else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# offscreen.py
+"""
+    Shared harness for the benchmarks that run main.py.
+
+    run_main() runs main.py as __main__ with an offscreen window, and once main.py
+    starts the app, calls the benchmark with the app and the main.py module instead
+    of running the main loop. An offscreen window can't go fullscreen or lock the
+    mouse, so both are ignored. Ursina looks up update() on the __main__ it was
+    imported under, which is the benchmark script, so it is pointed at main.py.
+
+    finish() ends the process once the benchmark has printed its results.
+"""
+import os
+import runpy
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_main(benchmark, on_create=None):
+    """Runs main.py offscreen and calls benchmark(app, game) in place of the main loop, and on_create() right before the app is created."""
+    import ursina
+    from pathlib import Path
+
+    create_app = ursina.Ursina
+
+    def offscreen_app(**kwargs):
+        if on_create is not None:
+            on_create()
+        app = create_app(window_type='offscreen', **kwargs)
+        ursina.application.asset_folder = Path(ROOT)
+        type(app).run = run
+        return app
+
+    def run(app):
+        game = sys.modules['__main__']
+        ursina.main.__main__ = game
+        benchmark(app, game)
+
+    ursina.Ursina = offscreen_app
+    type(ursina.window).fullscreen = property(lambda window: False, lambda window, value: None)
+    type(ursina.mouse).locked = property(lambda mouse: False, lambda mouse, value: None)
+    sys.path.insert(0, ROOT)
+    os.chdir(ROOT)
+    runpy.run_path(os.path.join(ROOT, 'main.py'), run_name='__main__')
+
+
+def finish(code=0):
+    sys.stdout.flush()
+    # Skip the interpreter teardown, it can abort while Panda3D threads are still running
+    os._exit(code)
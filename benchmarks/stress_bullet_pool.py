@@ -0,0 +1,74 @@
+# stress_bullet_pool.py
+"""
+    Stress test for the weapon bullet pool.
+
+    Fires a Weapon at the MP5K rate in an offscreen Ursina window for a number of
+    simulated seconds and checks that, once the pool has warmed up, the number of
+    Bullet entities in the scene stays the same. Exits with status 1 if it does not.
+
+    Run from the repository root:
+        python benchmarks/stress_bullet_pool.py
+"""
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pathlib import Path
+from ursina import Ursina, Entity, application, scene, time
+from weapon import Weapon, Bullet
+from simulation import game_simulation
+from simulation_view import SimulationView
+from timestep import game_clock
+from timers import game_timers
+
+
+def count_bullets():
+    return sum(1 for entity in scene.entities if isinstance(entity, Bullet))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=float, default=30)
+    parser.add_argument('--cooldown', type=float, default=.1)
+    parser.add_argument('--capacity', type=int, default=64)
+    args = parser.parse_args()
+
+    app = Ursina(window_type='offscreen')
+    application.asset_folder = Path(ROOT)
+    application.calculate_dt = False
+    time.dt = time.dt_unscaled = 1 / 60
+
+    weapon = Weapon(parent=Entity(), bullet_capacity=args.capacity)
+    simulation_view = SimulationView(game_simulation)
+    frames_per_shot = max(1, round(args.cooldown / time.dt))
+    total_frames = int(args.seconds / time.dt)
+    # bullets live for 3 seconds, so the pool has warmed up after that
+    warmup_frames = int(3.5 / time.dt)
+
+    bullets_after_warmup = None
+    for frame in range(total_frames):
+        # One gameplay step per frame, like the game loop at 60 frames per second
+        game_clock.tick()
+        game_timers.advance_to(game_clock.ticks)
+        if frame % frames_per_shot == 0:
+            weapon.shoot()
+        simulation_view.sync_bullets(weapon.bullet_pool.active)
+        game_simulation.step(game_clock.step)
+        simulation_view.show_bullets()
+        app.step()
+        if frame == warmup_frames:
+            bullets_after_warmup = count_bullets()
+
+    stats = weapon.bullet_pool.stats()
+    growth = count_bullets() - bullets_after_warmup
+    print(f"shots fired: {stats['created'] + stats['recycled']}")
+    print(f"pool stats: {stats}")
+    print(f"bullet entities after warm-up: {bullets_after_warmup}, at end: {count_bullets()}, net growth: {growth}")
+    sys.exit(0 if growth == 0 else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# build_assets.py
+"""
+    Converts the game's assets into formats the engine loads without parsing them.
+
+    Models (FBX, OBJ, GLB) are written as Panda3D .bam files and sound clips (MP3)
+    are decoded once into 16-bit PCM .wav files. Every build is named after the
+    content hash of its source, and the manifest in assets_build/ records which
+    build belongs to which asset, so running the command again only converts the
+    assets that changed. The manifest also keeps each source's size and modification
+    time, so the game only hashes a source again when one of them differs. The game
+    picks the builds up through AssetCache.
+
+    Run from the repository root:
+        python build_assets.py
+"""
+import argparse
+import json
+import os
+import time
+import wave
+from panda3d.core import loadPrcFileData, Datagram, Filename, MovieAudio
+from assets import (BUILD_FOLDER, MANIFEST_FILE, LEVEL_MODELS, LEVEL_SOUNDS,
+                    content_hash, find_source, read_manifest)
+
+
+def build_model(source, artefact):
+    from ursina import application, load_model
+    # Load through Ursina, so the build matches what the game would load from the source
+    model = load_model(source, application.asset_folder, use_deepcopy=True)
+    if model is None:
+        raise ValueError(f"Ursina could not load '{source}'")
+    model.writeBamFile(Filename.fromOsSpecific(artefact))
+
+
+def build_sound(source, artefact):
+    cursor = MovieAudio.get(Filename.fromOsSpecific(source)).open()
+    if cursor is None:
+        raise ValueError(f"Panda3D could not decode '{source}'")
+    samples = Datagram()
+    cursor.readSamples(int(cursor.length() * cursor.audioRate()), samples)
+    with wave.open(artefact, 'wb') as f:
+        f.setnchannels(cursor.audioChannels())
+        f.setsampwidth(2)
+        f.setframerate(cursor.audioRate())
+        f.writeframes(bytes(samples))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--force', action='store_true', help='rebuild every asset, even unchanged ones')
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    loadPrcFileData('', 'window-type none\naudio-library-name null')
+    from direct.showbase.ShowBase import ShowBase
+    from ursina import application
+    from pathlib import Path
+    ShowBase()
+    application.asset_folder = Path('.')
+    os.makedirs(BUILD_FOLDER, exist_ok=True)
+
+    old_manifest = read_manifest()
+    manifest = {}
+    jobs = [(name, build_model, '.bam') for name in LEVEL_MODELS] + [(name, build_sound, '.wav') for name in LEVEL_SOUNDS]
+    for name, build, extension in jobs:
+        source = find_source(name)
+        if source is None:
+            print(f'{name}: missing, skipped')
+            continue
+
+        digest = content_hash(source)
+        stat = os.stat(source)
+        stem = os.path.splitext(os.path.basename(source))[0]
+        artefact = f'{BUILD_FOLDER}/{stem}-{digest[:16]}{extension}'
+        old_entry = old_manifest.get(name)
+        if not args.force and old_entry is not None and old_entry['hash'] == digest and os.path.exists(artefact):
+            manifest[name] = dict(old_entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            print(f'{name}: up to date')
+            continue
+
+        start = time.perf_counter()
+        try:
+            build(source, artefact)
+        except Exception as e:
+            print(f'{name}: failed, {e}')
+            continue
+        manifest[name] = {'source': source, 'hash': digest, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'artefact': artefact}
+        print(f'{name}: built {artefact} in {(time.perf_counter() - start) * 1000:.0f} ms')
+
+    # Remove builds of sources that changed or went away
+    kept = {entry['artefact'] for entry in manifest.values()}
+    for entry in old_manifest.values():
+        if entry['artefact'] not in kept and os.path.exists(entry['artefact']):
+            os.remove(entry['artefact'])
+
+    with open(MANIFEST_FILE, 'w') as f:
+        json.dump({'version': 1, 'assets': manifest}, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# change_tracker.py
+
+_MISSING = object()
+
+
+class ChangeTracker:
+    """
+        Remembers the last value pushed to each piece of UI so unchanged updates can be skipped.
+
+        Callers describe the state a UI element shows (for example an enemy's health ratio
+        and position, or the player's ammo and reload state) and only update the element
+        when changed() reports that this state differs from the one pushed last time.
+
+        Attributes:
+            values (dict): Maps a UI key to the last value that was pushed for it.
+            pushed (int): Updates pushed so far in the current frame.
+            skipped (int): Updates skipped so far in the current frame.
+            last_frame_pushed (int): Updates pushed during the previous frame.
+            last_frame_skipped (int): Updates skipped during the previous frame.
+            total_pushed (int): Updates pushed since the tracker was created.
+            total_skipped (int): Updates skipped since the tracker was created.
+
+        Methods:
+            changed(key, value): Records the value and returns whether it differs from the last one.
+            forget(key): Drops the remembered value, so the next update is always pushed.
+            end_frame(): Moves the per-frame counters into the last_frame counters.
+    """
+    def __init__(self):
+        self.values = {}
+        self.pushed = 0
+        self.skipped = 0
+        self.last_frame_pushed = 0
+        self.last_frame_skipped = 0
+        self.total_pushed = 0
+        self.total_skipped = 0
+
+    def changed(self, key, value):
+        if self.values.get(key, _MISSING) == value:
+            self.skipped += 1
+            return False
+        self.values[key] = value
+        self.pushed += 1
+        return True
+
+    def forget(self, key):
+        self.values.pop(key, None)
+
+    def end_frame(self):
+        self.last_frame_pushed = self.pushed
+        self.last_frame_skipped = self.skipped
+        self.total_pushed += self.pushed
+        self.total_skipped += self.skipped
+        self.pushed = 0
+        self.skipped = 0
+
+
+# Shared tracker for the HUD and the enemy health bars
+ui_changes = ChangeTracker()
@@ -1,56 +1,54 @@
-import pickle
 import os
+import struct
 import customtkinter as ctk
 from tkinter import messagebox
 from customexception import GameException
+from savegame import SAVE_FILE, read_game_state, write_game_state
 
 
-# Load saved data from pickle
-def load_game_state(filename="pickle_data/savefile.pkl"):
+# Load saved data from the save file
+def load_game_state(filename=SAVE_FILE):
     """
         Loads the game state from a specified file.
 
         This function checks if the specified save file exists and attempts to
-        deserialize the game state using the pickle module. If successful, it
+        decode the game state from the binary save format. If successful, it
         returns the game state. If the file does not exist or if an error occurs
         during loading, appropriate exceptions are raised.
 
         Parameters:
             filename (str): The path to the file from which the game state will be loaded.
-                            Default is "pickle_data/savefile.pkl".
+                            Default is "pickle_data/savefile.sav".
 
         Returns:
             dict: The loaded game state containing player, enemy, and level information.
 
         Raises:
-            GameException: If the save file does not exist, if deserialization fails, or
+            GameException: If the save file does not exist, if decoding fails, or
                            if an unknown error occurs during loading.
     """
     try:
         if os.path.exists(filename):
-            with open(filename, "rb") as f:
-                try:
-                    game_state = pickle.load(f)
-                except pickle.PickleError as e:
-                    raise GameException("Failed to deserialize game state.") from e
-            return game_state
+            return read_game_state(filename)
         else:
             raise FileNotFoundError(f"Save file '{filename}' not found.")
     except FileNotFoundError as e:
         # Chain the FileNotFoundError to a GameException
         raise GameException("Unable to load game state due to missing file.") from e
+    except GameException:
+        raise
     except Exception as e:
         # Chain any other exceptions to GameException
         raise GameException("An unknown error occurred while loading the game state.") from e
 
 
-# Save data to pickle file
-def save_game_state(game_state, filename="pickle_data/savefile.pkl"):
+# Save data to the save file
+def save_game_state(game_state, filename=SAVE_FILE):
     """
         Saves the current game state to a specified file.
 
-        This function serializes the provided game state using the pickle module
-        and writes it to the specified file. If the save is successful, it displays
+        This function packs the provided game state into the binary save format
+        and atomically replaces the specified file with it. If the save is successful, it displays
         a success message. If an error occurs during the saving process, an
         appropriate exception is raised.
 
@@ -58,21 +56,20 @@ def save_game_state(game_state, filename="pickle_data/savefile.pkl"):
             game_state (dict): The game state to be saved, containing player, enemy,
                                and level information.
             filename (str): The path to the file where the game state will be saved.
-                            Default is "pickle_data/savefile.pkl".
+                            Default is "pickle_data/savefile.sav".
 
         Returns:
             None
 
         Raises:
-            GameException: If serialization fails or if an error occurs during
+            GameException: If packing fails or if an error occurs during
                            the file writing process.
     """
     try:
-        with open(filename, "wb") as f:
-            try:
-                pickle.dump(game_state, f)
-            except pickle.PickleError as e:
-                raise GameException("Failed to serialize game state.") from e
+        try:
+            write_game_state(game_state, filename)
+        except (struct.error, ValueError) as e:
+            raise GameException("Failed to serialize game state.") from e
         messagebox.showinfo("Success", "Game state saved successfully!")
     except Exception as e:
         # Chain any exceptions that occur while saving
@@ -174,6 +171,9 @@ class SaveEditorGUI(ctk.CTk):
                     ("StandardEnemy", (20, 0.5, 2), 100)
                 ]
 
+            # The enemies above are the new level's only wave, so the old level's spawner must not carry over
+            self.game_state["spawner"] = (1, 0, ())
+
         # Save updated game state
         save_game_state(self.game_state)
 
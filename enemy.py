@@ -1,8 +1,39 @@
 # enemy.py
-from ursina import *
+from ursina import Entity, Vec3, color
 import abc
-from math import atan2, degrees
-import time
+from math import sqrt
+from health_bars import health_bars
+from change_tracker import ui_changes
+from savegame import save_journal
+from assets import assets
+from simulation import game_simulation
+from panda3d.core import BitMask32
+
+# Extra collision bit on enemy colliders, so rays can be cast against enemies only. It has to be
+# a bit no other node uses by default: Panda3D gives every collider bits 0 to 19 and every
+# visible mesh bit 20
+ENEMY_COLLIDE_MASK = BitMask32.bit(21)
+
+
+def add_enemy_collide_mask(entity):
+    """Lets rays using ENEMY_COLLIDE_MASK hit the entity's collider."""
+    node = entity.collider.node_path.node()
+    node.setIntoCollideMask(node.getIntoCollideMask() | ENEMY_COLLIDE_MASK)
+
+
+def collider_bounds(entity):
+    """Returns the (min, max) corners of the entity's collider relative to its position, for the simulation's bullet hits."""
+    scale = entity.world_scale
+    if entity.collider is None:
+        return tuple(scale * -.5), tuple(scale * .5)
+
+    collider = entity.collider
+    center = Vec3(*collider.center) * scale
+    half = Vec3(*collider.size) * scale * .5
+    # Enemies turn around the Y-axis, so widen X and Z to cover any heading
+    flat = max(abs(half.x), abs(half.z)) * sqrt(2)
+    half = Vec3(flat, abs(half.y), flat)
+    return tuple(center - half), tuple(center + half)
 
 # Abstract Base Class for Enemy
 class Enemy(abc.ABC):
@@ -15,27 +46,32 @@ class Enemy(abc.ABC):
 
         Attributes:
             position (Vec3): The position of the enemy in the game world.
-            health (int): The current health of the enemy.
+            body (EnemyBody): The enemy's state in the game simulation, which runs its movement and attacks.
+            health (int): Property, the current health of the enemy, kept by its body.
             max_health (int): The maximum health of the enemy.
 
         Methods:
-            attack(): Abstract method to define the attack behavior of the enemy.
             update_health_bar(): Abstract method to update the visual representation
                                  of the enemy's health.
             decrement_health(amount): Abstract method to reduce the enemy's health
                                       by a specified amount.
             is_alive(enemy_instance): Class method to check if the enemy is still alive.
-            siphon_health(enemy_instance, amount): Class method to restore health to the enemy
-                                                    when they siphon from the player.
+            sync_from(body): Shows the position and rotation of the enemy's simulation body, and parks the enemy once it died.
     """
     def __init__(self, position):
         self.position = position
-        self.health = 100
         self.max_health = 100
+        self.body = game_simulation.add_enemy(type(self).__name__, tuple(position), max_health=self.max_health, siphons=self.siphons)
+        self.body.view = self
+        save_journal.touch(self)
 
-    @abc.abstractmethod
-    def attack(self):
-        pass
+    @property
+    def health(self):
+        return self.body.health
+
+    @health.setter
+    def health(self, value):
+        self.body.health = value
 
     @abc.abstractmethod
     def update_health_bar(self):
@@ -50,13 +86,16 @@ class Enemy(abc.ABC):
         """Check if the enemy is still alive based on their health."""
         return enemy_instance.health > 0
 
-    @classmethod
-    def siphon_health(cls, enemy_instance, amount):
-        """Restore health to the enemy when they siphon from the player."""
-        enemy_instance.health += amount
-        if enemy_instance.health > enemy_instance.max_health:
-            enemy_instance.health = enemy_instance.max_health
-        enemy_instance.update_health_bar()
+    def sync_from(self, body):
+        # Show where the simulation moved and turned the enemy, enemies it did not step keep their place
+        if body.moved:
+            self.entity.position = Vec3(body.x, body.y, body.z)
+            self.entity.rotation = Vec3(0, body.rotation_y, 0)
+            body.moved = False
+
+        # Park the dead enemy for reuse, this also removes it from the enemies list
+        if body.health <= 0:
+            enemy_pool.release(self)
 
 
 # Different Enemy Types
@@ -71,20 +110,21 @@ class StandardEnemy(Enemy):
         Attributes:
             entity (Entity): The visual representation of the enemy in the game world.
             player_entity (Entity): Reference to the player entity for attack and movement logic.
-            all_enemies (list): Reference to the list of all enemy instances in the game.
-            health_bar (Entity): The visual representation of the enemy's health.
-            last_attack_time (float): The last time the enemy attacked the player.
+            all_enemies (EnemyRegistry): Reference to the registry of all enemy instances in the game.
+            health_bar (int): The enemy's slot in the batched health bar mesh.
+            siphons (bool): Class attribute, whether the enemy heals itself by the damage it deals.
 
         Methods:
-            update_health_bar(): Updates the health bar size and color based on the enemy's current health.
-            attack(player): Checks the distance to the player and inflicts damage if within range.
+            update_health_bar(): Writes the enemy's health ratio and position into the batched health bars.
             decrement_health(amount): Reduces the enemy's health by a specified amount and handles death logic.
             duplicate(position, player_entity, all_enemies): Class method to create a duplicate of the enemy.
     """
+    siphons = False
+
     def __init__(self, position, player_entity, all_enemies):
         super().__init__(position)
         self.entity = Entity(
-            model='assets/man.fbx',
+            model=assets.model('assets/man.fbx'),
             scale=(.005, .005, .005),
             position=position,
             color=color.smoke,
@@ -94,65 +134,29 @@ class StandardEnemy(Enemy):
         )
         self.player_entity = player_entity
         self.all_enemies = all_enemies  # Save the reference to the enemies list
-        self.entity.add_script(CustomSmoothFollow(target=player_entity, offset=(0, 2, 0), speed=.5, all_enemies=all_enemies))
-        self.last_attack_time = 0
-
-        # Create the health bar entity
-        self.health_bar = Entity(
-            model='cube',  # Using 'quad' model to make it more visible
-            color=color.green,
-            scale=(3, 0.5, 0.1),  # Larger size to make it more visible
-            position=self.entity.position + Vec3(0, 3, 0),  # Place it above the enemy initially
-            always_on_top=True  # Always render on top for better visibility
-        )
+        # The simulation tests bullets against the collider's box
+        self.body.bounds_min, self.body.bounds_max = collider_bounds(self.entity)
+
+        # Reserve a slot in the batched health bar mesh and place it above the enemy
+        self.health_bar = health_bars.add()
+        health_bars.set_bar(self.health_bar, self.entity.position + Vec3(0, 3, 0), 1)
         self.entity.parent_enemy = self
+        add_enemy_collide_mask(self.entity)
 
     def update_health_bar(self):
-        # Update the health bar size based on the current health
+        # Write the health ratio and the position above the enemy into the batched bars,
+        # the shader takes care of the size, colour and facing the camera
         health_ratio = max(self.health / self.max_health, 0)  # Ensure health ratio is not below 0
-        self.health_bar.scale_x = health_ratio * 3  # Scale X-axis based on health (max length of 3)
-
-        # Change color based on health (Green -> Yellow -> Red)
-        if health_ratio > 0.5:
-            self.health_bar.color = color.green
-        elif 0.2 < health_ratio <= 0.5:
-            self.health_bar.color = color.yellow
-        else:
-            self.health_bar.color = color.red
-
-        # Update the position to always hover above the enemy
-        self.health_bar.position = self.entity.position + Vec3(0, 3, 0)  # Keep it above the entity
-
-
-        # Ensure the health bar always faces the camera (billboarding effect)
-        direction = (self.player_entity.position - self.health_bar.world_position).normalized()
-        self.health_bar.rotation = Vec3(0, degrees(atan2(direction.x, direction.z)), 0)
-
-    def attack(self, player):
-        distance_to_player = (self.player_entity.position - self.entity.position).length()
-        current_time = time.time()
-        if distance_to_player < 3 and current_time - self.last_attack_time >= 1:
-            player.decrement_health(random.randint(3, 5))
-            Audio('assets/hit_sound.mp3', autoplay=True)  # Add hit sound playback here
-            self.last_attack_time = current_time
+        anchor = self.entity.position + Vec3(0, 3, 0)
+        if ui_changes.changed(('health_bar', self.health_bar), (health_ratio, anchor)):
+            health_bars.set_bar(self.health_bar, anchor, health_ratio)
 
     def decrement_health(self, amount):
-        self.health -= amount
-        if self.health < 0:
-            self.health = 0
+        # The simulation drops the enemy once it is dead, and its view parks it after the next step
+        game_simulation.damage_enemy(self.body, amount)
+        save_journal.touch(self)
         self.update_health_bar()  # Update the health bar to reflect new health
 
-        # Add logic to destroy the enemy entity and remove from the enemies list
-        if self.health <= 0:
-
-
-            destroy(self.entity)
-            destroy(self.health_bar)
-
-            # Remove from the enemies list
-            if self in self.all_enemies:
-                self.all_enemies.remove(self)
-
 
     @classmethod
     def duplicate(cls, position, player_entity, all_enemies):
@@ -172,21 +176,21 @@ class FancyEnemy(Enemy):
         Attributes:
             entity (Entity): The visual representation of the enemy in the game world.
             player_entity (Entity): Reference to the player entity for attack and movement logic.
-            all_enemies (list): Reference to the list of all enemy instances in the game.
-            health_bar (Entity): The visual representation of the enemy's health.
-            last_attack_time (float): The last time the enemy attacked the player.
+            all_enemies (EnemyRegistry): Reference to the registry of all enemy instances in the game.
+            health_bar (int): The enemy's slot in the batched health bar mesh.
+            siphons (bool): Class attribute, whether the enemy heals itself by the damage it deals.
 
         Methods:
-            update_health_bar(): Updates the health bar size and color based on the enemy's current health.
-            attack(player): Checks the distance to the player and inflicts damage if within range,
-                            and siphons health from the player.
+            update_health_bar(): Writes the enemy's health ratio and position into the batched health bars.
             decrement_health(amount): Reduces the enemy's health by a specified amount and handles death logic.
             duplicate(position, player_entity, all_enemies): Class method to create a duplicate of the enemy.
     """
+    siphons = True
+
     def __init__(self, position, player_entity, all_enemies):
         super().__init__(position)
         self.entity = Entity(
-            model='assets/man.fbx',
+            model=assets.model('assets/man.fbx'),
             scale=(.005, .005, .005),
             position=position,
             color=color.gold,
@@ -196,66 +200,29 @@ class FancyEnemy(Enemy):
         )
         self.player_entity = player_entity
         self.all_enemies = all_enemies  # Save the reference to the enemies list
-        self.entity.add_script(CustomSmoothFollow(target=player_entity, offset=(0, 2, 0), speed=.5, all_enemies=all_enemies))
-        self.last_attack_time = 0
-
-        # Create the health bar entity
-        self.health_bar = Entity(
-            model='cube',  # Using 'quad' model to make it more visible
-            color=color.green,
-            scale=(3, 0.5, 0.1),  # Larger size to make it more visible
-            position=self.entity.position + Vec3(0, 3, 0),  # Place it above the enemy initially
-            always_on_top=True  # Always render on top for better visibility
-        )
+        # The simulation tests bullets against the collider's box
+        self.body.bounds_min, self.body.bounds_max = collider_bounds(self.entity)
+
+        # Reserve a slot in the batched health bar mesh and place it above the enemy
+        self.health_bar = health_bars.add()
+        health_bars.set_bar(self.health_bar, self.entity.position + Vec3(0, 3, 0), 1)
         self.entity.parent_enemy = self
+        add_enemy_collide_mask(self.entity)
 
     def update_health_bar(self):
-        # Update the health bar size based on the current health
+        # Write the health ratio and the position above the enemy into the batched bars,
+        # the shader takes care of the size, colour and facing the camera
         health_ratio = max(self.health / self.max_health, 0)  # Ensure health ratio is not below 0
-        self.health_bar.scale_x = health_ratio * 3  # Scale X-axis based on health (max length of 3)
-
-        # Change color based on health (Green -> Yellow -> Red)
-        if health_ratio > 0.5:
-            self.health_bar.color = color.green
-        elif 0.2 < health_ratio <= 0.5:
-            self.health_bar.color = color.yellow
-        else:
-            self.health_bar.color = color.red
-
-        # Update the position to always hover above the enemy
-        self.health_bar.position = self.entity.position + Vec3(0, 3, 0)  # Keep it above the entity
-
-        # Ensure the health bar always faces the camera (billboarding effect)
-        direction = (self.player_entity.position - self.health_bar.world_position).normalized()
-        self.health_bar.rotation = Vec3(0, degrees(atan2(direction.x, direction.z)), 0)
-
-    def attack(self, player):
-        distance_to_player = (self.player_entity.position - self.entity.position).length()
-        current_time = time.time()
-        if distance_to_player < 3 and current_time - self.last_attack_time >= 1:
-            damage = random.randint(3, 5)
-            player.decrement_health(damage)
-            Audio('assets/hit_sound.mp3', autoplay=True)
-            self.last_attack_time = current_time
-
-            # Use the siphon_health class method
-            Enemy.siphon_health(self, damage)
+        anchor = self.entity.position + Vec3(0, 3, 0)
+        if ui_changes.changed(('health_bar', self.health_bar), (health_ratio, anchor)):
+            health_bars.set_bar(self.health_bar, anchor, health_ratio)
 
     def decrement_health(self, amount):
-        self.health -= amount
-        if self.health < 0:
-            self.health = 0
+        # The simulation drops the enemy once it is dead, and its view parks it after the next step
+        game_simulation.damage_enemy(self.body, amount)
+        save_journal.touch(self)
         self.update_health_bar()  # Update the health bar to reflect new health
 
-        # Add logic to destroy the enemy entity and remove from the enemies list
-        if self.health <= 0:
-            destroy(self.entity)
-            destroy(self.health_bar)
-
-            # Remove from the enemies list
-            if self in self.all_enemies:
-                self.all_enemies.remove(self)
-
     @classmethod
     def duplicate(cls, position, player_entity, all_enemies):
         return cls(position=position, player_entity=player_entity, all_enemies=all_enemies)
@@ -270,11 +237,11 @@ class CameraMan(abc.ABC):
 
         Attributes:
             position (Vec3): The position of the CameraMan in the game world.
-            health (int): The current health of the CameraMan.
+            body (EnemyBody): The CameraMan's state in the game simulation, which runs its movement and attacks.
+            health (int): Property, the current health of the CameraMan, kept by its body.
             max_health (int): The maximum health of the CameraMan.
 
         Methods:
-            attack(): Abstract method to define the attack behavior of the CameraMan.
             update_health_bar(): Abstract method to update the visual representation
                                  of the CameraMan's health.
             decrement_health(amount): Abstract method to reduce the CameraMan's health
@@ -282,17 +249,22 @@ class CameraMan(abc.ABC):
             duplicate(position, player_entity, all_enemies): Abstract class method to create
                                                               a duplicate of the CameraMan.
             is_alive(enemy_instance): Class method to check if the CameraMan is still alive.
-            siphon_health(enemy_instance, amount): Class method to restore health to the CameraMan
-                                                    when they siphon from the player.
+            sync_from(body): Shows the position and rotation of the CameraMan's simulation body, and parks the CameraMan once it died.
     """
     def __init__(self, position):
         self.position = position
-        self.health = 100
         self.max_health = 100
+        self.body = game_simulation.add_enemy(type(self).__name__, tuple(position), max_health=self.max_health, siphons=self.siphons)
+        self.body.view = self
+        save_journal.touch(self)
 
-    @abc.abstractmethod
-    def attack(self):
-        pass
+    @property
+    def health(self):
+        return self.body.health
+
+    @health.setter
+    def health(self, value):
+        self.body.health = value
 
     @abc.abstractmethod
     def update_health_bar(self):
@@ -311,13 +283,16 @@ class CameraMan(abc.ABC):
         """Check if the enemy is still alive based on their health."""
         return enemy_instance.health > 0
 
-    @classmethod
-    def siphon_health(cls, enemy_instance, amount):
-        """Restore health to the enemy when they siphon from the player."""
-        enemy_instance.health += amount
-        if enemy_instance.health > enemy_instance.max_health:
-            enemy_instance.health = enemy_instance.max_health
-        enemy_instance.update_health_bar()
+    def sync_from(self, body):
+        # Show where the simulation moved and turned the enemy, enemies it did not step keep their place
+        if body.moved:
+            self.entity.position = Vec3(body.x, body.y, body.z)
+            self.entity.rotation = Vec3(0, body.rotation_y, 0)
+            body.moved = False
+
+        # Park the dead enemy for reuse, this also removes it from the enemies list
+        if body.health <= 0:
+            enemy_pool.release(self)
 
 
 class StandardCameraMan(CameraMan):
@@ -331,20 +306,21 @@ class StandardCameraMan(CameraMan):
         Attributes:
             entity (Entity): The visual representation of the CameraMan in the game world.
             player_entity (Entity): Reference to the player entity for attack and movement logic.
-            all_enemies (list): Reference to the list of all enemy instances in the game.
-            health_bar (Entity): The visual representation of the CameraMan's health.
-            last_attack_time (float): The last time the CameraMan attacked the player.
+            all_enemies (EnemyRegistry): Reference to the registry of all enemy instances in the game.
+            health_bar (int): The CameraMan's slot in the batched health bar mesh.
+            siphons (bool): Class attribute, whether the CameraMan heals itself by the damage it deals.
 
         Methods:
-            update_health_bar(): Updates the health bar size and color based on the CameraMan's current health.
-            attack(player): Checks the distance to the player and inflicts damage if within range.
+            update_health_bar(): Writes the CameraMan's health ratio and position into the batched health bars.
             decrement_health(amount): Reduces the CameraMan's health by a specified amount and handles death logic.
             duplicate(position, player_entity, all_enemies): Class method to create a duplicate of the CameraMan.
     """
+    siphons = False
+
     def __init__(self, position, player_entity, all_enemies):
         super().__init__(position)
         self.entity = Entity(
-            model='assets/CameraMan.glb',
+            model=assets.model('assets/CameraMan.glb'),
             scale=(2, 2, 2),
             position=position,
             color=color.smoke,
@@ -354,63 +330,29 @@ class StandardCameraMan(CameraMan):
         )
         self.player_entity = player_entity
         self.all_enemies = all_enemies  # Save the reference to the enemies list
-        self.entity.add_script(CustomSmoothFollow(target=player_entity, offset=(0, 2, 0), speed=.5, all_enemies=all_enemies))
-        self.last_attack_time = 0
-
-        # Create the health bar entity
-        self.health_bar = Entity(
-            model='cube',  # Using 'quad' model to make it more visible
-            color=color.green,
-            scale=(3, 0.5, 0.1),  # Larger size to make it more visible
-            position=self.entity.position + Vec3(0, 3, 0),  # Place it above the enemy initially
-            always_on_top=True  # Always render on top for better visibility
-        )
+        # The simulation tests bullets against the collider's box
+        self.body.bounds_min, self.body.bounds_max = collider_bounds(self.entity)
+
+        # Reserve a slot in the batched health bar mesh and place it above the enemy
+        self.health_bar = health_bars.add()
+        health_bars.set_bar(self.health_bar, self.entity.position + Vec3(0, 3, 0), 1)
         self.entity.parent_enemy = self
+        add_enemy_collide_mask(self.entity)
 
     def update_health_bar(self):
-        # Update the health bar size based on the current health
+        # Write the health ratio and the position above the enemy into the batched bars,
+        # the shader takes care of the size, colour and facing the camera
         health_ratio = max(self.health / self.max_health, 0)  # Ensure health ratio is not below 0
-        self.health_bar.scale_x = health_ratio * 3  # Scale X-axis based on health (max length of 3)
-
-        # Change color based on health (Green -> Yellow -> Red)
-        if health_ratio > 0.5:
-            self.health_bar.color = color.green
-        elif 0.2 < health_ratio <= 0.5:
-            self.health_bar.color = color.yellow
-        else:
-            self.health_bar.color = color.red
-
-        # Update the position to always hover above the enemy
-        self.health_bar.position = self.entity.position + Vec3(0, 3, 0)  # Keep it above the entity
-
-
-        # Ensure the health bar always faces the camera (billboarding effect)
-        direction = (self.player_entity.position - self.health_bar.world_position).normalized()
-        self.health_bar.rotation = Vec3(0, degrees(atan2(direction.x, direction.z)), 0)
-
-    def attack(self, player):
-        distance_to_player = (self.player_entity.position - self.entity.position).length()
-        current_time = time.time()
-        if distance_to_player < 3 and current_time - self.last_attack_time >= 1:
-            player.decrement_health(random.randint(3, 5))
-            Audio('assets/hit_sound.mp3', autoplay=True)  # Add hit sound playback here
-            self.last_attack_time = current_time
+        anchor = self.entity.position + Vec3(0, 3, 0)
+        if ui_changes.changed(('health_bar', self.health_bar), (health_ratio, anchor)):
+            health_bars.set_bar(self.health_bar, anchor, health_ratio)
 
     def decrement_health(self, amount):
-        self.health -= amount
-        if self.health < 0:
-            self.health = 0
+        # The simulation drops the enemy once it is dead, and its view parks it after the next step
+        game_simulation.damage_enemy(self.body, amount)
+        save_journal.touch(self)
         self.update_health_bar()  # Update the health bar to reflect new health
 
-        # Add logic to destroy the enemy entity and remove from the enemies list
-        if self.health <= 0:
-            destroy(self.entity)
-            destroy(self.health_bar)
-
-            # Remove from the enemies list
-            if self in self.all_enemies:
-                self.all_enemies.remove(self)
-
     @classmethod
     def duplicate(cls, position, player_entity, all_enemies):
         return cls(position=position, player_entity=player_entity, all_enemies=all_enemies)
@@ -426,21 +368,21 @@ class FancyCameraMan(CameraMan):
         Attributes:
             entity (Entity): The visual representation of the CameraMan in the game world.
             player_entity (Entity): Reference to the player entity for attack and movement logic.
-            all_enemies (list): Reference to the list of all enemy instances in the game.
-            health_bar (Entity): The visual representation of the CameraMan's health.
-            last_attack_time (float): The last time the CameraMan attacked the player.
+            all_enemies (EnemyRegistry): Reference to the registry of all enemy instances in the game.
+            health_bar (int): The CameraMan's slot in the batched health bar mesh.
+            siphons (bool): Class attribute, whether the CameraMan heals itself by the damage it deals.
 
         Methods:
-            update_health_bar(): Updates the health bar size and color based on the CameraMan's current health.
-            attack(player): Checks the distance to the player and inflicts damage if within range,
-                            while siphoning health from the player.
+            update_health_bar(): Writes the CameraMan's health ratio and position into the batched health bars.
             decrement_health(amount): Reduces the CameraMan's health by a specified amount and handles death logic.
             duplicate(position, player_entity, all_enemies): Class method to create a duplicate of the CameraMan.
     """
+    siphons = True
+
     def __init__(self, position, player_entity, all_enemies):
         super().__init__(position)
         self.entity = Entity(
-            model='assets/CameraMan.glb',
+            model=assets.model('assets/CameraMan.glb'),
             scale=(2, 2, 2),
             position=position,
             color=color.gold,
@@ -450,143 +392,93 @@ class FancyCameraMan(CameraMan):
         )
         self.player_entity = player_entity
         self.all_enemies = all_enemies  # Save the reference to the enemies list
-        self.entity.add_script(CustomSmoothFollow(target=player_entity, offset=(0, 2, 0), speed=.5, all_enemies=all_enemies))
-        self.last_attack_time = 0
-
-        # Create the health bar entity
-        self.health_bar = Entity(
-            model='cube',  # Using 'quad' model to make it more visible
-            color=color.green,
-            scale=(3, 0.5, 0.1),  # Larger size to make it more visible
-            position=self.entity.position + Vec3(0, 3, 0),  # Place it above the enemy initially
-            always_on_top=True  # Always render on top for better visibility
-        )
+        # The simulation tests bullets against the collider's box
+        self.body.bounds_min, self.body.bounds_max = collider_bounds(self.entity)
+
+        # Reserve a slot in the batched health bar mesh and place it above the enemy
+        self.health_bar = health_bars.add()
+        health_bars.set_bar(self.health_bar, self.entity.position + Vec3(0, 3, 0), 1)
         self.entity.parent_enemy = self
+        add_enemy_collide_mask(self.entity)
 
     def update_health_bar(self):
-        # Update the health bar size based on the current health
+        # Write the health ratio and the position above the enemy into the batched bars,
+        # the shader takes care of the size, colour and facing the camera
         health_ratio = max(self.health / self.max_health, 0)  # Ensure health ratio is not below 0
-        self.health_bar.scale_x = health_ratio * 3  # Scale X-axis based on health (max length of 3)
-
-        # Change color based on health (Green -> Yellow -> Red)
-        if health_ratio > 0.5:
-            self.health_bar.color = color.green
-        elif 0.2 < health_ratio <= 0.5:
-            self.health_bar.color = color.yellow
-        else:
-            self.health_bar.color = color.red
-
-        # Update the position to always hover above the enemy
-        self.health_bar.position = self.entity.position + Vec3(0, 3, 0)  # Keep it above the entity
-
-
-        # Ensure the health bar always faces the camera (billboarding effect)
-        direction = (self.player_entity.position - self.health_bar.world_position).normalized()
-        self.health_bar.rotation = Vec3(0, degrees(atan2(direction.x, direction.z)), 0)
-
-    def attack(self, player):
-        distance_to_player = (self.player_entity.position - self.entity.position).length()
-        current_time = time.time()
-        if distance_to_player < 3 and current_time - self.last_attack_time >= 1:
-            damage = random.randint(3, 5)
-            player.decrement_health(damage)
-            Audio('assets/hit_sound.mp3', autoplay=True)
-            self.last_attack_time = current_time
-
-            # Use the siphon_health class method
-            Enemy.siphon_health(self, damage)
+        anchor = self.entity.position + Vec3(0, 3, 0)
+        if ui_changes.changed(('health_bar', self.health_bar), (health_ratio, anchor)):
+            health_bars.set_bar(self.health_bar, anchor, health_ratio)
 
     def decrement_health(self, amount):
-        self.health -= amount
-        if self.health < 0:
-            self.health = 0
+        # The simulation drops the enemy once it is dead, and its view parks it after the next step
+        game_simulation.damage_enemy(self.body, amount)
+        save_journal.touch(self)
         self.update_health_bar()  # Update the health bar to reflect new health
 
-        # Add logic to destroy the enemy entity and remove from the enemies list
-        if self.health <= 0:
-            destroy(self.entity)
-            destroy(self.health_bar)
-
-            # Remove from the enemies list
-            if self in self.all_enemies:
-                self.all_enemies.remove(self)
-
     @classmethod
     def duplicate(cls, position, player_entity, all_enemies):
         return cls(position=position, player_entity=player_entity, all_enemies=all_enemies)
 
-# Custom SmoothFollow Script
-class CustomSmoothFollow(SmoothFollow):
+class EnemyPool:
     """
-        A custom class for smooth following behavior for enemies.
+        Keeps the enemies that left the level so they can be reused instead of recreated.
 
-        This class extends the SmoothFollow functionality to allow enemies to smoothly follow the player,
-        while also maintaining a minimum distance from both the player and other enemies.
+        Creating an enemy loads its model and builds its collider. Released enemies keep
+        both: their entity is only disabled, their health bar slot is freed, their body is
+        removed from the game simulation (with its pending timers) and they are taken out
+        of the registry. Acquiring an enemy of the same class gives a parked one a new body
+        at the position and re-enables it in place, and only creates a new instance when
+        none is left.
 
         Attributes:
-            min_distance (float): Minimum distance to maintain from the player.
-            all_enemies (list): Reference to the list of all enemy instances in the game.
-            min_enemy_distance (float): Minimum distance to maintain from other enemies.
+            parked (dict): Maps an enemy class to the list of its released instances.
+            created (int): How many enemies acquire() had to create.
+            reused (int): How many enemies acquire() took from the pool.
 
         Methods:
-            calculate_distance(position1, position2): Calculates the distance between two positions.
-            calculate_desired_rotation_y(target_position, entity_position): Calculates the desired rotation
-                                                                            around the Y-axis to face the target.
-            lerp_rotation(current_rotation, desired_rotation, factor): Linearly interpolates between the current
-                                                                       and desired rotations.
-            ensure_ground_rotation(entity): Ensures that the entity maintains a horizontal rotation.
-            calculate_direction_away(position1, position2): Calculates the normalized direction away from one position to another.
-            update(): Updates the enemy's position and rotation to smoothly follow the player and avoid overlapping with other enemies.
+            release(enemy): Disables an enemy, frees its health bar, removes its body and parks it in the pool.
+            acquire(enemy_class, position, player_entity, all_enemies): Returns a parked enemy of
+                that class moved to the position and fully healed, or a new one.
     """
-    def __init__(self, target, offset=(0, 0, 0), speed=1, all_enemies=[]):
-        super().__init__(target=target, offset=offset, speed=speed)
-        self.min_distance = 2  # Minimum distance to maintain from the player
-        self.all_enemies = all_enemies
-        self.min_enemy_distance = 2.5  # Minimum distance to maintain from other enemies
-
-    @staticmethod
-    def calculate_distance(position1, position2):
-        return (position1 - position2).length()
-
-    @staticmethod
-    def calculate_desired_rotation_y(target_position, entity_position):
-        target_direction = (target_position - entity_position).normalized()
-        return atan2(target_direction.x, target_direction.z)
-
-    @staticmethod
-    def lerp_rotation(current_rotation, desired_rotation, factor):
-        return lerp(current_rotation, degrees(desired_rotation), factor)
-
-    @staticmethod
-    def ensure_ground_rotation(entity):
-        entity.rotation_x = 0
-        entity.rotation_z = 0
-
-    @staticmethod
-    def calculate_direction_away(position1, position2):
-        return (position1 - position2).normalized()
-
-    def update(self):
-        # Calculate the distance to the player using the static method
-        distance_to_player = CustomSmoothFollow.calculate_distance(self.target.position, self.entity.position)
-        if distance_to_player > self.min_distance:
-            super().update()  # Call the original update to follow the player
-
-        # Smoothly rotate the enemy to face the player on the Y-axis only
-        desired_rotation_y = CustomSmoothFollow.calculate_desired_rotation_y(self.target.position, self.entity.position)
-        current_rotation_y = self.entity.rotation_y
-        self.entity.rotation_y = CustomSmoothFollow.lerp_rotation(current_rotation_y, desired_rotation_y, time.dt * 2)
-
-        # Ensure the enemy doesn't rotate around the X or Z axis (feet on the ground)
-        CustomSmoothFollow.ensure_ground_rotation(self.entity)
-
-        # make sure they don't overlap
-        for other in self.all_enemies:
-            if other.entity == self.entity:
-                continue
-            # Calculate the distance to other enemies using the static method
-            distance_to_other = CustomSmoothFollow.calculate_distance(other.entity.position, self.entity.position)
-            if distance_to_other < self.min_enemy_distance:
-                # move away from the other enemy
-                direction_away = CustomSmoothFollow.calculate_direction_away(self.entity.position, other.entity.position)
-                self.entity.position += direction_away * time.dt * self.speed
\ No newline at end of file
+    def __init__(self):
+        self.parked = {}
+        self.created = 0
+        self.reused = 0
+
+    def release(self, enemy):
+        if enemy in enemy.all_enemies:
+            enemy.all_enemies.remove(enemy)
+        if not enemy.entity.enabled:
+            return
+        enemy.entity.enabled = False
+        # A cooldown must not carry over into the enemy's next life
+        game_simulation.remove_enemy(enemy.body)
+        health_bars.remove(enemy.health_bar)
+        ui_changes.forget(('health_bar', enemy.health_bar))
+        self.parked.setdefault(type(enemy), []).append(enemy)
+
+    def acquire(self, enemy_class, position, player_entity, all_enemies):
+        parked = self.parked.get(enemy_class)
+        if not parked:
+            self.created += 1
+            return enemy_class(position=position, player_entity=player_entity, all_enemies=all_enemies)
+
+        enemy = parked.pop()
+        self.reused += 1
+        enemy.player_entity = player_entity
+        enemy.all_enemies = all_enemies
+        # A new body at full health, with the hit box of the old one
+        bounds = enemy.body.bounds_min, enemy.body.bounds_max
+        enemy.body = game_simulation.add_enemy(enemy_class.__name__, tuple(position), max_health=enemy.max_health,
+                                               siphons=enemy.siphons, bounds=bounds)
+        enemy.body.view = enemy
+        enemy.sync_from(enemy.body)
+        enemy.health_bar = health_bars.add()
+        enemy.entity.enabled = True
+        enemy.update_health_bar()
+        save_journal.touch(enemy)
+        return enemy
+
+
+# Shared pool of enemies that died or were dropped by a load
+enemy_pool = EnemyPool()
@@ -0,0 +1,78 @@
+# follow.py
+from math import atan2, degrees, sqrt
+
+
+# Custom SmoothFollow Script
+class CustomSmoothFollow:
+    """
+        The enemies' movement: smoothly follow the player and keep apart from each other.
+
+        Like Ursina's SmoothFollow, an enemy closes the distance to the target plus offset
+        by a fraction of speed * dt per step, but stops within min_distance of the player.
+        It turns to face the player around the Y-axis only, so its feet stay on the ground,
+        and is pushed away from every other enemy closer than min_enemy_distance. One
+        instance moves every enemy of the Simulation, working on their bodies instead of
+        entities, and EnemyLOD decides which enemies it steps and by how much time.
+
+        Attributes:
+            target (PlayerBody): The body followed, the player's.
+            offset (tuple): Offset from the target that is followed.
+            speed (float): How fast the distance to the target is closed.
+            min_distance (float): Minimum distance to maintain from the player.
+            min_enemy_distance (float): Minimum distance to maintain from other enemies.
+            grid (SpatialHashGrid): Optional spatial index used to find nearby enemies. When it is None
+                                    every body in all_enemies is checked.
+            all_enemies (list): The enemy bodies checked when there is no grid.
+
+        Methods:
+            nearby_enemies(body): Returns the enemies that may be within min_enemy_distance of a body.
+            separate(body, dt): Pushes an enemy away from any other enemy closer than min_enemy_distance.
+            step(body, dt, avoid_enemies): Moves and turns an enemy to smoothly follow the player and,
+                                           unless avoid_enemies is False, avoid overlapping with other enemies.
+    """
+    def __init__(self, target, offset=(0, 0, 0), speed=1, grid=None, all_enemies=()):
+        self.target = target
+        self.offset = offset
+        self.speed = speed
+        self.min_distance = 2  # Minimum distance to maintain from the player
+        self.min_enemy_distance = 2.5  # Minimum distance to maintain from other enemies
+        self.grid = grid
+        self.all_enemies = all_enemies
+
+    def nearby_enemies(self, body):
+        if self.grid is None:
+            return self.all_enemies
+        return self.grid.query((body.x, body.y, body.z), self.min_enemy_distance)
+
+    def step(self, body, dt, avoid_enemies=True):
+        target = self.target
+        # Follow the player until within min_distance
+        dx, dy, dz = target.x - body.x, target.y - body.y, target.z - body.z
+        if sqrt(dx * dx + dy * dy + dz * dz) > self.min_distance:
+            follow = dt * self.speed
+            body.x += (target.x + self.offset[0] - body.x) * follow
+            body.y += (target.y + self.offset[1] - body.y) * follow
+            body.z += (target.z + self.offset[2] - body.z) * follow
+
+        # Smoothly rotate the enemy to face the player on the Y-axis only
+        desired_rotation_y = degrees(atan2(target.x - body.x, target.z - body.z))
+        body.rotation_y += (desired_rotation_y - body.rotation_y) * dt * 2
+        body.moved = True
+
+        # make sure they don't overlap
+        if avoid_enemies:
+            self.separate(body, dt)
+
+    def separate(self, body, dt):
+        push = dt * self.speed
+        for other in self.nearby_enemies(body):
+            # the grid is built at the start of the step, so it can still hold enemies killed since then
+            if other is body or other.health <= 0:
+                continue
+            ax, ay, az = body.x - other.x, body.y - other.y, body.z - other.z
+            distance_to_other = sqrt(ax * ax + ay * ay + az * az)
+            if 0 < distance_to_other < self.min_enemy_distance:
+                # move away from the other enemy
+                body.x += ax / distance_to_other * push
+                body.y += ay / distance_to_other * push
+                body.z += az / distance_to_other * push
@@ -0,0 +1,160 @@
+# health_bars.py
+from ursina import Entity, Shader, Vec2, scene
+from panda3d.core import (Geom, GeomNode, GeomTriangles, GeomVertexArrayFormat, GeomVertexData,
+                          GeomVertexFormat, GeomEnums, InternalName, OmniBoundingVolume)
+import numpy as np
+
+
+health_bar_shader = Shader(name='health_bar_shader', language=Shader.GLSL, vertex='''#version 140
+
+uniform mat4 p3d_ModelViewMatrix;
+uniform mat4 p3d_ProjectionMatrix;
+uniform vec2 bar_size;
+in vec4 p3d_Vertex;
+in vec2 p3d_MultiTexCoord0;
+in float health_ratio;
+out vec4 bar_color;
+
+void main() {
+    // Offset the corner in view space, so the bar always faces the camera
+    vec4 view_position = p3d_ModelViewMatrix * p3d_Vertex;
+    float ratio = clamp(health_ratio, 0.0, 1.0);
+    view_position.xy += vec2((p3d_MultiTexCoord0.x - 0.5) * bar_size.x * ratio, (p3d_MultiTexCoord0.y - 0.5) * bar_size.y);
+    gl_Position = p3d_ProjectionMatrix * view_position;
+
+    // Green -> Yellow -> Red
+    if (ratio > 0.5) {
+        bar_color = vec4(0.0, 1.0, 0.0, 1.0);
+    } else if (ratio > 0.2) {
+        bar_color = vec4(1.0, 1.0, 0.0, 1.0);
+    } else {
+        bar_color = vec4(1.0, 0.0, 0.0, 1.0);
+    }
+}
+''',
+fragment='''
+#version 140
+
+in vec4 bar_color;
+out vec4 fragColor;
+
+void main() {
+    fragColor = bar_color;
+}
+''',
+default_input={
+    'bar_size': Vec2(3, .5),
+}
+)
+
+# Each bar is a quad made of four vertices sharing the same anchor and health ratio
+_CORNERS = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], dtype=np.float32)
+
+
+class HealthBarBatch:
+    """
+        Draws the health bars of every enemy as a single batched mesh.
+
+        Each enemy gets a slot in the batch. Python only writes the slot's anchor
+        position and health ratio into NumPy arrays; once per frame, upload() copies
+        those arrays into one vertex buffer. The shader sizes, colours and billboards
+        every bar, so all bars are drawn in one call and always face the camera.
+
+        Attributes:
+            capacity (int): The number of bars the vertex buffer currently has room for.
+            anchors (ndarray): (capacity, 3) float32 array with the position above each enemy.
+            ratios (ndarray): (capacity,) float32 array with each enemy's health ratio.
+            free_slots (list): Slots that are not used by any enemy.
+            entity (Entity): The entity holding the batched mesh, created on first use.
+            dirty (bool): Whether the arrays changed since the last upload.
+
+        Methods:
+            add(): Reserves a slot for a new bar and returns it.
+            remove(slot): Hides the bar in a slot and frees the slot.
+            set_bar(slot, position, ratio): Writes the anchor and health ratio of a bar.
+            upload(): Copies the arrays into the vertex buffer if anything changed.
+    """
+    def __init__(self, capacity=64):
+        self.capacity = 0
+        self.anchors = np.zeros((0, 3), dtype=np.float32)
+        self.ratios = np.zeros(0, dtype=np.float32)
+        self.free_slots = []
+        self.entity = None
+        self.dirty = False
+        self.__vertex_data = None
+        self.__geom = None
+        self.__initial_capacity = capacity
+
+    def __create_entity(self):
+        anchor_format = GeomVertexArrayFormat()
+        anchor_format.addColumn(InternalName.getVertex(), 3, Geom.NT_float32, Geom.C_point)
+        ratio_format = GeomVertexArrayFormat()
+        ratio_format.addColumn(InternalName.make('health_ratio'), 1, Geom.NT_float32, Geom.C_other)
+        corner_format = GeomVertexArrayFormat()
+        corner_format.addColumn(InternalName.getTexcoord(), 2, Geom.NT_float32, Geom.C_texcoord)
+        vertex_format = GeomVertexFormat()
+        vertex_format.addArray(anchor_format)
+        vertex_format.addArray(ratio_format)
+        vertex_format.addArray(corner_format)
+
+        self.__vertex_data = GeomVertexData('health_bars', GeomVertexFormat.registerFormat(vertex_format), GeomEnums.UH_dynamic)
+        self.__geom = Geom(self.__vertex_data)
+        geom_node = GeomNode('health_bars')
+        geom_node.addGeom(self.__geom)
+        # Vertices are moved in the shader, so the CPU side bounds can't be trusted for culling
+        geom_node.setBounds(OmniBoundingVolume())
+        geom_node.setFinal(True)
+
+        self.entity = Entity(parent=scene, shader=health_bar_shader, always_on_top=True)
+        self.entity.attachNewNode(geom_node)
+
+    def __grow(self, capacity):
+        if self.entity is None:
+            self.__create_entity()
+
+        old_capacity = self.capacity
+        self.anchors = np.concatenate([self.anchors, np.zeros((capacity - old_capacity, 3), dtype=np.float32)])
+        self.ratios = np.concatenate([self.ratios, np.zeros(capacity - old_capacity, dtype=np.float32)])
+        self.free_slots.extend(reversed(range(old_capacity, capacity)))
+        self.capacity = capacity
+
+        self.__vertex_data.setNumRows(capacity * 4)
+        self.__vertex_data.modifyArrayHandle(2).copyDataFrom(np.tile(_CORNERS, (capacity, 1)))
+
+        quad_starts = np.arange(capacity, dtype=np.uint32) * 4
+        indices = (quad_starts[:, None] + np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)).ravel()
+        triangles = GeomTriangles(GeomEnums.UH_static)
+        triangles.setIndexType(GeomEnums.NT_uint32)
+        triangles.modifyVertices().unclean_set_num_rows(len(indices))
+        triangles.modifyVertices().modifyHandle().copyDataFrom(indices)
+        self.__geom.clearPrimitives()
+        self.__geom.addPrimitive(triangles)
+        self.dirty = True
+
+    def add(self):
+        if not self.free_slots:
+            self.__grow(max(self.__initial_capacity, self.capacity * 2))
+        return self.free_slots.pop()
+
+    def remove(self, slot):
+        if slot in self.free_slots:
+            return
+        self.ratios[slot] = 0
+        self.free_slots.append(slot)
+        self.dirty = True
+
+    def set_bar(self, slot, position, ratio):
+        self.anchors[slot] = position
+        self.ratios[slot] = ratio
+        self.dirty = True
+
+    def upload(self):
+        if not self.dirty or self.entity is None:
+            return
+        self.__vertex_data.modifyArrayHandle(0).copyDataFrom(np.repeat(self.anchors, 4, axis=0))
+        self.__vertex_data.modifyArrayHandle(1).copyDataFrom(np.repeat(self.ratios, 4))
+        self.dirty = False
+
+
+# Shared batch for every enemy's health bar
+health_bars = HealthBarBatch()
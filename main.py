@@ -1,11 +1,23 @@
 # main.py
-from ursina import *
+from ursina import (Ursina, Button, DirectionalLight, Entity, PointLight, Sky, Text, Vec3, application,
+                    color, destroy, mouse, window)
 from player import Player
-from enemy import StandardEnemy, FancyEnemy, StandardCameraMan, FancyCameraMan
-from abc import ABC, abstractmethod
-import pickle
-import os
+from enemy import enemy_pool
+from abc import ABC
+import time
 from customexception import GameException
+from swarm import EnemySwarm
+from simulation import game_simulation
+from simulation_view import SimulationView
+from assets import assets, LEVEL_MODELS, LEVEL_TEXTURES, LEVEL_SOUNDS
+from registry import EnemyRegistry
+from spawner import ENEMY_CLASSES, SpawnGroup, enemy_spawner
+from health_bars import health_bars
+from change_tracker import ui_changes
+from savegame import SAVE_FILE, background_saver, read_game_state, save_journal
+from timestep import game_clock, RenderInterpolator
+from timers import game_timers
+from profiler import profiler, ProfilerOverlay
 
 
 app = Ursina()
@@ -13,12 +25,9 @@ app = Ursina()
 
 window.fullscreen = True
 
-if not os.path.exists('pickle_data'):
-    os.makedirs('pickle_data')
-
 # Global variables
 player = None
-enemies = []
+enemies = EnemyRegistry()
 current_level_index = 0
 level_start_button = None
 level_title_text = None
@@ -28,6 +37,28 @@ level_in_progress = False
 sky_entity = None
 level_overlay_ui = []
 level_start_screen_active = False
+game_over_active = False
+
+# Simulate all enemies as one NumPy batch instead of stepping each enemy with CustomSmoothFollow
+SWARM_MODE = False
+enemy_swarm = EnemySwarm() if SWARM_MODE else None
+
+# Resolve the player's shots as instant rays instead of Bullet entities
+HITSCAN_MODE = False
+
+# The game rules run in the headless game simulation, the player, enemies and bullets only show its state
+simulation_view = SimulationView(game_simulation)
+game_simulation.swarm = enemy_swarm
+
+# Enemies and bullets are drawn between their last two gameplay steps
+render_interpolator = RenderInterpolator()
+
+# Frame profiler overlay, F3 shows it and turns the timers on, F4 dumps the last seconds as a Chrome trace
+profiler_overlay = ProfilerOverlay(profiler)
+game_simulation.profiler = profiler
+
+# Append only what changed since the last save to a journal instead of rewriting the whole save
+JOURNAL_MODE = False
 
 def destroy_ui_elements():
     """
@@ -72,18 +103,20 @@ class GameLevel(ABC):
 
         This class serves as a blueprint for creating specific game levels.
         It manages the initialization of enemies, the player, and the game environment.
+        The enemies of a level are described by its spawn plan, which the enemy spawner
+        turns into enemies over the first frames of the level.
 
         Attributes:
             num_enemies_each_type (int): The number of enemies for each type in the level.
+            spawn_plan (list): The level's waves, each a list of SpawnGroups. Set by subclasses.
 
         Methods:
             load(): Initializes the game level by setting up the environment,
                      spawning the player, and spawning enemies.
             setup_environment(): Configures the game environment, including the platform
                                 and lighting.
-            spawn_enemies(): Abstract method that must be implemented in subclasses
-                             to define how enemies are spawned.
-            all_enemies_killed(): Checks if all enemies in the level have been defeated.
+            spawn_enemies(): Starts spawning the enemies of the level's spawn plan.
+            all_enemies_killed(): Checks if every enemy of the plan has been spawned and defeated.
 
     """
     def __init__(self, num_enemies_each_type):
@@ -96,16 +129,18 @@ class GameLevel(ABC):
             self.setup_environment()
 
         if player is None:
-            player = Player()
-        enemies = []
+            player = Player(hitscan=HITSCAN_MODE)
+        # Park enemies left over from a previous attempt, so spawning can reuse them
+        for enemy in enemies:
+            enemy_pool.release(enemy)
         self.spawn_enemies()
         level_in_progress = True
 
     def setup_environment(self):
         global sky_entity
 
-        platform = Entity(model='assets/arena', texture=None, texture_scale=(50, 50), position=(0, 7.5, 0))
-        platform = Entity(model='plane', scale=(10000, 1, 10000), texture='white_cube', texture_scale=(50, 50), collider='box')
+        platform = Entity(model=assets.model('assets/arena'), texture=None, texture_scale=(50, 50), position=(0, 7.5, 0))
+        platform = Entity(model='plane', scale=(10000, 1, 10000), texture=assets.texture('white_cube'), texture_scale=(50, 50), collider='box')
         platform.color = color.gray
 
 
@@ -114,12 +149,12 @@ class GameLevel(ABC):
         light.look_at(Vec3(1, -1, -1))
         point_light = PointLight(position=(0, 10, 0), color=color.rgb(1, 1, 1), intensity=0.01)
 
-    @abstractmethod
     def spawn_enemies(self):
-        pass
+        enemy_spawner.start(self.spawn_plan, player.controller, enemies)
 
     def all_enemies_killed(self):
-        return len(enemies) == 0
+        # Dead enemies leave the registry once their view has synced them after a gameplay step
+        return enemy_spawner.done and len(enemies) == 0
 
 # Derived class for Level 1
 class LevelOne(GameLevel):
@@ -127,134 +162,72 @@ class LevelOne(GameLevel):
         Derived class representing Level 1 of the game.
 
         This class defines the specific implementation of enemies for Level 1,
-        inheriting from the abstract GameLevel class. It initializes a set number
-        of enemies and defines their spawning behavior.
+        inheriting from the abstract GameLevel class: one wave with one enemy
+        of each type, each with a 20% chance of being duplicated.
 
         Methods:
             __init__(): Initializes LevelOne with a specific number of enemies.
-            spawn_enemies(): Creates and spawns enemy instances in the game level.
-                              It also checks for enemy health and duplicates them
-                              based on a random chance.
     """
+    spawn_plan = [
+        [
+            SpawnGroup('StandardEnemy', (10, 0.5, 2), (5, 0, 0), 1, 0.20),
+            SpawnGroup('FancyEnemy', (-2, 0.5, 2), (-5, 0, 0), 1, 0.20),
+            SpawnGroup('StandardCameraMan', (15, 0.5, 2), (5, 0, 0), 1, 0.20),
+            SpawnGroup('FancyCameraMan', (-10, 0.5, 2), (-5, 0, 0), 1, 0.20),
+        ],
+    ]
+
     def __init__(self):
         super().__init__(num_enemies_each_type=1)
 
-    def spawn_enemies(self):
-        """Spawns enemies in Level 1 and handles their duplication based on random chance."""
-        enemy1 = StandardEnemy(position=(10, 0.5, 2), player_entity=player.controller, all_enemies=enemies)
-        enemy2 = FancyEnemy(position=(-2, 0.5, 2), player_entity=player.controller, all_enemies=enemies)
-        enemy3 = StandardCameraMan(position=(15, 0.5, 2), player_entity=player.controller, all_enemies=enemies)
-        enemy4 = FancyCameraMan(position=(-10, 0.5, 2), player_entity=player.controller, all_enemies=enemies)
-
-        enemies.append(enemy1)
-        enemies.append(enemy2)
-        enemies.append(enemy3)
-        enemies.append(enemy4)
-
-        for enemy in [enemy1, enemy2, enemy3, enemy4]:
-            # Check if the enemy is alive
-            if StandardEnemy.is_alive(enemy):
-                print(f"{enemy.entity.name} is alive!")
-
-
-            if random.random() < 0.20:
-                duplicate = enemy.__class__.duplicate(position=enemy.entity.position + Vec3(2, 0, 0),
-                                                     player_entity=enemy.player_entity, all_enemies=enemies)
-                enemies.append(duplicate)
-
 # Derived class for Level 2
 class LevelTwo(GameLevel):
     """
         Derived class representing Level 2 of the game.
 
         This class defines the specific implementation of enemies for Level 2,
-        inheriting from the abstract GameLevel class. It initializes a specific
-        number of enemies and defines their spawning behavior with positional offsets.
+        inheriting from the abstract GameLevel class: one wave with two enemies
+        of each type, 5 units apart, each with a 50% chance of being duplicated.
 
         Methods:
             __init__(): Initializes LevelTwo with a specific number of enemies.
-            spawn_enemies(): Creates and spawns multiple enemy instances in the game level,
-                             with positional offsets for each pair of enemies. It also checks
-                             for enemy health and duplicates them based on a random chance.
     """
+    spawn_plan = [
+        [
+            SpawnGroup('StandardEnemy', (10, 0.5, 2), (5, 0, 0), 2, 0.50),
+            SpawnGroup('FancyEnemy', (-2, 0.5, 2), (-5, 0, 0), 2, 0.50),
+            SpawnGroup('StandardCameraMan', (15, 0.5, 2), (5, 0, 0), 2, 0.50),
+            SpawnGroup('FancyCameraMan', (-10, 0.5, 2), (-5, 0, 0), 2, 0.50),
+        ],
+    ]
+
     def __init__(self):
         super().__init__(num_enemies_each_type=2)
 
-    def spawn_enemies(self):
-        """Spawns enemies in Level 2 and handles their duplication based on random chance."""
-        for i in range(2):
-
-            enemy1 = StandardEnemy(position=(10 + i * 5, 0.5, 2), player_entity=player.controller, all_enemies=enemies)
-            enemy2 = FancyEnemy(position=(-2 - i * 5, 0.5, 2), player_entity=player.controller, all_enemies=enemies)
-            enemy3 = StandardCameraMan(position=(15 + i * 5, 0.5, 2), player_entity=player.controller,
-                                       all_enemies=enemies)
-            enemy4 = FancyCameraMan(position=(-10 - i * 5, 0.5, 2), player_entity=player.controller,
-                                    all_enemies=enemies)
-
-
-            enemies.append(enemy1)
-            enemies.append(enemy2)
-            enemies.append(enemy3)
-            enemies.append(enemy4)
-
-
-            for enemy in [enemy1, enemy2, enemy3, enemy4]:
-
-                if StandardEnemy.is_alive(enemy):
-                    print(f"{enemy.entity.name} is alive!")
-
-                if random.random() < 0.50:
-                    duplicate = enemy.__class__.duplicate(position=enemy.entity.position + Vec3(2, 0, 0),
-                                                          player_entity=enemy.player_entity, all_enemies=enemies)
-                    enemies.append(duplicate)
-
 # Derived class for Level 3
 class LevelThree(GameLevel):
     """
         Derived class representing Level 3 of the game.
 
         This class defines the specific implementation of enemies for Level 3,
-        inheriting from the abstract GameLevel class. It initializes a specific
-        number of enemies and defines their spawning behavior with positional offsets.
+        inheriting from the abstract GameLevel class: one wave with three enemies
+        of each type, 5 units apart, each with a 70% chance of being duplicated.
 
         Methods:
             __init__(): Initializes LevelThree with a specific number of enemies.
-            spawn_enemies(): Creates and spawns multiple enemy instances in the game level,
-                             with positional offsets for each set of enemies. It also checks
-                             for enemy health and duplicates them based on a random chance.
     """
+    spawn_plan = [
+        [
+            SpawnGroup('StandardEnemy', (10, 0.5, 2), (5, 0, 0), 3, 0.70),
+            SpawnGroup('FancyEnemy', (-2, 0.5, 2), (-5, 0, 0), 3, 0.70),
+            SpawnGroup('StandardCameraMan', (15, 0.5, 2), (5, 0, 0), 3, 0.70),
+            SpawnGroup('FancyCameraMan', (-10, 0.5, 2), (-5, 0, 0), 3, 0.70),
+        ],
+    ]
+
     def __init__(self):
         super().__init__(num_enemies_each_type=3)
 
-    def spawn_enemies(self):
-        """Spawns enemies in Level 3 and handles their duplication based on random chance."""
-        for i in range(3):
-
-            enemy1 = StandardEnemy(position=(10 + i * 5, 0.5, 2), player_entity=player.controller, all_enemies=enemies)
-            enemy2 = FancyEnemy(position=(-2 - i * 5, 0.5, 2), player_entity=player.controller, all_enemies=enemies)
-            enemy3 = StandardCameraMan(position=(15 + i * 5, 0.5, 2), player_entity=player.controller,
-                                       all_enemies=enemies)
-            enemy4 = FancyCameraMan(position=(-10 - i * 5, 0.5, 2), player_entity=player.controller,
-                                    all_enemies=enemies)
-
-
-            enemies.append(enemy1)
-            enemies.append(enemy2)
-            enemies.append(enemy3)
-            enemies.append(enemy4)
-
-
-            for enemy in [enemy1, enemy2, enemy3, enemy4]:
-
-
-                if StandardEnemy.is_alive(enemy):
-                    print(f"{enemy.entity.name} is alive!")
-
-                if random.random() < 0.70:
-                    duplicate = enemy.__class__.duplicate(position=enemy.entity.position + Vec3(2, 0, 0),
-                                                          player_entity=enemy.player_entity, all_enemies=enemies)
-                    enemies.append(duplicate)
-
 # GameLevels list
 gamelevels = [LevelOne(), LevelTwo(), LevelThree()]
 
@@ -282,9 +255,10 @@ def show_level_start_screen(level_index):
     """
         Displays the start screen for the specified level.
 
-        This function clears existing UI elements, creates a title text displaying the
-        current level number, and adds a start button that initiates the level when clicked.
-        It also unlocks the mouse cursor for player interaction.
+        This function starts prefetching the level's assets on worker threads, clears existing
+        UI elements, creates a title text displaying the current level number, and adds a start
+        button that initiates the level when clicked. It also unlocks the mouse cursor for player
+        interaction.
 
         Parameters:
             level_index (int): The index of the level for which the start screen is displayed.
@@ -297,6 +271,8 @@ def show_level_start_screen(level_index):
             None
     """
     global level_start_button, level_title_text
+    # Start loading the level's assets while the player looks at the start screen
+    assets.prefetch(models=LEVEL_MODELS, textures=LEVEL_TEXTURES, sounds=LEVEL_SOUNDS)
     destroy_ui_elements()
     level_title_text = Text(text=f'Level {level_index + 1}', scale=5, origin=(0, 0), y=0.3, color=color.white)
     level_start_button = Button(text='Start Level', color=color.azure, scale=(0.25, 0.1), y=-0.1)
@@ -335,25 +311,31 @@ def start_level(level_index):
     gamelevels[level_index].load()
     level_in_progress = True
     level_start_screen_active = False
+    # Only while the profiler is on (F3), like the rest of the performance output
+    if profiler.enabled:
+        print(assets.report())
 
 
     mouse.locked = True
 
-def save_game_state(filename="pickle_data/savefile.pkl"):
+def save_game_state(filename=SAVE_FILE):
     """
         Saves the current game state to a file.
 
-        This function captures the player's position, health, the state of all enemies,
-        and the current level index, then serializes this data into a specified file
-        using the pickle module.
+        This function captures a snapshot of the player's position, health, the state of
+        all enemies, the current level index and the enemies the spawner has yet to create.
+        The snapshot is then packed into the binary save format and written atomically to the
+        specified file on a background thread, so the frame is not held up by the write. In
+        journal mode, only the changes since the last save are appended to the save journal
+        instead, on the same thread.
 
         Parameters:
             filename (str): The path to the file where the game state will be saved.
-                            Default is "pickle_data/savefile.pkl".
+                            Default is "pickle_data/savefile.sav".
 
         Global variables modified:
             player: Reference to the player object to retrieve position and health.
-            enemies: List of current enemy instances to capture their states.
+            enemies: Registry of current enemy instances to capture their states.
             current_level_index (int): Index of the current level.
 
         Returns:
@@ -361,31 +343,41 @@ def save_game_state(filename="pickle_data/savefile.pkl"):
     """
 
     global player, enemies, current_level_index
+    if JOURNAL_MODE:
+        try:
+            save_journal.save(player.controller.position, player.get_health(), current_level_index, enemies, enemy_spawner.state())
+        except Exception as e:
+            raise GameException("An error occurred while saving the game state.") from e
+        print("Game state saved!")
+        return
+
     game_state = {
         "player_position": player.controller.position,
         "player_health": player.get_health(),
         "enemies": [(enemy.__class__.__name__, enemy.entity.position, enemy.health) for enemy in enemies],
-        "current_level_index": current_level_index
+        "current_level_index": current_level_index,
+        "spawner": enemy_spawner.state()
     }
-    with open(filename, "wb") as f:
-        pickle.dump(game_state, f)
-    print("Game state saved!")
+    background_saver.save(game_state, filename)
 
-def load_game_state(filename="pickle_data/savefile.pkl"):
+def load_game_state(filename=SAVE_FILE):
     """
         Loads the game state from a specified file.
 
-        This function retrieves the player's position, health, the states of all enemies,
-        and the current level index from a saved file. It updates the game state accordingly
-        and clears any existing enemies before adding new instances based on the saved data.
+        This function reads the binary save file and retrieves the player's position, health,
+        the states of all enemies, the current level index and the spawner's queue and remaining
+        waves from it (in journal mode, the snapshot with the save journal replayed on top).
+        It updates the game state accordingly and reconciles the live enemies with the saved
+        ones: enemies of a saved class are moved and healed in place, missing ones are taken
+        from the enemy pool and extra ones are parked in it.
 
         Parameters:
             filename (str): The path to the file from which the game state will be loaded.
-                            Default is "pickle_data/savefile.pkl".
+                            Default is "pickle_data/savefile.sav".
 
         Global variables modified:
             player: Reference to the player object, updating position and health.
-            enemies: List of current enemy instances, cleared and repopulated with loaded data.
+            enemies: Registry of current enemy instances, patched to match the loaded data.
             current_level_index (int): Index of the current level, updated from the loaded state.
 
         Raises:
@@ -396,43 +388,104 @@ def load_game_state(filename="pickle_data/savefile.pkl"):
     """
 
     global player, enemies, current_level_index
+
+    # Make sure a save that is still being written has reached the file
+    background_saver.wait()
     try:
-        with open(filename, "rb") as f:
-            game_state = pickle.load(f)
-            player.controller.position = game_state["player_position"]
-            player.set_health(game_state["player_health"])
+        game_state = save_journal.load() if JOURNAL_MODE else read_game_state(filename)
+        player.controller.position = Vec3(*game_state["player_position"])
+        player.set_health(game_state["player_health"])
+
+        current_level_index = game_state["current_level_index"]
+
+        # The spawner picks up the queued enemies and later waves of the save. Saves without
+        # the spawner's state hold every enemy there is, so nothing more is created for them
+        spawner_state = game_state.get("spawner")
+        if spawner_state is not None and current_level_index < len(gamelevels):
+            enemy_spawner.restore(gamelevels[current_level_index].spawn_plan, *spawner_state, player.controller, enemies)
+        else:
+            enemy_spawner.cancel()
+
+        # Patch live enemies of the same class in place, take missing ones from the pool
+        # and park the ones the save doesn't have
+        live_enemies = {}
+        for enemy in enemies:
+            live_enemies.setdefault(enemy.__class__.__name__, []).append(enemy)
+        for class_enemies in live_enemies.values():
+            class_enemies.reverse()
+
+        loaded_enemies = []
+        for enemy_class_name, position, health in game_state["enemies"]:
+            class_enemies = live_enemies.get(enemy_class_name)
+            if class_enemies:
+                enemy = class_enemies.pop()
+                # Move the body, the enemy shows it right away
+                enemy.body.x, enemy.body.y, enemy.body.z = position
+                enemy.body.moved = True
+                enemy.sync_from(enemy.body)
+            else:
+                enemy = enemy_pool.acquire(ENEMY_CLASSES[enemy_class_name], Vec3(*position), player.controller, enemies)
+                enemies.add(enemy)
+            enemy.health = health
+            enemy.update_health_bar()
+            loaded_enemies.append(enemy)
+
+        for class_enemies in live_enemies.values():
+            for enemy in class_enemies:
+                enemy_pool.release(enemy)
+
+        # The swarm would write its old positions back over the loaded ones
+        if enemy_swarm is not None:
+            enemy_swarm.invalidate()
+
+        if JOURNAL_MODE:
+            save_journal.bind(loaded_enemies)
+        print("Game state loaded!")
+    except FileNotFoundError as e:
+        raise GameException(f"Failed to load game state: File '{filename}' not found.") from e
 
-            current_level_index = game_state["current_level_index"]
+    except GameException as e:
+        raise GameException(f"Failed to load game state: {e}") from e
 
+    except Exception as e:
+        raise GameException("An error occurred while loading the game state.") from e
 
-            for enemy in enemies:
-                destroy(enemy.entity)
-                if hasattr(enemy, 'health_bar'):
-                    destroy(enemy.health_bar)
-            enemies.clear()
+def rendered_entities():
+    """Returns the entities whose movement is simulated in gameplay steps: every enemy and bullet in flight."""
+    entities = [enemy.entity for enemy in enemies]
+    if player:
+        entities.extend(player.weapon.bullet_pool.active)
+    return entities
 
+def step_gameplay(dt):
+    """
+        Advances the gameplay by one fixed step.
 
-            for enemy_class_name, position, health in game_state["enemies"]:
-                enemy_class = globals()[enemy_class_name]
-                new_enemy = enemy_class(position=position, player_entity=player.controller, all_enemies=enemies)
-                new_enemy.health = health
-                new_enemy.update_health_bar()
-                enemies.append(new_enemy)
+        The step runs in the game simulation (simulation.py): bullets travel and hit enemies,
+        enemies follow the player and keep apart from each other, and enemies in range attack
+        the player once their cooldown has passed. The simulation view copies the player and
+        the bullets fired in, and shows the result on the player, enemies and bullets.
 
-        print("Game state loaded!")
-    except FileNotFoundError as e:
-        raise GameException(f"Failed to load game state: File '{filename}' not found.") from e
+        Parameters:
+            dt (float): The length of the step in seconds.
 
-    except Exception as e:
-        raise GameException("An error occurred while loading the game state.") from e
+        Returns:
+            None
+    """
+    # Enemies stop attacking once the level is over, for example on the game over screen
+    if player:
+        simulation_view.step(player, enemies, dt, attacks=level_in_progress)
 
 def update():
     """
         Updates the game state during each frame.
 
-        This function is responsible for updating the player's state, handling enemy actions,
-        and managing game controls for saving and loading the game state. It also checks if
-        all enemies have been defeated in the current level and transitions to the next level if so.
+        This function handles the player's input and reports failed background saves every
+        frame. The gameplay itself (bullets, enemy movement and attacks) is advanced in fixed
+        steps on the game clock, as many as fit into the time since the last frame, and enemies
+        and bullets are rendered interpolated between their last two steps. It shows the game
+        over screen when the player has died, and checks if all enemies have been defeated in
+        the current level and transitions to the next level if so.
 
         Global variables modified:
             level_in_progress (bool): Indicates whether the current level is still in progress.
@@ -443,32 +496,101 @@ def update():
 
         Raises:
             GameException: If there is an error during the player's update, such as if the player is
-                           not properly initialized or has been destroyed.
+                           not properly initialized or has been destroyed, or if a background save failed.
     """
 
     global level_in_progress, level_start_screen_active
+
+    profiler.begin_frame()
+
     if player and level_in_progress:
         try:
-            player.update()
+            with profiler.scope('Player.update'):
+                player.update()
         except AttributeError as e:
             raise GameException("Error during player update: Player not properly initialized or destroyed.") from e
 
-    if not level_start_screen_active:
-        if held_keys['p']:
-            save_game_state()
-
-        if held_keys['l']:
-            load_game_state()
+    # Report a failed background save on the game thread
+    background_saver.poll()
+
+    # Create the next enemies of the level's spawn plan, within the spawner's time budget
+    if level_in_progress:
+        with profiler.scope('spawner'):
+            enemy_spawner.update()
+
+    # Step the gameplay from where the last step left it, then render between the last two steps
+    steps = game_clock.advance(time.dt)
+    with profiler.scope('interpolation'):
+        render_interpolator.restore()
+    for _ in range(steps):
+        game_clock.tick()
+        # Bullet lifetimes, reloads and attack cooldowns that end at this step
+        with profiler.scope('timers'):
+            game_timers.advance_to(game_clock.ticks)
+        with profiler.scope('interpolation'):
+            render_interpolator.begin_step(rendered_entities())
+        step_gameplay(game_clock.step)
+    with profiler.scope('interpolation'):
+        render_interpolator.show(rendered_entities(), game_clock.alpha)
+
+    with profiler.scope('health bars'):
+        if enemy_swarm is None:
+            game_simulation.lod.update_health_bars(enemies, steps)
+        else:
+            for enemy in enemies:
+                enemy.update_health_bar()
 
-    for enemy in enemies:
-        enemy.attack(player)
-        enemy.update_health_bar()
+        # Send every bar's anchor and health ratio to the GPU in one copy, if any of them changed
+        health_bars.upload()
+    ui_changes.end_frame()
 
+    # Show the game over screen as an overlay, the frame loop keeps running underneath
+    if level_in_progress and player and player.is_dead():
+        show_game_over_screen()
 
     if level_in_progress and current_level_index < len(gamelevels) and gamelevels[current_level_index].all_enemies_killed():
         level_in_progress = False
         go_to_next_level()
 
+    profiler.count('enemies', len(enemies))
+    profiler.count('bullets', len(player.weapon.bullet_pool.active) if player else 0)
+    profiler.count('steps', steps)
+    profiler.count('spawn queue', len(enemy_spawner.pending))
+    profiler.count('timers', game_timers.pending)
+    profiler.count('in attack range', len(game_simulation.attacks.in_range))
+    for tier, count in game_simulation.lod.counts.items():
+        profiler.count(f'{tier} enemies', count)
+    profiler.end_update()
+    profiler_overlay.refresh()
+
+def input(key):
+    """
+        Handles key presses for saving and loading the game state, and for the profiler.
+
+        Ursina calls this function once when a key goes down, so a single press of P
+        saves once and a single press of L loads once, no matter how long the key is held.
+        F3 shows or hides the profiler overlay and F4 writes the last seconds of profiling
+        as a Chrome trace, on any screen.
+
+        Parameters:
+            key (str): The name of the key that was pressed.
+
+        Returns:
+            None
+    """
+    if key == 'f3':
+        profiler_overlay.toggle()
+    elif key == 'f4' and profiler.enabled:
+        print(f"Profile written to {profiler.dump_chrome_trace()}")
+
+    if level_start_screen_active or game_over_active or player is None:
+        return
+
+    if key == 'p':
+        save_game_state()
+    elif key == 'l':
+        load_game_state()
+
 def go_to_next_level():
     """
         Advances the game to the next level.
@@ -519,6 +641,60 @@ def show_congratulations_screen():
     mouse.locked = False
 
 
+def show_game_over_screen():
+    """
+        Displays the game over screen when the player dies.
+
+        This function ends the current level, so enemies stop attacking and the player
+        can no longer act, and shows a game over message with buttons to restart the
+        level or quit. The screen is made of regular UI entities, so the game keeps
+        rendering and running its update loop while it is shown.
+
+        Global variables modified:
+            level_in_progress (bool): Set to False, as the level has ended.
+            game_over_active (bool): Indicates that the game over screen is displayed.
+
+        Returns:
+            None
+    """
+    global level_in_progress, game_over_active
+    level_in_progress = False
+    game_over_active = True
+
+    game_over_text = Text(text='Game Over!', scale=5, origin=(0, 0), y=0.3, color=color.red)
+    restart_button = Button(text='Restart Level', color=color.azure, scale=(0.25, 0.1), y=-0.1)
+    restart_button.on_click = restart_level
+    quit_button = Button(text='Quit', color=color.red, scale=(0.25, 0.1), y=-0.25)
+    quit_button.on_click = application.quit
+
+
+    level_overlay_ui.append(game_over_text)
+    level_overlay_ui.append(restart_button)
+    level_overlay_ui.append(quit_button)
+
+
+    mouse.locked = False
+
+def restart_level():
+    """
+        Restarts the current level after the player died.
+
+        The player is restored to full health and ammo at the spawn point, and the level
+        is started again. The app, the player and the level environment are kept; enemies
+        left over from the failed attempt are parked in the enemy pool by the level load.
+
+        Global variables modified:
+            game_over_active (bool): Set to False, as the game over screen is closed.
+
+        Returns:
+            None
+    """
+    global game_over_active
+    game_over_active = False
+    player.reset()
+    start_level(current_level_index)
+
+
 def show_start_menu():
     """
         Displays the start menu for the game.
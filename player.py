@@ -1,13 +1,12 @@
 # player.py
-from ursina import *
+from ursina import Text, Vec3, color, held_keys, mouse
 from ursina.prefabs.first_person_controller import FirstPersonController
 from ursina.prefabs.health_bar import HealthBar
-from ursina import Audio, Text
-from ursina import invoke
-from weapon import Weapon, Bullet
-import time
-import customtkinter as ctk
-import sys
+from weapon import Weapon
+from change_tracker import ui_changes
+from sound import sounds, RELOAD_PRIORITY
+from timestep import game_clock
+from timers import game_timers
 
 class Player:
     """
@@ -19,9 +18,8 @@ class Player:
 
         Attributes:
             __controller (FirstPersonController): The controller for player movement and actions.
-            __start_time (float): The time when the player started the game.
+            __start_time (float): The game clock time when the player started the game.
             __weapon (Weapon): The player's weapon.
-            __bullets (list): A list of bullets shot by the player.
             __shoot_cooldown (float): The cooldown time between shots.
             __last_shoot_time (float): The last time the player shot.
             __health (HealthBar): The player's health bar.
@@ -30,30 +28,33 @@ class Player:
             __reloading (bool): Indicates whether the player is currently reloading.
             __reload_time (float): The time it takes to reload.
             __ammo_counter (Text): Displays the current ammo status on the screen.
+            __spawn_position (tuple): Where the player starts and is moved back to on reset.
 
         Methods:
             get_health(): Returns the current health of the player.
             set_health(value): Sets the player's health to the specified value.
             decrement_health(number): Decreases the player's health by a specified amount.
-            game_over_popup(): Displays a "Game Over" popup window.
-            exit_game(): Exits the game application.
+            is_dead(): Returns whether the player's health has run out.
+            reset(): Restores health and ammo and moves the player back to the spawn point.
             shoot(): Triggers the shooting logic if conditions are met.
             update(): Updates the player's state each frame, handling movement, shooting, and ammo status.
             reload(): Initiates the reloading process.
+            sync_from(body): Applies the damage the simulation dealt to the player's body.
             controller: Property that returns the player controller.
+            weapon: Property that returns the player's weapon.
     """
-    def __init__(self, position=(0, 2, 0), speed=5, jump_height=2):
+    def __init__(self, position=(0, 2, 0), speed=5, jump_height=2, hitscan=False):
         self.__controller = FirstPersonController(position=position)
+        self.__spawn_position = position
         self.__controller.speed = speed
         self.__controller.jump_height = jump_height
 
-        self.__start_time = time.time()
+        self.__start_time = game_clock.time
 
-        self.__weapon = Weapon(parent=self.__controller.camera_pivot)
+        self.__weapon = Weapon(parent=self.__controller.camera_pivot, hitscan=hitscan)
         self.__weapon.entity.position = Vec3(0.5, -0.5, 1.5)
         self.__weapon.entity.rotation = Vec3(0, 0, 0)
 
-        self.__bullets = []
         self.__shoot_cooldown = .1
         self.__last_shoot_time = 0
         self.__health = HealthBar(bar_color=color.lime.tint(-.25), curve=.5, max_value=100, value=100)
@@ -70,51 +71,51 @@ class Player:
         return self.__health.value
 
     def set_health(self, value):
-        self.__health.value = value
+        # Assigning the HealthBar value redraws it, so skip it when nothing changes
+        if value != self.__health.value:
+            self.__health.value = value
 
     # Decrement health safely
     def decrement_health(self, number):
+        if self.is_dead():
+            return
         self.__health.value -= number
         if self.__health.value <= 0:
             self.__health.value = 0
             print("Player has died.")
-            self.game_over_popup()  # Call the game over popup when player dies
-
-    # Display Game Over CustomTkinter Popup
-    def game_over_popup(self):
-        # Initialize the Tkinter root window
-        root = ctk.CTk()
-        root.geometry("300x150")
-        root.title("Game Over")
-
-        # Create a label for the popup
-        label = ctk.CTkLabel(root, text="Game Over!", font=("Arial", 24))
-        label.pack(pady=20)
-
-        # Create an exit button
-        button = ctk.CTkButton(root, text="Exit Game", command=self.exit_game)
-        button.pack(pady=20)
-
-        # Start the Tkinter main loop
-        root.mainloop()
-
-    # Exit the game
-    def exit_game(self):
-        sys.exit()
+            # The game loop notices the death and shows the game over screen
+            self.__controller.enabled = False
+
+    def is_dead(self):
+        return self.__health.value <= 0
+
+    # Bring the player back to full health and ammo at the spawn point, for restarting a level
+    def reset(self):
+        for bullet in list(self.__weapon.bullet_pool.active):
+            bullet.destroy_bullet()
+        # A reload that was still running must not finish after the restart
+        game_timers.cancel_owner(self)
+        self.__controller.position = self.__spawn_position
+        self.__controller.rotation = Vec3(0, 0, 0)
+        self.__controller.camera_pivot.rotation = Vec3(0, 0, 0)
+        self.__controller.enabled = True
+        self.set_health(self.__health.max_value)
+        self.__ammo = self.__magazine_capacity
+        self.__reloading = False
+        self.__last_shoot_time = 0
 
     # Shooting logic (private)
     def __shoot(self):
-        if time.time() - self.__last_shoot_time >= self.__shoot_cooldown and self.__ammo > 0:
+        if game_clock.time - self.__last_shoot_time >= self.__shoot_cooldown and self.__ammo > 0:
             bullet = self.__weapon.shoot()
             if bullet:
-                self.__bullets.append(bullet)
                 self.__ammo -= 1
-            self.__last_shoot_time = time.time()
+            self.__last_shoot_time = game_clock.time
 
     # Public method to control shooting
     def shoot(self):
         # Check if the mouse is clicked and if the player is not reloading
-        if mouse.left and not self.__reloading and time.time() - self.__start_time > 1:
+        if mouse.left and not self.__reloading and game_clock.time - self.__start_time > 1:
             self.__shoot()
 
     # Update method
@@ -130,26 +131,24 @@ class Player:
         # Only shoot when the left mouse button is pressed
         if mouse.left:
             self.shoot()
-
-        for bullet in self.__bullets:
-            bullet.update()
-            if not bullet.alive:
-                self.__bullets.remove(bullet)
-
-        self.__ammo_counter.text = f'MP5K: {self.__ammo}/{self.__magazine_capacity}'
-        if self.__ammo > 20:
-            self.__ammo_counter.color = color.white
-        elif 1 <= self.__ammo <= 20:
-            self.__ammo_counter.color = color.yellow
-        else:
-            self.__ammo_counter.color = color.red
+        self.__weapon.resolve_shots()
+
+        # Rebuilding the Text geometry is expensive, so only touch it when the ammo or reload state changes
+        if ui_changes.changed('ammo_counter', (self.__ammo, self.__magazine_capacity, self.__reloading)):
+            self.__ammo_counter.text = f'MP5K: {self.__ammo}/{self.__magazine_capacity}'
+            if self.__ammo > 20:
+                self.__ammo_counter.color = color.white
+            elif 1 <= self.__ammo <= 20:
+                self.__ammo_counter.color = color.yellow
+            else:
+                self.__ammo_counter.color = color.red
 
     # Reload method (private)
     def __reload(self):
         if self.__ammo < self.__magazine_capacity:
             self.__reloading = True
-            Audio('assets/reload_sound.mp3', autoplay=True)
-            invoke(self.__finish_reload, delay=self.__reload_time)
+            sounds.play('assets/reload_sound.mp3', priority=RELOAD_PRIORITY)
+            game_timers.schedule(self.__reload_time, self.__finish_reload, owner=self)
 
     def reload(self):
         self.__reload()
@@ -159,6 +158,15 @@ class Player:
         self.__ammo = self.__magazine_capacity
         self.__reloading = False
 
+    def sync_from(self, body):
+        # Enemies only ever take health away, so anything missing from the body is damage
+        if body.health < self.get_health():
+            self.decrement_health(self.get_health() - body.health)
+
     @property
     def controller(self):
-        return self.__controller
\ No newline at end of file
+        return self.__controller
+
+    @property
+    def weapon(self):
+        return self.__weapon
@@ -0,0 +1,246 @@
+# profiler.py
+from collections import deque
+import json
+import os
+import time
+from ursina import Text, color
+
+# Upper bounds of the histogram buckets, in milliseconds
+HISTOGRAM_BUCKETS_MS = (.1, .25, .5, 1, 2, 4, 8, 16.7, 33.3, float('inf'))
+
+# Where trace dumps are written
+TRACE_FOLDER = 'profiles'
+
+
+class _Scope:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.profiler.record(self.name, self.start, time.perf_counter())
+        return False
+
+
+class _NullScope:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+# Handed out while the profiler is disabled, so a timed block costs one call and an attribute check
+_NULL_SCOPE = _NullScope()
+
+
+class FrameProfiler:
+    """
+        Times the game's subsystems every frame, for finding out where a stutter came from.
+
+        Hot paths are wrapped in scopes (with profiler.scope('Player.update'): ...). While
+        the profiler is enabled, every scope is kept as a trace event and added to its
+        subsystem's total for the frame. The game's whole update() is recorded as 'update',
+        and the time between its end and the start of the next one (entity scripts, input
+        and drawing the frame) as 'engine and render'. The last window frames make up the
+        rolling statistics and histograms, and the last history seconds of events can be
+        dumped as a Chrome trace (open it in chrome://tracing or Perfetto). While disabled,
+        scope() returns a shared no-op scope and nothing is recorded.
+
+        Attributes:
+            enabled (bool): Whether scopes are recorded.
+            history (float): Seconds of trace events kept for dumping.
+            window (int): Number of frames the statistics are computed over.
+            events (deque): (name, start, end) of every recorded scope, oldest first.
+            frames (deque): (start, end, totals, counters) of every finished frame, oldest first.
+            totals (dict): Maps a subsystem to the seconds spent in it so far this frame.
+            counters (dict): Maps a counter (for example the number of enemies) to its value this frame.
+
+        Methods:
+            enable(enabled): Turns recording on or off, dropping what was recorded when turned off.
+            scope(name): Returns a context manager that times the block it wraps.
+            record(name, start, end): Records a timed block.
+            count(name, value): Records a counter value for the current frame.
+            begin_frame(): Closes the previous frame and starts a new one, called at the start of update().
+            end_update(): Records the game's update(), called at its end.
+            stats(): Returns the mean, 95th percentile and maximum milliseconds of every subsystem.
+            histogram(name): Returns how many frames fell into each of HISTOGRAM_BUCKETS_MS for a subsystem.
+            top(count): Returns the subsystems with the highest mean time.
+            dump_chrome_trace(filename, seconds): Writes the last seconds of events as a Chrome trace file.
+    """
+    def __init__(self, history=10, window=120):
+        self.enabled = False
+        self.history = history
+        self.window = window
+        self.events = deque()
+        self.frames = deque()
+        self.totals = {}
+        self.counters = {}
+        self.__frame_start = None
+        self.__update_end = None
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+        if not enabled:
+            self.events.clear()
+            self.frames.clear()
+        self.totals = {}
+        self.counters = {}
+        self.__frame_start = None
+        self.__update_end = None
+
+    def scope(self, name):
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _Scope(self, name)
+
+    def record(self, name, start, end):
+        self.events.append((name, start, end))
+        self.totals[name] = self.totals.get(name, 0) + end - start
+
+    def count(self, name, value):
+        if self.enabled:
+            self.counters[name] = value
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self.__frame_start is not None:
+            if self.__update_end is not None:
+                self.record('engine and render', self.__update_end, now)
+            self.frames.append((self.__frame_start, now, self.totals, self.counters))
+
+        # Forget what is older than the trace history, keeping at least the statistics window
+        while len(self.frames) > self.window and self.frames[0][1] < now - self.history:
+            self.frames.popleft()
+        while self.events and self.events[0][2] < now - self.history:
+            self.events.popleft()
+
+        self.totals = {}
+        self.counters = {}
+        self.__frame_start = now
+        self.__update_end = None
+
+    def end_update(self):
+        if self.enabled and self.__frame_start is not None:
+            self.__update_end = time.perf_counter()
+            self.record('update', self.__frame_start, self.__update_end)
+
+    def __window(self):
+        return list(self.frames)[-self.window:]
+
+    def __samples(self, name, frames):
+        if name == 'frame':
+            return [(end - start) * 1000 for start, end, totals, counters in frames]
+        return [totals.get(name, 0) * 1000 for start, end, totals, counters in frames]
+
+    def stats(self):
+        frames = self.__window()
+        names = {'frame'}
+        for start, end, totals, counters in frames:
+            names.update(totals)
+        stats = {}
+        for name in names:
+            samples = sorted(self.__samples(name, frames))
+            if samples:
+                stats[name] = {
+                    'mean_ms': sum(samples) / len(samples),
+                    'p95_ms': samples[min(len(samples) - 1, int(len(samples) * .95))],
+                    'max_ms': samples[-1],
+                }
+        return stats
+
+    def histogram(self, name):
+        counts = [0] * len(HISTOGRAM_BUCKETS_MS)
+        for sample in self.__samples(name, self.__window()):
+            for index, bound in enumerate(HISTOGRAM_BUCKETS_MS):
+                if sample <= bound:
+                    counts[index] += 1
+                    break
+        return counts
+
+    def top(self, count=5):
+        # The whole frame and update() contain every other subsystem, so they are never the culprit
+        stats = self.stats()
+        subsystems = [(name, values) for name, values in stats.items() if name not in ('frame', 'update')]
+        return sorted(subsystems, key=lambda item: -item[1]['mean_ms'])[:count]
+
+    def dump_chrome_trace(self, filename=None, seconds=None):
+        if filename is None:
+            filename = os.path.join(TRACE_FOLDER, time.strftime('trace-%Y%m%d-%H%M%S.json'))
+        seconds = self.history if seconds is None else seconds
+        since = time.perf_counter() - seconds
+
+        trace_events = []
+        for name, start, end in self.events:
+            if end >= since:
+                trace_events.append({'name': name, 'cat': 'game', 'ph': 'X', 'pid': 1, 'tid': 1,
+                                     'ts': start * 1e6, 'dur': (end - start) * 1e6})
+        for start, end, totals, counters in self.frames:
+            if end >= since and counters:
+                trace_events.append({'name': 'counts', 'ph': 'C', 'pid': 1, 'tid': 1, 'ts': start * 1e6, 'args': counters})
+
+        folder = os.path.dirname(filename)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(filename, 'w') as f:
+            json.dump({'traceEvents': trace_events, 'displayTimeUnit': 'ms'}, f)
+        return filename
+
+
+class ProfilerOverlay:
+    """
+        Shows the profiler's frame time, entity counts and slowest subsystems on screen.
+
+        The text is only rebuilt a few times per second, since rebuilding Text geometry
+        every frame would show up in the profile itself.
+
+        Attributes:
+            profiler (FrameProfiler): The profiler whose statistics are shown.
+            text (Text): The overlay text in the top left corner.
+            interval (float): Seconds between two refreshes of the text.
+
+        Methods:
+            toggle(): Shows or hides the overlay, enabling the profiler while it is shown.
+            refresh(): Rebuilds the text from the profiler's statistics, if the interval has passed.
+    """
+    def __init__(self, profiler, interval=.5):
+        self.profiler = profiler
+        self.interval = interval
+        self.text = Text(text='', position=(-.87, .47), origin=(-.5, .5), scale=.8, color=color.white,
+                         background=True, enabled=False)
+        self.__last_refresh = 0
+
+    def toggle(self):
+        self.text.enabled = not self.text.enabled
+        self.profiler.enable(self.text.enabled)
+
+    def refresh(self):
+        now = time.perf_counter()
+        if not self.text.enabled or now - self.__last_refresh < self.interval:
+            return
+        self.__last_refresh = now
+
+        stats = self.profiler.stats()
+        frame = stats.get('frame')
+        lines = ['F3 hide  F4 dump trace']
+        if frame:
+            lines.append(f"frame {frame['mean_ms']:.1f} ms (p95 {frame['p95_ms']:.1f}, max {frame['max_ms']:.1f})")
+        if self.profiler.frames:
+            counters = self.profiler.frames[-1][3]
+            lines.append('  '.join(f'{name} {value}' for name, value in counters.items()))
+        for name, values in self.profiler.top(5):
+            lines.append(f"{name}: {values['mean_ms']:.2f} ms (p95 {values['p95_ms']:.2f})")
+        self.text.text = '\n'.join(lines)
+
+
+# Shared profiler for the game loop's hot paths
+profiler = FrameProfiler()
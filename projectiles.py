@@ -0,0 +1,83 @@
+# projectiles.py
+
+
+def segment_hit(start, end, box_min, box_max):
+    """Slab test, returns the entry fraction along the segment from start to end into the box, or None if it misses."""
+    t_enter, t_exit = 0.0, 1.0
+    for axis in range(3):
+        delta = end[axis] - start[axis]
+        if delta == 0:
+            if start[axis] < box_min[axis] or start[axis] > box_max[axis]:
+                return None
+            continue
+        t1 = (box_min[axis] - start[axis]) / delta
+        t2 = (box_max[axis] - start[axis]) / delta
+        if t1 > t2:
+            t1, t2 = t2, t1
+        t_enter = max(t_enter, t1)
+        t_exit = min(t_exit, t2)
+        if t_enter > t_exit:
+            return None
+    return t_enter
+
+
+class ProjectileSystem:
+    """
+        Moves every live bullet and resolves its hits in one batched pass.
+
+        Each bullet sweeps the full segment it travels during the step, so fast bullets
+        cannot tunnel through an enemy at low frame rates. The segment is only tested
+        against the hit boxes of enemies found in the enemy grid, plus the ground plane,
+        instead of every collider in the scene. Bullets and enemies are the Simulation's
+        bodies, so this runs without Ursina.
+
+        Attributes:
+            ground_height (float): The height of the ground plane that stops bullets.
+            damage (int): The damage a bullet deals to the enemy it hits.
+
+        Methods:
+            segment_hit(start, end, box_min, box_max): Returns where along a segment it enters a box.
+            step(bullets, grid, dt): Moves all bullets, ends the ones that hit something and
+                                     returns the (enemy, damage) of every hit.
+    """
+    def __init__(self, ground_height=0, damage=7):
+        self.ground_height = ground_height
+        self.damage = damage
+
+    segment_hit = staticmethod(segment_hit)
+
+    def step(self, bullets, grid, dt):
+        hits = []
+        for bullet in bullets:
+            if not bullet.alive:
+                continue
+            start = (bullet.x, bullet.y, bullet.z)
+            travel = bullet.speed * dt
+            end = (bullet.x + bullet.dx * travel, bullet.y + bullet.dy * travel, bullet.z + bullet.dz * travel)
+
+            nearest_t, nearest_enemy = None, None
+            if start[1] != end[1] and min(start[1], end[1]) <= self.ground_height <= max(start[1], end[1]):
+                nearest_t = (start[1] - self.ground_height) / (start[1] - end[1])
+
+            # Only enemies in the cells around the swept segment can be hit
+            middle = ((start[0] + end[0]) * .5, 0, (start[2] + end[2]) * .5)
+            for enemy in grid.query(middle, travel * .5 + grid.cell_size):
+                if enemy.health <= 0:
+                    continue
+                box_min = (enemy.x + enemy.bounds_min[0], enemy.y + enemy.bounds_min[1], enemy.z + enemy.bounds_min[2])
+                box_max = (enemy.x + enemy.bounds_max[0], enemy.y + enemy.bounds_max[1], enemy.z + enemy.bounds_max[2])
+                t = self.segment_hit(start, end, box_min, box_max)
+                if t is not None and (nearest_t is None or t < nearest_t):
+                    nearest_t, nearest_enemy = t, enemy
+
+            if nearest_t is None:
+                bullet.x, bullet.y, bullet.z = end
+                continue
+
+            bullet.x = start[0] + (end[0] - start[0]) * nearest_t
+            bullet.y = start[1] + (end[1] - start[1]) * nearest_t
+            bullet.z = start[2] + (end[2] - start[2]) * nearest_t
+            bullet.alive = False
+            if nearest_enemy is not None:
+                hits.append((nearest_enemy, self.damage))
+        return hits
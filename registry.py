@@ -0,0 +1,123 @@
+# registry.py
+from collections import namedtuple
+
+# A handle stays valid only while the slot still holds the same enemy
+EnemyHandle = namedtuple('EnemyHandle', ['slot', 'generation'])
+
+
+class _DenseSet:
+    """A list with an index map, so items can be swap-removed in O(1)."""
+    def __init__(self):
+        self.items = []
+        self.index = {}
+
+    def add(self, item):
+        self.index[item] = len(self.items)
+        self.items.append(item)
+
+    def remove(self, item):
+        position = self.index.pop(item)
+        last = self.items.pop()
+        if last is not item:
+            self.items[position] = last
+            self.index[last] = position
+
+
+class EnemyRegistry:
+    """
+        Keeps track of every live enemy in the level.
+
+        Enemies are stored in a dense list with an index map, so adding and removing
+        an enemy are O(1) (removal swaps the last enemy into the freed spot). Each enemy
+        also gets a handle made of a slot and a generation. Once the enemy is removed,
+        the slot's generation changes and old handles stop resolving, even if the slot
+        is reused. Enemies are additionally partitioned by class for typed iteration.
+
+        Iterating the registry walks a snapshot, so enemies can be added or removed
+        while a loop is running. Enemies removed during the loop are skipped.
+
+        Attributes:
+            _all (_DenseSet): Every registered enemy.
+            _by_type (dict): Maps an enemy class to a _DenseSet of its instances.
+            _slots (list): The enemy held by each handle slot, or None when free.
+            _generations (list): The current generation of each handle slot.
+            _free_slots (list): Slots that can be reused.
+            _slot_of (dict): Maps an enemy to its handle slot.
+
+        Methods:
+            add(enemy): Registers an enemy and returns its handle.
+            remove(enemy): Unregisters an enemy, invalidating its handle.
+            clear(): Unregisters every enemy.
+            handle(enemy): Returns the current handle of a registered enemy.
+            get(handle): Returns the enemy for a handle, or None if it is no longer valid.
+            of_type(enemy_class): Iterates the registered enemies of exactly that class.
+    """
+    def __init__(self):
+        self._all = _DenseSet()
+        self._by_type = {}
+        self._slots = []
+        self._generations = []
+        self._free_slots = []
+        self._slot_of = {}
+
+    def add(self, enemy):
+        if enemy in self._slot_of:
+            return self.handle(enemy)
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._slots)
+            self._slots.append(None)
+            self._generations.append(0)
+        self._slots[slot] = enemy
+        self._slot_of[enemy] = slot
+
+        self._all.add(enemy)
+        self._by_type.setdefault(type(enemy), _DenseSet()).add(enemy)
+        return EnemyHandle(slot, self._generations[slot])
+
+    def remove(self, enemy):
+        slot = self._slot_of.pop(enemy, None)
+        if slot is None:
+            return
+        self._slots[slot] = None
+        self._generations[slot] += 1
+        self._free_slots.append(slot)
+
+        self._all.remove(enemy)
+        self._by_type[type(enemy)].remove(enemy)
+
+    def clear(self):
+        for enemy in list(self._all.items):
+            self.remove(enemy)
+
+    def handle(self, enemy):
+        slot = self._slot_of[enemy]
+        return EnemyHandle(slot, self._generations[slot])
+
+    def get(self, handle):
+        if handle.slot < len(self._slots) and self._generations[handle.slot] == handle.generation:
+            return self._slots[handle.slot]
+        return None
+
+    def __iter_snapshot(self, items):
+        for enemy in list(items):
+            # Skip enemies removed since the loop started
+            if enemy in self._slot_of:
+                yield enemy
+
+    def of_type(self, enemy_class):
+        partition = self._by_type.get(enemy_class)
+        if partition is None:
+            return iter(())
+        return self.__iter_snapshot(partition.items)
+
+    def __iter__(self):
+        return self.__iter_snapshot(self._all.items)
+
+    def __len__(self):
+        return len(self._all.items)
+
+    def __contains__(self, enemy):
+        return enemy in self._slot_of
@@ -0,0 +1,647 @@
+# savegame.py
+import os
+import struct
+import tempfile
+import threading
+import zlib
+from collections import deque
+from customexception import GameException
+
+SAVE_FILE = "pickle_data/savefile.sav"
+# Where saves were written before the binary format, read when there is no binary save yet
+LEGACY_SAVE_FILE = "pickle_data/savefile.pkl"
+JOURNAL_FILE = "pickle_data/savefile.journal"
+SAVE_MAGIC = b"U1SV"
+SAVE_VERSION = 2
+FLAG_COMPRESSED = 1
+FLAG_SPAWNER = 2
+
+# Enemy classes are stored by id, in this order
+ENEMY_TYPES = ["StandardEnemy", "FancyEnemy", "StandardCameraMan", "FancyCameraMan"]
+
+# magic, version, flags, level index, player x/y/z, player health, enemy count,
+# spawner wave index, spawner waves left, spawner queue length, payload size, checksum
+HEADER = struct.Struct("<4sHHI4fIIIIII")
+# The header of version 1 saves, without the spawner fields
+HEADER_V1 = struct.Struct("<4sHHI4fIII")
+# type id, x/y/z, health
+ENEMY_RECORD = struct.Struct("<B4f")
+# type id, x/y/z of an enemy the spawner still has queued
+SPAWN_RECORD = struct.Struct("<B3f")
+
+JOURNAL_MAGIC = b"U1JL"
+JOURNAL_VERSION = 2
+# magic, version, checksum of the snapshot the journal applies to
+JOURNAL_HEADER = struct.Struct("<4sHI")
+# payload size, checksum of one appended batch of records
+BATCH_HEADER = struct.Struct("<II")
+
+# Journal records, each starts with its record type
+PLAYER_MOVED = 1
+PLAYER_HEALTH_CHANGED = 2
+ENEMY_SPAWNED = 3
+ENEMY_MOVED = 4
+ENEMY_DAMAGED = 5
+ENEMY_KILLED = 6
+LEVEL_ADVANCED = 7
+SPAWNER_CHANGED = 8
+ENEMY_QUEUED = 9
+JOURNAL_RECORDS = {
+    PLAYER_MOVED: struct.Struct("<B3f"),             # x/y/z
+    PLAYER_HEALTH_CHANGED: struct.Struct("<Bf"),     # health
+    ENEMY_SPAWNED: struct.Struct("<BIB4f"),          # enemy id, type id, x/y/z, health
+    ENEMY_MOVED: struct.Struct("<BI3f"),             # enemy id, x/y/z
+    ENEMY_DAMAGED: struct.Struct("<BIf"),            # enemy id, health
+    ENEMY_KILLED: struct.Struct("<BI"),              # enemy id
+    LEVEL_ADVANCED: struct.Struct("<BI"),            # level index, drops every enemy
+    SPAWNER_CHANGED: struct.Struct("<BII"),          # wave index, waves left, empties the spawner's queue
+    ENEMY_QUEUED: struct.Struct("<BB3f"),            # type id, x/y/z, added to the spawner's queue
+}
+
+
+def encode_game_state(game_state, compress=False):
+    """
+        Packs a game state into the versioned binary save format.
+
+        The file starts with a fixed-size header holding the format version, flags, level
+        index, player position and health, enemy count, payload size and a CRC32 checksum.
+        It is followed by one packed record per enemy (type id, x/y/z as float32, health).
+        When the game state has a spawner entry, the header also holds the spawner's wave
+        index and waves left, and one record (type id, x/y/z) per enemy it still has queued
+        follows the enemies. The records can optionally be compressed with zlib.
+
+        Parameters:
+            game_state (dict): The game state with player_position, player_health,
+                               enemies and current_level_index entries, and optionally
+                               spawner as (wave index, waves left, queued enemies).
+                               Queued enemies are (class name, position) tuples.
+            compress (bool): Whether to compress the enemy records with zlib.
+
+        Returns:
+            bytes: The encoded save file.
+    """
+    enemies = game_state["enemies"]
+    values = []
+    for enemy_class_name, position, health in enemies:
+        values.append(ENEMY_TYPES.index(enemy_class_name))
+        values.extend(position)
+        values.append(health)
+    spawner = game_state.get("spawner")
+    flags = 0
+    wave_index = waves_left = 0
+    queued = ()
+    if spawner is not None:
+        flags |= FLAG_SPAWNER
+        wave_index, waves_left, queued = spawner
+        for enemy_class_name, position in queued:
+            values.append(ENEMY_TYPES.index(enemy_class_name))
+            values.extend(position)
+    payload = struct.pack("<" + ENEMY_RECORD.format[1:] * len(enemies) + SPAWN_RECORD.format[1:] * len(queued), *values)
+
+    if compress:
+        payload = zlib.compress(payload)
+        flags |= FLAG_COMPRESSED
+
+    player_position = tuple(game_state["player_position"])
+    header_fields = [SAVE_MAGIC, SAVE_VERSION, flags, game_state["current_level_index"], *player_position,
+                     game_state["player_health"], len(enemies), wave_index, waves_left, len(queued), len(payload)]
+    checksum = zlib.crc32(payload, zlib.crc32(HEADER.pack(*header_fields, 0)))
+    return HEADER.pack(*header_fields, checksum) + payload
+
+
+def _number(value):
+    # Health is stored as float32, hand whole values back as ints like the game uses
+    return int(value) if value.is_integer() else value
+
+
+def decode_game_state(data):
+    """
+        Unpacks a save file written by encode_game_state.
+
+        Parameters:
+            data (bytes): The contents of the save file.
+
+        Returns:
+            dict: The game state, with positions as (x, y, z) tuples and enemies as
+                  (class name, position, health) tuples. Its spawner entry is None for
+                  saves without the spawner's state.
+
+        Raises:
+            GameException: If the data is not a save file, was written by a newer version,
+                           is truncated, fails its checksum, cannot be decompressed or
+                           names an unknown enemy type.
+    """
+    if len(data) < HEADER_V1.size or data[:4] != SAVE_MAGIC:
+        raise GameException("Not a save file.")
+
+    version = HEADER_V1.unpack_from(data)[1]
+    if version > SAVE_VERSION:
+        raise GameException(f"Save file version {version} is newer than supported version {SAVE_VERSION}.")
+    header_struct = HEADER if version >= 2 else HEADER_V1
+    if len(data) < header_struct.size:
+        raise GameException("Save file is truncated.")
+    fields = list(header_struct.unpack_from(data))
+    checksum = fields[-1]
+    fields[-1] = 0
+    header = header_struct.pack(*fields)
+    if version < 2:
+        # Version 1 saves have no spawner fields
+        fields[9:9] = [0, 0, 0]
+    (magic, version, flags, level_index, x, y, z, player_health,
+     enemy_count, wave_index, waves_left, queued_count, payload_size, _) = fields
+
+    payload = data[header_struct.size:header_struct.size + payload_size]
+    if len(payload) != payload_size:
+        raise GameException("Save file is truncated.")
+    if zlib.crc32(payload, zlib.crc32(header)) != checksum:
+        raise GameException("Save file checksum does not match.")
+
+    if flags & FLAG_COMPRESSED:
+        try:
+            payload = zlib.decompress(payload)
+        except zlib.error as e:
+            raise GameException("Save file enemy records cannot be decompressed.") from e
+    enemies_size = enemy_count * ENEMY_RECORD.size
+    if len(payload) != enemies_size + queued_count * SPAWN_RECORD.size:
+        raise GameException("Save file enemy records are incomplete.")
+
+    try:
+        enemies = [(ENEMY_TYPES[type_id], (ex, ey, ez), _number(health))
+                   for type_id, ex, ey, ez, health in ENEMY_RECORD.iter_unpack(payload[:enemies_size])]
+        spawner = None
+        if flags & FLAG_SPAWNER:
+            spawner = (wave_index, waves_left, [(ENEMY_TYPES[type_id], (ex, ey, ez))
+                                                for type_id, ex, ey, ez in SPAWN_RECORD.iter_unpack(payload[enemies_size:])])
+    except IndexError as e:
+        raise GameException("Save file has an unknown enemy type.") from e
+    return {
+        "player_position": (x, y, z),
+        "player_health": _number(player_health),
+        "enemies": enemies,
+        "current_level_index": level_index,
+        "spawner": spawner,
+    }
+
+
+def read_game_state(filename=SAVE_FILE):
+    """
+        Reads and decodes a save file.
+
+        Files that do not start with the save format's magic bytes are treated as
+        saves from before the binary format and are read with pickle. When the default
+        save file does not exist yet, the pickle save at LEGACY_SAVE_FILE is read instead.
+
+        Parameters:
+            filename (str): The path of the save file.
+
+        Returns:
+            dict: The decoded game state.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+            GameException: If the file cannot be decoded.
+    """
+    if filename == SAVE_FILE and not os.path.exists(filename) and os.path.exists(LEGACY_SAVE_FILE):
+        filename = LEGACY_SAVE_FILE
+    with open(filename, "rb") as f:
+        data = f.read()
+    if data[:4] != SAVE_MAGIC:
+        import pickle
+        return pickle.loads(data)
+    return decode_game_state(data)
+
+
+def write_game_state(game_state, filename=SAVE_FILE, compress=False):
+    """
+        Encodes a game state and writes it atomically to a save file.
+
+        Parameters:
+            game_state (dict): The game state to save.
+            filename (str): The path of the save file.
+            compress (bool): Whether to compress the enemy records with zlib.
+
+        Returns:
+            None
+    """
+    write_atomic(filename, encode_game_state(game_state, compress))
+
+
+def replay_journal(game_state, data, base_checksum):
+    """
+        Applies the records of a save journal on top of a snapshot.
+
+        A journal written for a different snapshot is ignored, and replay stops at the
+        first batch that is truncated or fails its checksum, so a crash during an append
+        only loses that last batch.
+
+        Parameters:
+            game_state (dict): The decoded snapshot the journal is applied to.
+            data (bytes): The contents of the journal file.
+            base_checksum (int): The CRC32 of the snapshot file.
+
+        Returns:
+            tuple: The updated game state and the list of enemy ids, in the order of
+                   its enemies.
+    """
+    enemies = {enemy_id: list(enemy) for enemy_id, enemy in enumerate(game_state["enemies"])}
+    player_position = game_state["player_position"]
+    player_health = game_state["player_health"]
+    level_index = game_state["current_level_index"]
+    spawner = game_state.get("spawner")
+
+    if len(data) >= JOURNAL_HEADER.size:
+        magic, version, journal_base = JOURNAL_HEADER.unpack_from(data)
+        offset = JOURNAL_HEADER.size
+        if magic != JOURNAL_MAGIC or version > JOURNAL_VERSION or journal_base != base_checksum:
+            offset = len(data)
+
+        while offset + BATCH_HEADER.size <= len(data):
+            size, checksum = BATCH_HEADER.unpack_from(data, offset)
+            batch = data[offset + BATCH_HEADER.size:offset + BATCH_HEADER.size + size]
+            if len(batch) != size or zlib.crc32(batch) != checksum:
+                break
+            offset += BATCH_HEADER.size + size
+
+            position = 0
+            while position < size:
+                record = JOURNAL_RECORDS[batch[position]]
+                fields = record.unpack_from(batch, position)
+                position += record.size
+                kind = fields[0]
+                if kind == PLAYER_MOVED:
+                    player_position = fields[1:]
+                elif kind == PLAYER_HEALTH_CHANGED:
+                    player_health = _number(fields[1])
+                elif kind == ENEMY_SPAWNED:
+                    enemy_id, type_id, x, y, z, health = fields[1:]
+                    enemies[enemy_id] = [ENEMY_TYPES[type_id], (x, y, z), _number(health)]
+                elif kind == ENEMY_MOVED:
+                    enemies[fields[1]][1] = fields[2:]
+                elif kind == ENEMY_DAMAGED:
+                    enemies[fields[1]][2] = _number(fields[2])
+                elif kind == ENEMY_KILLED:
+                    del enemies[fields[1]]
+                elif kind == LEVEL_ADVANCED:
+                    level_index = fields[1]
+                    enemies.clear()
+                    spawner = None
+                elif kind == SPAWNER_CHANGED:
+                    spawner = (fields[1], fields[2], [])
+                elif kind == ENEMY_QUEUED:
+                    type_id, x, y, z = fields[1:]
+                    spawner[2].append((ENEMY_TYPES[type_id], (x, y, z)))
+
+    enemy_ids = sorted(enemies)
+    return {
+        "player_position": player_position,
+        "player_health": player_health,
+        "enemies": [tuple(enemies[enemy_id]) for enemy_id in enemy_ids],
+        "current_level_index": level_index,
+        "spawner": spawner,
+    }, enemy_ids
+
+
+class SaveJournal:
+    """
+        Saves the game incrementally by appending what changed since the last save.
+
+        The first save writes a full snapshot in the binary save format and starts an
+        empty journal next to it. Later saves compare every enemy and the player with what
+        was last saved and only append delta records for what changed (player moved, player
+        health changed, enemy spawned, moved, damaged or killed, level advanced). Enemies
+        report themselves with touch() when they die, so those that left the game are found
+        without looking through everything saved before. The enemy spawner's state is saved
+        too, and its whole queue is written again whenever it changed. The bytes written by a save
+        therefore scale with the number of changes instead of the size of the world. Once
+        the journal grows past the snapshot, the next save compacts both into a fresh snapshot.
+
+        The records are put together on the game thread, the files are written and synced
+        in order on the saver's background thread. Each appended batch carries its own
+        checksum, and the journal records the checksum of the snapshot it belongs to, so a
+        crash during an append or a compaction never mixes records into the wrong snapshot.
+        When a write fails, nothing more is appended and the next save compacts instead.
+
+        Attributes:
+            snapshot_file (str): The path of the full snapshot.
+            journal_file (str): The path of the journal appended to between compactions.
+            saver (BackgroundSaver): Writes the files on its thread, or None to write them on the calling thread.
+            move_tolerance (float): How far the player or an enemy must move before a move is recorded.
+            compact_ratio (float): How large the journal may grow, relative to the snapshot,
+                                   before the next save compacts it.
+            records_written (int): Delta records appended since the last compaction.
+            compactions (int): How many full snapshots have been written.
+
+        Methods:
+            touch(enemy): Marks an enemy that may have left the game since the last save.
+            save(player_position, player_health, level_index, enemies, spawner): Appends the changes
+                since the last save, or compacts when the journal has grown too large.
+            compact(player_position, player_health, level_index, enemies, spawner): Writes a full
+                snapshot and starts an empty journal.
+            load(): Reads the snapshot and replays the journal on top of it.
+            bind(enemies): Ties freshly loaded enemies to the ids they were saved under.
+    """
+    def __init__(self, snapshot_file=SAVE_FILE, journal_file=JOURNAL_FILE, move_tolerance=.05, compact_ratio=1, saver=None):
+        self.snapshot_file = snapshot_file
+        self.journal_file = journal_file
+        self.saver = saver
+        self.move_tolerance = move_tolerance
+        self.compact_ratio = compact_ratio
+        self.records_written = 0
+        self.compactions = 0
+        self.__saved = None  # Maps each saved enemy to [id, position, health], None until the first save
+        self.__dirty = set()
+        self.__player = None
+        self.__level_index = None
+        self.__spawner = None
+        self.__next_id = 0
+        self.__snapshot_size = 0
+        self.__journal_size = 0
+        self.__loaded_ids = []
+        self.__failed = False  # Set by a failed write, the files on disk no longer match what was saved
+
+    def touch(self, enemy):
+        # Nothing to track until there is a snapshot to append to
+        if self.__saved is not None:
+            self.__dirty.add(enemy)
+
+    def __write(self, write, *args):
+        if self.saver is None:
+            write(*args)
+        else:
+            self.saver.run(write, *args)
+
+    def __write_snapshot(self, game_state):
+        try:
+            data = encode_game_state(game_state)
+            write_atomic(self.snapshot_file, data)
+            write_atomic(self.journal_file, JOURNAL_HEADER.pack(JOURNAL_MAGIC, JOURNAL_VERSION, zlib.crc32(data)))
+            self.__failed = False
+        except Exception:
+            self.__failed = True
+            raise
+
+    def __append(self, batch):
+        # After a failed write the journal may belong to another snapshot, wait for the next compaction
+        if self.__failed:
+            return
+        try:
+            with open(self.journal_file, "ab") as f:
+                f.write(batch)
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception:
+            self.__failed = True
+            raise
+
+    def compact(self, player_position, player_health, level_index, enemies, spawner=None):
+        enemies = list(enemies)
+        game_state = {
+            "player_position": tuple(player_position),
+            "player_health": player_health,
+            "enemies": [(enemy.__class__.__name__, tuple(enemy.entity.position), enemy.health) for enemy in enemies],
+            "current_level_index": level_index,
+            "spawner": spawner,
+        }
+        self.__write(self.__write_snapshot, game_state)
+
+        self.__saved = {enemy: [enemy_id, tuple(enemy.entity.position), enemy.health] for enemy_id, enemy in enumerate(enemies)}
+        self.__dirty = set()
+        self.__player = (tuple(player_position), player_health)
+        self.__level_index = level_index
+        self.__spawner = spawner
+        self.__next_id = len(enemies)
+        self.__snapshot_size = HEADER.size + len(enemies) * ENEMY_RECORD.size
+        if spawner is not None:
+            self.__snapshot_size += len(spawner[2]) * SPAWN_RECORD.size
+        self.__journal_size = JOURNAL_HEADER.size
+        self.records_written = 0
+        self.compactions += 1
+
+    def __moved(self, old, new):
+        return max(abs(a - b) for a, b in zip(old, new)) > self.move_tolerance
+
+    def save(self, player_position, player_health, level_index, enemies, spawner=None):
+        if self.__failed or self.__saved is None or self.__journal_size > self.__snapshot_size * self.compact_ratio:
+            self.compact(player_position, player_health, level_index, enemies, spawner)
+            return
+
+        records = []
+        player_position = tuple(player_position)
+        saved_position, saved_health = self.__player
+        if self.__moved(saved_position, player_position):
+            records.append(JOURNAL_RECORDS[PLAYER_MOVED].pack(PLAYER_MOVED, *player_position))
+            saved_position = player_position
+        if player_health != saved_health:
+            records.append(JOURNAL_RECORDS[PLAYER_HEALTH_CHANGED].pack(PLAYER_HEALTH_CHANGED, player_health))
+            saved_health = player_health
+        self.__player = (saved_position, saved_health)
+
+        if level_index != self.__level_index:
+            # The new level replaces every enemy, so all live ones are recorded as spawned
+            records.append(JOURNAL_RECORDS[LEVEL_ADVANCED].pack(LEVEL_ADVANCED, level_index))
+            self.__level_index = level_index
+            self.__saved = {}
+            self.__spawner = None
+
+        if spawner is not None and spawner != self.__spawner:
+            wave_index, waves_left, queued = spawner
+            records.append(JOURNAL_RECORDS[SPAWNER_CHANGED].pack(SPAWNER_CHANGED, wave_index, waves_left))
+            for enemy_class_name, position in queued:
+                records.append(JOURNAL_RECORDS[ENEMY_QUEUED].pack(ENEMY_QUEUED, ENEMY_TYPES.index(enemy_class_name), *position))
+            self.__spawner = spawner
+
+        for enemy in self.__dirty:
+            entry = self.__saved.get(enemy)
+            if entry is not None and enemy not in enemies:
+                records.append(JOURNAL_RECORDS[ENEMY_KILLED].pack(ENEMY_KILLED, entry[0]))
+                del self.__saved[enemy]
+        self.__dirty = set()
+
+        # Enemies move every frame without touching the journal, so every live one is compared
+        saved = self.__saved
+        tolerance = self.move_tolerance
+        for enemy in enemies:
+            entry = saved.get(enemy)
+            position = enemy.entity.position
+            if entry is None:
+                position = tuple(position)
+                saved[enemy] = [self.__next_id, position, enemy.health]
+                records.append(JOURNAL_RECORDS[ENEMY_SPAWNED].pack(
+                    ENEMY_SPAWNED, self.__next_id, ENEMY_TYPES.index(enemy.__class__.__name__), *position, enemy.health))
+                self.__next_id += 1
+                continue
+            x, y, z = position
+            saved_x, saved_y, saved_z = entry[1]
+            if abs(x - saved_x) > tolerance or abs(y - saved_y) > tolerance or abs(z - saved_z) > tolerance:
+                records.append(JOURNAL_RECORDS[ENEMY_MOVED].pack(ENEMY_MOVED, entry[0], x, y, z))
+                entry[1] = (x, y, z)
+            if enemy.health != entry[2]:
+                records.append(JOURNAL_RECORDS[ENEMY_DAMAGED].pack(ENEMY_DAMAGED, entry[0], enemy.health))
+                entry[2] = enemy.health
+
+        if not records:
+            return
+        payload = b"".join(records)
+        self.__write(self.__append, BATCH_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+        self.__journal_size += BATCH_HEADER.size + len(payload)
+        self.records_written += len(records)
+
+    def load(self):
+        if self.saver is not None:
+            self.saver.wait()
+        with open(self.snapshot_file, "rb") as f:
+            snapshot = f.read()
+        game_state = decode_game_state(snapshot)
+        journal = b""
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, "rb") as f:
+                journal = f.read()
+        game_state, self.__loaded_ids = replay_journal(game_state, journal, zlib.crc32(snapshot))
+        self.__player = (tuple(game_state["player_position"]), game_state["player_health"])
+        self.__level_index = game_state["current_level_index"]
+        spawner = game_state["spawner"]
+        self.__spawner = None if spawner is None else (spawner[0], spawner[1], tuple(spawner[2]))
+        self.__snapshot_size = len(snapshot)
+        self.__journal_size = len(journal)
+        self.__failed = False
+        return game_state
+
+    def bind(self, enemies):
+        # The loaded game matches the files on disk, so the next save only appends changes
+        enemies = list(enemies)
+        self.__dirty = set()
+        if len(enemies) != len(self.__loaded_ids):
+            self.__saved = None
+            return
+        self.__saved = {enemy: [enemy_id, tuple(enemy.entity.position), enemy.health]
+                        for enemy_id, enemy in zip(self.__loaded_ids, enemies)}
+        self.__next_id = max(self.__loaded_ids, default=-1) + 1
+
+
+def write_atomic(filename, data):
+    """
+        Writes bytes to a file so that it is either fully replaced or left untouched.
+
+        The data is written and flushed to a temporary file in the same folder, which
+        is then renamed over the target. A crash part way through the write leaves the
+        previous save intact. The folder is created if it does not exist yet.
+
+        Parameters:
+            filename (str): The path of the file to replace.
+            data (bytes): The full contents of the new file.
+
+        Returns:
+            None
+    """
+    folder = os.path.dirname(filename) or '.'
+    os.makedirs(folder, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix=os.path.basename(filename) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file owner-only, keep the permissions a plain open() would give
+        os.chmod(temp_path, os.stat(filename).st_mode & 0o777 if os.path.exists(filename) else 0o644)
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class BackgroundSaver:
+    """
+        Serialises and writes game state snapshots on a background thread.
+
+        The game loop hands over a snapshot of the state and returns immediately. If
+        more saves are requested while one is being written, only the newest snapshot
+        is written next, so repeated requests never queue up. Other writes, like the
+        appends of the save journal, can be queued with run(). Those are never dropped
+        and run in the order they were queued, before the next snapshot. Errors from the
+        worker are kept and raised on the game thread by poll().
+
+        Attributes:
+            serialize (callable): Turns a game state snapshot into bytes.
+            saves_written (int): How many snapshots have been written to disk.
+            error (Exception): The last error raised by the worker, until poll() reports it.
+
+        Methods:
+            save(game_state, filename): Queues a snapshot to be written to the file.
+            run(write, *args): Queues a call of write(*args) on the background thread.
+            wait(): Blocks until every queued snapshot and write has been written.
+            poll(): Raises a GameException if the last background save failed.
+            busy: Property that tells whether a save is still being written.
+    """
+    def __init__(self, serialize=encode_game_state):
+        self.serialize = serialize
+        self.saves_written = 0
+        self.error = None
+        self.__lock = threading.Lock()
+        self.__pending = None
+        self.__writes = deque()
+        self.__thread = None
+
+    def __start(self):
+        # Called with the lock held
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self.__run, name='BackgroundSaver', daemon=True)
+            self.__thread.start()
+
+    def save(self, game_state, filename):
+        with self.__lock:
+            self.__pending = (game_state, filename)
+            self.__start()
+
+    def run(self, write, *args):
+        with self.__lock:
+            self.__writes.append((write, args))
+            self.__start()
+
+    def __run(self):
+        while True:
+            with self.__lock:
+                write = self.__writes.popleft() if self.__writes else None
+                job = None
+                if write is None:
+                    job = self.__pending
+                    self.__pending = None
+                    if job is None:
+                        self.__thread = None
+                        return
+
+            if write is not None:
+                try:
+                    write[0](*write[1])
+                except Exception as e:
+                    self.error = e
+                continue
+
+            game_state, filename = job
+            try:
+                write_atomic(filename, self.serialize(game_state))
+                self.saves_written += 1
+                print("Game state saved!")
+            except Exception as e:
+                self.error = e
+
+    def wait(self):
+        thread = self.__thread
+        if thread is not None:
+            thread.join()
+
+    def poll(self):
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise GameException("An error occurred while saving the game state.") from error
+
+    @property
+    def busy(self):
+        return self.__thread is not None
+
+
+# Shared saver that writes snapshots and journal appends off the game thread
+background_saver = BackgroundSaver()
+
+# Shared journal for journaled saves, enemies touch it when they leave the game
+save_journal = SaveJournal(saver=background_saver)
@@ -0,0 +1,247 @@
+# simulation.py
+from contextlib import nullcontext
+from math import sqrt
+import random
+from spatial_grid import SpatialHashGrid
+from follow import CustomSmoothFollow
+from ai_lod import EnemyLOD
+from attacks import AttackResolver
+from projectiles import ProjectileSystem
+from timestep import FixedTimestep, game_clock
+from timers import TimerWheel, game_timers
+
+# The enemy kinds the simulation knows: whether they heal by the damage they deal, and their hit box
+# as (min, max) corners relative to their position. The game's enemies pass the box of their collider
+# instead, these are for simulations without entities
+ENEMY_KINDS = {
+    'StandardEnemy': {'siphons': False, 'bounds': ((-1.42, 0.01, -1.55), (1.36, 2.4, 1.24))},
+    'FancyEnemy': {'siphons': True, 'bounds': ((-1.42, 0.01, -1.55), (1.36, 2.4, 1.24))},
+    'StandardCameraMan': {'siphons': False, 'bounds': ((-1.41, -1, -1.41), (1.41, 1, 1.41))},
+    'FancyCameraMan': {'siphons': True, 'bounds': ((-1.41, -1, -1.41), (1.41, 1, 1.41))},
+}
+
+# Events recorded during a step, as (event, body, amount) tuples
+ENEMY_ATTACKED = 'enemy_attacked'
+ENEMY_HIT = 'enemy_hit'
+ENEMY_KILLED = 'enemy_killed'
+
+
+class PlayerBody:
+    """The player's state inside the simulation: where enemies walk to and the health they attack."""
+    __slots__ = ('x', 'y', 'z', 'health', 'max_health')
+
+    def __init__(self, position=(0, 2, 0), health=100, max_health=100):
+        self.x, self.y, self.z = position
+        self.health = health
+        self.max_health = max_health
+
+
+class EnemyBody:
+    """An enemy's state inside the simulation. view is the game's enemy showing it, if any."""
+    __slots__ = ('kind', 'x', 'y', 'z', 'rotation_y', 'health', 'max_health', 'attack_cooldown',
+                 'siphons', 'bounds_min', 'bounds_max', 'moved', 'view')
+
+    def __init__(self, kind, position, health, max_health, siphons, bounds):
+        self.kind = kind
+        self.x, self.y, self.z = position
+        self.rotation_y = 0.0
+        self.health = health
+        self.max_health = max_health
+        self.attack_cooldown = None
+        self.siphons = siphons
+        self.bounds_min, self.bounds_max = bounds
+        self.moved = True
+        self.view = None
+
+    def end_attack_cooldown(self):
+        self.attack_cooldown = None
+
+    @property
+    def position(self):
+        return self.x, self.y, self.z
+
+
+class BulletBody:
+    """A bullet's state inside the simulation."""
+    __slots__ = ('x', 'y', 'z', 'dx', 'dy', 'dz', 'speed', 'alive')
+
+    def __init__(self, position, direction, speed):
+        self.x, self.y, self.z = position
+        length = sqrt(direction[0] ** 2 + direction[1] ** 2 + direction[2] ** 2) or 1
+        self.dx, self.dy, self.dz = direction[0] / length, direction[1] / length, direction[2] / length
+        self.speed = speed
+        self.alive = True
+
+    @property
+    def position(self):
+        return self.x, self.y, self.z
+
+
+class Simulation:
+    """
+        Runs the game rules on plain Python state, without Ursina or a window.
+
+        The simulation owns the player's health, every enemy and every bullet in flight
+        as small body objects and advances them in fixed steps: bullets travel and hit
+        enemies (ProjectileSystem), enemies follow the player and keep apart
+        (CustomSmoothFollow, stepped by EnemyLOD, or the EnemySwarm when one is set),
+        attack on a cooldown and siphon health (AttackResolver), and killed enemies are
+        removed until the level is complete. Cooldowns and bullet lifetimes are timers on
+        the simulation's clock and randomness comes from a seeded generator, so the same
+        seed and the same inputs always give the same result.
+
+        This is the only copy of the rules: the game runs game_simulation on the game
+        clock, and its Player, enemies and Bullets are views of the bodies that feed their
+        input in and show the results (see SimulationView).
+
+        Attributes:
+            clock (FixedTimestep): The clock the simulation is stepped on.
+            timers (TimerWheel): The timers for attack cooldowns and bullet lifetimes.
+            random (Random): The seeded generator used for attack damage.
+            time (float): Property, seconds simulated so far.
+            ticks (int): Property, steps simulated so far.
+            player (PlayerBody): The player's position and health.
+            enemies (dict): The living enemy bodies as keys, in the order they were added.
+            bullets (list): The bullet bodies in flight, oldest first.
+            events (list): (event, body, amount) tuples recorded since the start of the last step.
+            grid (SpatialHashGrid): Index of enemy bodies, rebuilt at the start of each step.
+            follow (CustomSmoothFollow): Moves the enemy bodies after the player.
+            lod (EnemyLOD): Decides which enemies follow steps and by how much time.
+            attacks (AttackResolver): Resolves the enemies' attacks on the player.
+            projectiles (ProjectileSystem): Moves the bullets and finds what they hit.
+            swarm (EnemySwarm): Moves every enemy as one NumPy batch instead of follow, when set.
+            profiler (FrameProfiler): Times the parts of each step, when set.
+            bullet_speed (float): How far a bullet travels per second.
+            bullet_lifetime (float): Seconds before a bullet that hit nothing is removed.
+
+        Methods:
+            add_enemy(kind, position, health, max_health, siphons, bounds): Adds an enemy body and returns it.
+            remove_enemy(body): Removes an enemy body without killing it.
+            damage_enemy(body, amount): Takes health from an enemy, for example for a hitscan shot.
+            fire(position, direction): Adds a bullet body and returns it.
+            remove_bullet(body): Ends a bullet's flight.
+            rebuild_grid(): Indexes the living enemy bodies in the grid.
+            step(dt, attacks): Advances the simulation by dt seconds, with enemy attacks unless attacks is False.
+            run(ticks, attacks): Ticks the clock and its timers and steps the simulation, ticks times.
+            level_complete: Property that tells whether every enemy has been killed.
+            snapshot(): Returns the simulated state as nested tuples, for comparing runs.
+    """
+    def __init__(self, seed=None, clock=None, timers=None, offset=(0, 2, 0), speed=.5, min_enemy_distance=2.5,
+                 attack_range=3, attack_cooldown=1, attack_damage=(3, 5), bullet_speed=200, bullet_damage=7,
+                 bullet_lifetime=3, ground_height=0):
+        self.clock = FixedTimestep() if clock is None else clock
+        self.timers = TimerWheel(self.clock) if timers is None else timers
+        self.random = random.Random(seed)
+        self.player = PlayerBody()
+        self.enemies = {}
+        self.bullets = []
+        self.events = []
+        self.grid = SpatialHashGrid(cell_size=min_enemy_distance)
+        self.follow = CustomSmoothFollow(self.player, offset=offset, speed=speed, grid=self.grid)
+        self.follow.min_enemy_distance = min_enemy_distance
+        self.lod = EnemyLOD()
+        self.attacks = AttackResolver(self.timers, self.random, attack_range=attack_range,
+                                      cooldown=attack_cooldown, damage=attack_damage)
+        self.projectiles = ProjectileSystem(ground_height=ground_height, damage=bullet_damage)
+        self.swarm = None
+        self.profiler = None
+        self.bullet_speed = bullet_speed
+        self.bullet_lifetime = bullet_lifetime
+
+    @property
+    def time(self):
+        return self.clock.time
+
+    @property
+    def ticks(self):
+        return self.clock.ticks
+
+    def __scope(self, name):
+        return nullcontext() if self.profiler is None else self.profiler.scope(name)
+
+    def add_enemy(self, kind, position, health=100, max_health=100, siphons=None, bounds=None):
+        defaults = ENEMY_KINDS.get(kind, ENEMY_KINDS['StandardEnemy'])
+        body = EnemyBody(kind, tuple(position), health, max_health,
+                         defaults['siphons'] if siphons is None else siphons,
+                         defaults['bounds'] if bounds is None else bounds)
+        self.enemies[body] = None
+        return body
+
+    def remove_enemy(self, body):
+        self.enemies.pop(body, None)
+        # A cooldown must not outlive the enemy
+        self.timers.cancel_owner(body)
+
+    def damage_enemy(self, body, amount):
+        body.health = max(body.health - amount, 0)
+        self.events.append((ENEMY_HIT, body, amount))
+        if body.health <= 0:
+            self.events.append((ENEMY_KILLED, body, amount))
+
+    def fire(self, position, direction):
+        body = BulletBody(tuple(position), tuple(direction), self.bullet_speed)
+        self.bullets.append(body)
+        self.timers.schedule(self.bullet_lifetime, self.remove_bullet, body, owner=body)
+        return body
+
+    def remove_bullet(self, body):
+        body.alive = False
+        self.timers.cancel_owner(body)
+
+    def rebuild_grid(self):
+        self.grid.rebuild(enemy for enemy in self.enemies if enemy.health > 0)
+
+    @property
+    def level_complete(self):
+        return not self.enemies
+
+    def step(self, dt, attacks=True):
+        self.events = []
+
+        # Index enemy positions once, for the bullet sweep, the separation and the attacks
+        with self.__scope('enemy grid'):
+            self.rebuild_grid()
+
+        with self.__scope('bullets'):
+            for enemy, damage in self.projectiles.step(self.bullets, self.grid, dt):
+                self.damage_enemy(enemy, damage)
+            if not all(bullet.alive for bullet in self.bullets):
+                for bullet in self.bullets:
+                    if not bullet.alive:
+                        self.timers.cancel_owner(bullet)
+                self.bullets = [bullet for bullet in self.bullets if bullet.alive]
+
+        # Only living enemies move, hitscan shots can kill between two steps
+        enemies = [enemy for enemy in self.enemies if enemy.health > 0]
+        player = self.player
+        if self.swarm is not None:
+            with self.__scope('swarm'):
+                self.swarm.sync(enemies)
+                self.swarm.step((player.x, player.y, player.z), dt)
+        else:
+            with self.__scope('CustomSmoothFollow'):
+                self.lod.step(enemies, self.follow, dt)
+
+        # Only the enemies the grid finds around the player are checked
+        with self.__scope('enemy attacks'):
+            for enemy, damage in self.attacks.resolve(player, self.grid, attacks=attacks):
+                self.events.append((ENEMY_ATTACKED, enemy, damage))
+
+        if len(enemies) != len(self.enemies):
+            for enemy in [enemy for enemy in self.enemies if enemy.health <= 0]:
+                self.remove_enemy(enemy)
+
+    def run(self, ticks, attacks=True):
+        for _ in range(ticks):
+            self.clock.tick()
+            self.timers.advance_to(self.clock.ticks)
+            self.step(self.clock.step, attacks=attacks)
+
+    def snapshot(self):
+        return (self.ticks, self.player.health,
+                tuple((enemy.kind, enemy.x, enemy.y, enemy.z, enemy.rotation_y, enemy.health) for enemy in self.enemies),
+                tuple((bullet.x, bullet.y, bullet.z) for bullet in self.bullets))
+
+
+# The simulation the game runs, on the game clock and its timers
+game_simulation = Simulation(clock=game_clock, timers=game_timers)
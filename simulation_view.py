@@ -0,0 +1,74 @@
+# simulation_view.py
+from ursina import Vec3
+from simulation import ENEMY_ATTACKED, ENEMY_HIT
+from savegame import save_journal
+from sound import sounds, HIT_PRIORITY
+from profiler import profiler
+
+
+class SimulationView:
+    """
+        Shows the game Simulation with the game's entities, as the only code that writes its results to them.
+
+        Enemies get their body when they are created or taken from the enemy pool, and each
+        bullet in flight gets a body here. Once per gameplay step, the player's position and
+        health and the bullets fired since the last step are copied into the simulation, the
+        simulation is stepped, the enemies it hit or that attacked get their health bars
+        refreshed and the hit sound is played, and every Player, enemy and Bullet syncs itself
+        from its body.
+
+        Attributes:
+            simulation (Simulation): The simulation that owns the game rules.
+            bullet_bodies (dict): Maps every bullet in flight to its generation and body.
+
+        Methods:
+            sync_bullets(bullets): Adds bodies for new bullets and removes the ones of bullets that left.
+            show_bullets(): Syncs every bullet from its body, the ones whose flight ended are destroyed.
+            step(player, enemies, dt, attacks): Steps the simulation and syncs every view from its body.
+    """
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.bullet_bodies = {}
+
+    def sync_bullets(self, bullets):
+        # A recycled bullet is a new shot, so its old body is dropped
+        live_bullets = set()
+        for bullet in bullets:
+            live_bullets.add(bullet)
+            generation, body = self.bullet_bodies.get(bullet, (None, None))
+            if generation != bullet.generation:
+                if body is not None:
+                    self.simulation.remove_bullet(body)
+                self.bullet_bodies[bullet] = bullet.generation, self.simulation.fire(tuple(bullet.position), tuple(bullet.direction))
+        for bullet in [bullet for bullet in self.bullet_bodies if bullet not in live_bullets]:
+            self.simulation.remove_bullet(self.bullet_bodies.pop(bullet)[1])
+
+    def step(self, player, enemies, dt, attacks=True):
+        simulation = self.simulation
+        player_position = player.controller.position
+        simulation.player.x, simulation.player.y, simulation.player.z = player_position
+        simulation.player.health = player.get_health()
+        self.sync_bullets(player.weapon.bullet_pool.active)
+
+        simulation.step(dt, attacks=attacks)
+
+        for event, body, amount in simulation.events:
+            if event == ENEMY_ATTACKED:
+                sounds.play('assets/hit_sound.mp3', priority=HIT_PRIORITY, position=Vec3(*body.position), listener=player_position)
+            # Hits and siphoned health change the bar whether or not the enemy moved
+            if event in (ENEMY_ATTACKED, ENEMY_HIT) and body.view is not None:
+                save_journal.touch(body.view)
+                body.view.update_health_bar()
+
+        with profiler.scope('entity sync'):
+            player.sync_from(simulation.player)
+            self.show_bullets()
+            # Dead enemies park themselves in the pool, which removes them from the enemies list
+            for enemy in enemies:
+                enemy.sync_from(enemy.body)
+
+    def show_bullets(self):
+        for bullet, (generation, body) in list(self.bullet_bodies.items()):
+            bullet.sync_from(body)
+            if not body.alive:
+                del self.bullet_bodies[bullet]
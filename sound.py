@@ -0,0 +1,152 @@
+# sound.py
+import threading
+from ursina import application, Audio
+from panda3d.core import AudioSound, Filename
+
+# Higher priority sounds can steal voices from lower priority ones
+SHOOT_PRIORITY = 1
+HIT_PRIORITY = 2
+RELOAD_PRIORITY = 3
+
+
+class SoundPool:
+    """
+        Plays short sound effects through a preloaded clip cache and a bounded set of voices.
+
+        Every clip is loaded once and kept around, so playing a sound does not create
+        an Audio entity or reload the file. At most max_voices sounds play at the same
+        time. When all voices are busy, a new sound steals the voice of the lowest
+        priority (and then oldest) sound, as long as that priority is not higher than
+        its own. Sounds with a position are skipped when they are too far from the listener.
+        Clips can be preloaded from another thread, such as an AssetCache worker, so the
+        clip cache is only read or filled while holding a lock.
+
+        Attributes:
+            max_voices (int): The maximum number of sounds that can play at once.
+            cull_distance (float): Positional sounds further than this from the listener are not played.
+            volume (float): Volume applied to every sound, on top of Audio.volume_multiplier.
+            clips (dict): Maps a clip name to the loaded AudioSound instances for that clip,
+                          or to None when the clip's file was not found.
+            sources (dict): Maps a clip name to the file it is loaded from instead of the asset
+                            itself, such as a pre-decoded build of the clip.
+            voices (list): One [sound, priority, start_order] entry per voice, or None when free.
+            played (int): How many sounds have been started.
+            stolen (int): How many voices were taken from a playing sound.
+            dropped (int): How many sounds were not played because no voice could be taken.
+            culled (int): How many sounds were skipped for being too far away.
+
+        Methods:
+            preload(names): Loads the given clips into the cache ahead of time.
+            play(name, priority, position, listener): Plays a clip on a free or stolen voice.
+            active_voices: Property that returns how many voices are currently playing.
+            stats(): Returns a dictionary with the voice counters.
+    """
+    def __init__(self, max_voices=12, cull_distance=40, volume=1):
+        self.max_voices = max_voices
+        self.cull_distance = cull_distance
+        self.volume = volume
+        self.clips = {}
+        self.sources = {}
+        self.voices = [None] * max_voices
+        self.played = 0
+        self.stolen = 0
+        self.dropped = 0
+        self.culled = 0
+        self.__start_order = 0
+        self.__clips_lock = threading.Lock()
+
+    @staticmethod
+    def is_playing(sound):
+        return sound.status() == AudioSound.PLAYING
+
+    def __load(self, name):
+        path = application.asset_folder / self.sources.get(name, name)
+        if not path.exists():
+            print('no audio found with name:', name)
+            return None
+        return application.base.loader.loadSfx(Filename.fromOsSpecific(str(path.resolve())))
+
+    def __get_sound(self, name):
+        with self.__clips_lock:
+            # Every instance of a clip can only play once at a time, so keep one per concurrent use
+            instances = self.clips.setdefault(name, [])
+            if instances is None:
+                return None
+            for sound in instances:
+                if not self.is_playing(sound):
+                    return sound
+            sound = self.__load(name)
+            if sound is not None:
+                instances.append(sound)
+            elif not instances:
+                # Remember the missing clip, so it is not looked for (and reported) on every play
+                self.clips[name] = None
+            return sound
+
+    def preload(self, names):
+        for name in names:
+            with self.__clips_lock:
+                if name not in self.clips:
+                    sound = self.__load(name)
+                    self.clips[name] = [sound] if sound is not None else None
+
+    def __find_voice(self, priority):
+        steal_index = None
+        for index, voice in enumerate(self.voices):
+            if voice is None or not self.is_playing(voice[0]):
+                return index
+            if voice[1] > priority:
+                continue
+            if steal_index is None or (voice[1], voice[2]) < tuple(self.voices[steal_index][1:]):
+                steal_index = index
+
+        if steal_index is not None:
+            self.voices[steal_index][0].stop()
+            self.stolen += 1
+        return steal_index
+
+    def play(self, name, priority=0, position=None, listener=None):
+        if position is not None and listener is not None:
+            if (position - listener).length() > self.cull_distance:
+                self.culled += 1
+                return None
+
+        index = self.__find_voice(priority)
+        if index is None:
+            self.dropped += 1
+            return None
+
+        sound = self.__get_sound(name)
+        if sound is None:
+            self.voices[index] = None
+            return None
+
+        # A finished instance can still sit in the voice it played on before, which must not count it twice
+        for other_index, voice in enumerate(self.voices):
+            if other_index != index and voice is not None and voice[0] is sound:
+                self.voices[other_index] = None
+
+        sound.setVolume(self.volume * Audio.volume_multiplier)
+        sound.play()
+        self.__start_order += 1
+        self.voices[index] = [sound, priority, self.__start_order]
+        self.played += 1
+        return sound
+
+    @property
+    def active_voices(self):
+        return sum(1 for voice in self.voices if voice is not None and self.is_playing(voice[0]))
+
+    def stats(self):
+        return {
+            "max_voices": self.max_voices,
+            "active": self.active_voices,
+            "played": self.played,
+            "stolen": self.stolen,
+            "dropped": self.dropped,
+            "culled": self.culled,
+        }
+
+
+# Shared pool used for every shoot, hit and reload sound
+sounds = SoundPool()
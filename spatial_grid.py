@@ -0,0 +1,61 @@
+# spatial_grid.py
+from math import floor
+
+
+class SpatialHashGrid:
+    """
+        A uniform grid that buckets enemies by their position on the ground plane.
+
+        The grid is rebuilt once per gameplay step from the simulation's enemy bodies, after which
+        neighbour queries only look at the cells surrounding a position instead of
+        walking every enemy in the level.
+
+        Attributes:
+            cell_size (float): The width of a single grid cell in world units.
+            cells (dict): Maps an (x, z) cell key to the list of enemies inside that cell.
+
+        Methods:
+            cell_key(position): Returns the cell key for a world position.
+            clear(): Removes every enemy from the grid.
+            insert(enemy): Adds an enemy body to the cell matching its current position.
+            insert_at(item, position): Adds any item to the cell matching the given position.
+            rebuild(enemies): Clears the grid and inserts every enemy from the given list.
+            query(position, radius): Returns the enemies in the cells overlapping the radius.
+    """
+    def __init__(self, cell_size=2.5):
+        self.cell_size = cell_size
+        self.cells = {}
+
+    def cell_key(self, position):
+        return floor(position[0] / self.cell_size), floor(position[2] / self.cell_size)
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, enemy):
+        self.insert_at(enemy, (enemy.x, enemy.y, enemy.z))
+
+    def insert_at(self, item, position):
+        key = self.cell_key(position)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [item]
+        else:
+            bucket.append(item)
+
+    def rebuild(self, enemies):
+        self.cells.clear()
+        for enemy in enemies:
+            self.insert(enemy)
+
+    def query(self, position, radius):
+        # Candidates only, callers still check the exact distance
+        min_x, min_z = self.cell_key((position[0] - radius, 0, position[2] - radius))
+        max_x, max_z = self.cell_key((position[0] + radius, 0, position[2] + radius))
+        neighbours = []
+        for x in range(min_x, max_x + 1):
+            for z in range(min_z, max_z + 1):
+                bucket = self.cells.get((x, z))
+                if bucket:
+                    neighbours.extend(bucket)
+        return neighbours
@@ -0,0 +1,139 @@
+# spawner.py
+from collections import deque, namedtuple
+import random
+import time
+from ursina import Vec3
+from enemy import StandardEnemy, FancyEnemy, StandardCameraMan, FancyCameraMan, enemy_pool
+
+# A group of count enemies of one type: the first one at position, each next one moved by step,
+# and each one with duplicate_chance of getting a duplicate 2 units along the X-axis
+SpawnGroup = namedtuple('SpawnGroup', ['enemy_type', 'position', 'step', 'count', 'duplicate_chance'])
+
+# Plans name enemy types by class name, so they can be written as plain data
+ENEMY_CLASSES = {enemy_class.__name__: enemy_class for enemy_class in (StandardEnemy, FancyEnemy, StandardCameraMan, FancyCameraMan)}
+
+# Where a duplicate is placed relative to the enemy it duplicates
+DUPLICATE_OFFSET = Vec3(2, 0, 0)
+
+
+def expand_wave(wave):
+    """
+        Turns a wave of SpawnGroups into the (enemy class, position) of every enemy to create.
+
+        Like the levels always did, the groups take turns: the first enemy of every group,
+        then the duplicates that were rolled for them, then the second enemy of every group
+        and so on, drawing one random number per enemy in that order.
+    """
+    orders = []
+    for index in range(max((group.count for group in wave), default=0)):
+        batch = []
+        for group in wave:
+            if index < group.count:
+                position = Vec3(*group.position) + Vec3(*group.step) * index
+                batch.append((ENEMY_CLASSES[group.enemy_type], position, group.duplicate_chance))
+        orders.extend((enemy_class, position) for enemy_class, position, chance in batch)
+        for enemy_class, position, chance in batch:
+            if random.random() < chance:
+                orders.append((enemy_class, position + DUPLICATE_OFFSET))
+    return orders
+
+
+class EnemySpawner:
+    """
+        Creates the enemies of a level from its spawn plan, a few at a time.
+
+        A plan is a list of waves and a wave is a list of SpawnGroups. When a wave starts,
+        its enemies are worked out up front (including the random duplicates), sorted so
+        the ones closest to the player come first, and queued. Every frame, update() creates
+        queued enemies until the frame's time budget is spent (always at least one), so a big
+        wave is spread over several frames instead of stalling the first one. The next wave
+        starts once every enemy of the current one has been created and killed.
+
+        Attributes:
+            budget_ms (float): Milliseconds per frame that may be spent creating enemies.
+            waves (deque): The waves of the plan that have not started yet.
+            pending (deque): (enemy class, position) of the enemies of the current wave still to create.
+            player_entity (Entity): The entity the enemies follow and attack.
+            all_enemies (EnemyRegistry): The registry new enemies are added to.
+            spawned (int): Enemies created since the plan started.
+            wave_index (int): How many waves of the plan have started.
+            last_frame_spawned (int): Enemies created during the last update().
+
+        Methods:
+            start(plan, player_entity, all_enemies): Starts a level's plan, dropping what was still queued.
+            cancel(): Drops the queued enemies and the remaining waves.
+            state(): Returns (wave index, waves left, queued enemies) for a save, with the queued
+                     enemies as (class name, position) tuples.
+            restore(plan, wave_index, waves_left, queued, player_entity, all_enemies): Picks a
+                level's plan up again where a saved state() left it.
+            update(): Creates queued enemies within the frame's budget and starts the next wave when it is due.
+            done: Property that tells whether every enemy of the plan has been created.
+    """
+    def __init__(self, budget_ms=4):
+        self.budget_ms = budget_ms
+        self.waves = deque()
+        self.pending = deque()
+        self.player_entity = None
+        self.all_enemies = None
+        self.spawned = 0
+        self.wave_index = 0
+        self.last_frame_spawned = 0
+
+    def start(self, plan, player_entity, all_enemies):
+        self.waves = deque(plan)
+        self.pending.clear()
+        self.player_entity = player_entity
+        self.all_enemies = all_enemies
+        self.spawned = 0
+        self.wave_index = 0
+        self.__start_wave()
+
+    def cancel(self):
+        self.waves.clear()
+        self.pending.clear()
+
+    def state(self):
+        queued = tuple((enemy_class.__name__, tuple(position)) for enemy_class, position in self.pending)
+        return self.wave_index, len(self.waves), queued
+
+    def restore(self, plan, wave_index, waves_left, queued, player_entity, all_enemies):
+        # The waves left are the last ones of the plan, the queue already had its duplicates rolled
+        self.waves = deque(plan[len(plan) - waves_left:] if waves_left else ())
+        self.pending = deque((ENEMY_CLASSES[enemy_class_name], Vec3(*position)) for enemy_class_name, position in queued)
+        self.player_entity = player_entity
+        self.all_enemies = all_enemies
+        self.spawned = 0
+        self.wave_index = wave_index
+        self.last_frame_spawned = 0
+
+    @property
+    def done(self):
+        return not self.pending and not self.waves
+
+    def __start_wave(self):
+        orders = expand_wave(self.waves.popleft())
+        target = self.player_entity.position
+        # Enemies that reach the player first are created first
+        orders.sort(key=lambda order: (order[1] - target).length_squared())
+        self.pending.extend(orders)
+        self.wave_index += 1
+
+    def update(self):
+        self.last_frame_spawned = 0
+        if not self.pending and self.waves and len(self.all_enemies) == 0:
+            self.__start_wave()
+        if not self.pending:
+            return
+
+        deadline = time.perf_counter() + self.budget_ms / 1000
+        while self.pending:
+            enemy_class, position = self.pending.popleft()
+            self.all_enemies.add(enemy_pool.acquire(enemy_class, position, self.player_entity, self.all_enemies))
+            self.spawned += 1
+            self.last_frame_spawned += 1
+            if time.perf_counter() >= deadline:
+                break
+
+
+# Shared spawner for the levels' enemies
+enemy_spawner = EnemySpawner()
@@ -0,0 +1,109 @@
+# swarm.py
+import numpy as np
+
+
+class EnemySwarm:
+    """
+        Simulates every enemy in the level as one batch using NumPy arrays.
+
+        Instead of stepping each enemy body with CustomSmoothFollow, the swarm keeps
+        the positions and rotations of all enemies in contiguous arrays and steps them
+        together. Follow-the-player, yaw lerp, ground clamping and separation are vectorised,
+        and the results are written back to the Simulation's enemy bodies in a single pass
+        at the end of the step. Attacks are left to the Simulation's AttackResolver.
+
+        Attributes:
+            enemies (list): The enemy bodies currently owned by the swarm, in array order.
+            positions (ndarray): (n, 3) array of enemy positions.
+            rotations_y (ndarray): (n,) array of enemy yaw angles in degrees.
+            offset (ndarray): The offset from the player that enemies move towards.
+            speed (float): The follow speed, matching CustomSmoothFollow.
+            min_distance (float): Minimum distance to keep from the player.
+            min_enemy_distance (float): Minimum distance to keep from other enemies.
+
+        Methods:
+            sync(enemies): Rebuilds the arrays when the list of enemy bodies has changed.
+            invalidate(): Makes the next sync rebuild the arrays, after enemies were moved or healed outside the swarm.
+            step(target_position, dt): Moves, rotates and separates all enemies, then writes them back to their bodies.
+    """
+    def __init__(self, offset=(0, 2, 0), speed=.5, min_distance=2, min_enemy_distance=2.5):
+        self.enemies = []
+        self.positions = np.zeros((0, 3))
+        self.rotations_y = np.zeros(0)
+        self.offset = np.array(offset, dtype=float)
+        self.speed = speed
+        self.min_distance = min_distance
+        self.min_enemy_distance = min_enemy_distance
+
+    def sync(self, enemies):
+        if len(enemies) == len(self.enemies) and all(a is b for a, b in zip(enemies, self.enemies)):
+            return
+
+        self.enemies = list(enemies)
+        count = len(self.enemies)
+        self.positions = np.array([(enemy.x, enemy.y, enemy.z) for enemy in self.enemies], dtype=float).reshape(count, 3)
+        self.rotations_y = np.array([enemy.rotation_y for enemy in self.enemies], dtype=float)
+
+    def invalidate(self):
+        # The arrays no longer match the bodies, for example after a load moved them in place
+        self.enemies = []
+
+    def separation_pushes(self):
+        """Sums the unit directions away from every enemy closer than min_enemy_distance."""
+        count = len(self.positions)
+        pushes = np.zeros((count, 3))
+        if count < 2:
+            return pushes
+
+        # Bucket enemies into ground-plane cells as wide as the separation distance
+        cells = np.floor(self.positions[:, [0, 2]] / self.min_enemy_distance).astype(np.int64)
+        cells -= cells.min(axis=0) - 1
+        width = cells[:, 1].max() + 2
+        keys = cells[:, 0] * width + cells[:, 1]
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+
+        indices = np.arange(count)
+        for dx in (-1, 0, 1):
+            for dz in (-1, 0, 1):
+                neighbour_keys = keys + dx * width + dz
+                starts = np.searchsorted(sorted_keys, neighbour_keys, side='left')
+                counts = np.searchsorted(sorted_keys, neighbour_keys, side='right') - starts
+                total = counts.sum()
+                if total == 0:
+                    continue
+                # Expand every (enemy, neighbour cell) into its candidate pairs
+                firsts = np.repeat(starts - (np.cumsum(counts) - counts), counts)
+                i = np.repeat(indices, counts)
+                j = order[firsts + np.arange(total)]
+
+                away = self.positions[i] - self.positions[j]
+                distance = np.linalg.norm(away, axis=1)
+                close = (i != j) & (distance < self.min_enemy_distance) & (distance > 0)
+                np.add.at(pushes, i[close], away[close] / distance[close, None])
+        return pushes
+
+    def step(self, target_position, dt):
+        if not self.enemies:
+            return
+
+        target = np.array(tuple(target_position), dtype=float)
+
+        # Follow the player until within min_distance
+        distance_to_player = np.linalg.norm(target - self.positions, axis=1)
+        following = distance_to_player > self.min_distance
+        self.positions[following] += (target + self.offset - self.positions[following]) * (dt * self.speed)
+
+        # Lerp the yaw towards the player, keeping feet on the ground (no x/z rotation)
+        to_target = target - self.positions
+        desired_y = np.degrees(np.arctan2(to_target[:, 0], to_target[:, 2]))
+        self.rotations_y += (desired_y - self.rotations_y) * (dt * 2)
+
+        # Push overlapping enemies apart
+        self.positions += self.separation_pushes() * (dt * self.speed)
+
+        # Write every result back to the bodies in one pass
+        for enemy, (x, y, z), rotation_y in zip(self.enemies, self.positions.tolist(), self.rotations_y.tolist()):
+            enemy.x, enemy.y, enemy.z = x, y, z
+            enemy.rotation_y = rotation_y
+            enemy.moved = True
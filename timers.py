@@ -0,0 +1,135 @@
+# timers.py
+from timestep import game_clock
+
+# Every level of the wheel has 2 ** SLOT_BITS slots, each covering 2 ** SLOT_BITS times the ticks of the level below
+SLOT_BITS = 8
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+LEVELS = 4
+
+
+class Timer:
+    """A callback due at a tick of the game clock, as returned by TimerWheel.schedule()."""
+    __slots__ = ('due', 'callback', 'args', 'owner', 'bucket')
+
+    def __init__(self, due, callback, args, owner):
+        self.due = due
+        self.callback = callback
+        self.args = args
+        self.owner = owner
+        self.bucket = None
+
+    @property
+    def pending(self):
+        return self.bucket is not None
+
+
+class TimerWheel:
+    """
+        Runs delayed callbacks (expiries, cooldowns, reloads) on the game clock's ticks.
+
+        Timers live in a hierarchical wheel: LEVELS levels of SLOTS slots each. The first
+        level has one slot per tick for the next SLOTS ticks, every level above has slots
+        SLOTS times as long. Scheduling a timer drops it into the slot of the level its delay
+        fits in, and cancelling removes it from that slot, both in O(1) whatever the number
+        of timers. When the first level wraps around, the next slot of the level above is
+        spread over the first level. Since the wheel counts gameplay steps, timers pause with
+        the game clock and behave the same at any frame rate.
+
+        A timer can have an owner. Recycling the owner into a pool calls cancel_owner(), which
+        drops every timer it still has, so a timer can never fire for an object's next life.
+
+        Attributes:
+            clock (FixedTimestep): The clock whose ticks the wheel follows.
+            now (int): The last tick the wheel has run the timers of.
+            wheels (list): For each level, the list of its slots. A slot maps its timers to None.
+            owned (dict): Maps an owner to the dict of its pending timers.
+            pending (int): Number of timers that have not fired or been cancelled yet.
+            fired (int): Number of timers that fired so far.
+
+        Methods:
+            schedule(delay, callback, *args, owner): Runs callback(*args) after delay seconds of game time.
+            cancel(timer): Drops a timer that has not fired yet.
+            cancel_owner(owner): Drops every pending timer of an owner.
+            advance_to(tick): Runs the timers due up to and including a tick of the clock.
+            stats(): Returns the number of pending timers on each level and in total.
+    """
+    def __init__(self, clock):
+        self.clock = clock
+        self.now = clock.ticks
+        self.wheels = [[{} for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self.owned = {}
+        self.pending = 0
+        self.fired = 0
+
+    def __insert(self, timer):
+        delay = timer.due - self.now
+        for level in range(LEVELS - 1):
+            if delay < 1 << (SLOT_BITS * (level + 1)):
+                break
+        else:
+            level = LEVELS - 1
+            # Further ahead than the wheel reaches (over two years of game time), run it as late as it can hold
+            timer.due = min(timer.due, self.now + (1 << (SLOT_BITS * LEVELS)) - 1)
+        bucket = self.wheels[level][(timer.due >> (SLOT_BITS * level)) & SLOT_MASK]
+        bucket[timer] = None
+        timer.bucket = bucket
+
+    def schedule(self, delay, callback, *args, owner=None):
+        # At least one tick, so a timer never runs in the step that scheduled it
+        ticks = max(1, round(delay / self.clock.step))
+        timer = Timer(self.now + ticks, callback, args, owner)
+        self.__insert(timer)
+        self.pending += 1
+        if owner is not None:
+            self.owned.setdefault(owner, {})[timer] = None
+        return timer
+
+    def __remove(self, timer):
+        del timer.bucket[timer]
+        timer.bucket = None
+        self.pending -= 1
+        if timer.owner is not None:
+            timers = self.owned[timer.owner]
+            del timers[timer]
+            if not timers:
+                del self.owned[timer.owner]
+
+    def cancel(self, timer):
+        if timer is not None and timer.bucket is not None:
+            self.__remove(timer)
+
+    def cancel_owner(self, owner):
+        for timer in list(self.owned.get(owner, ())):
+            self.__remove(timer)
+
+    def __cascade(self, level):
+        # Spread the timers of the level's current slot over the levels below
+        bucket = self.wheels[level][(self.now >> (SLOT_BITS * level)) & SLOT_MASK]
+        timers = list(bucket)
+        bucket.clear()
+        for timer in timers:
+            self.__insert(timer)
+
+    def advance_to(self, tick):
+        while self.now < tick:
+            self.now += 1
+            level = 1
+            while level < LEVELS and (self.now & ((1 << (SLOT_BITS * level)) - 1)) == 0:
+                self.__cascade(level)
+                level += 1
+
+            bucket = self.wheels[0][self.now & SLOT_MASK]
+            while bucket:
+                timer = next(iter(bucket))
+                self.__remove(timer)
+                self.fired += 1
+                timer.callback(*timer.args)
+
+    def stats(self):
+        levels = [sum(len(bucket) for bucket in wheel) for wheel in self.wheels]
+        return {'pending': self.pending, 'levels': levels, 'fired': self.fired}
+
+
+# Timers of the game, run on the game clock's ticks
+game_timers = TimerWheel(game_clock)
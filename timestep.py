@@ -0,0 +1,115 @@
+# timestep.py
+
+
+class FixedTimestep:
+    """
+        Turns variable frame times into a whole number of fixed gameplay steps.
+
+        Each frame's time is added to an accumulator, and advance() returns how many
+        steps of step seconds fit into it; what is left over carries into the next frame.
+        When a frame took so long that more than max_steps steps would be due, the extra
+        time is dropped instead of simulated, so one slow frame can't make the following
+        frames slower still. alpha tells how far the frame is between the last two
+        simulated states, for interpolating what is rendered.
+
+        The clock only moves forward by whole steps, so cooldowns measured on it behave
+        the same at any frame rate.
+
+        Attributes:
+            step (float): The length of one gameplay step in seconds.
+            max_steps (int): The most steps simulated in a single frame.
+            accumulator (float): Frame time not simulated yet, always less than one step after advance().
+            time (float): The game clock, seconds simulated so far.
+            ticks (int): Steps simulated so far.
+            alpha (float): The leftover time as a fraction of a step, between 0 and 1.
+            dropped (float): Seconds of frame time thrown away by the max_steps clamp.
+
+        Methods:
+            advance(dt): Adds a frame's time and returns how many steps to simulate.
+            tick(): Moves the game clock forward by one step.
+    """
+    def __init__(self, rate=60, max_steps=5):
+        self.step = 1 / rate
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.time = 0.0
+        self.ticks = 0
+        self.alpha = 0.0
+        self.dropped = 0.0
+
+    def advance(self, dt):
+        self.accumulator += dt
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            # Spiral of death clamp, the game runs slower instead of falling further behind
+            self.dropped += self.accumulator - self.max_steps * self.step
+            steps = self.max_steps
+            self.accumulator = steps * self.step
+        self.accumulator -= steps * self.step
+        self.alpha = self.accumulator / self.step
+        return steps
+
+    def tick(self):
+        self.time += self.step
+        self.ticks += 1
+
+
+class RenderInterpolator:
+    """
+        Renders entities between their last two simulated states.
+
+        Gameplay code keeps reading and writing entity positions as before. Once per frame,
+        restore() puts every entity back where the last step left it, begin_step() remembers
+        where entities are before each step, and show() records the state after the last step
+        and moves each entity to the blend of the two states by alpha. Entities that were moved
+        outside of the steps since they were shown (spawned, loaded, or a recycled bullet fired
+        again) are not blended, they jump straight to their new position.
+
+        Attributes:
+            states (dict): Maps an entity to [previous position, previous rotation_y,
+                           current position, current rotation_y, shown position].
+
+        Methods:
+            restore(): Moves every entity back to its current simulated state.
+            begin_step(entities): Remembers the state of the entities before a step.
+            show(entities, alpha): Records the simulated state and moves the entities to the blended one.
+    """
+    def __init__(self):
+        self.states = {}
+
+    def restore(self):
+        for entity, state in self.states.items():
+            if entity.position == state[4]:
+                entity.position = state[2]
+                entity.rotation_y = state[3]
+            else:
+                position, rotation_y = entity.position, entity.rotation_y
+                state[0], state[1], state[2], state[3] = position, rotation_y, position, rotation_y
+
+    def begin_step(self, entities):
+        for entity in entities:
+            state = self.states.get(entity)
+            if state is None:
+                position, rotation_y = entity.position, entity.rotation_y
+                self.states[entity] = [position, rotation_y, position, rotation_y, None]
+            else:
+                state[0], state[1] = entity.position, entity.rotation_y
+
+    def show(self, entities, alpha):
+        states = {}
+        for entity in entities:
+            state = self.states.get(entity)
+            position, rotation_y = entity.position, entity.rotation_y
+            if state is None:
+                state = [position, rotation_y, position, rotation_y, None]
+            state[2], state[3] = position, rotation_y
+            entity.position = state[0] + (position - state[0]) * alpha
+            entity.rotation_y = state[1] + (rotation_y - state[1]) * alpha
+            state[4] = entity.position
+            states[entity] = state
+        # Entities that are gone (killed enemies, finished bullets) are forgotten
+        self.states = states
+
+
+# The game clock every gameplay step and cooldown runs on
+game_clock = FixedTimestep(rate=60, max_steps=5)
@@ -1,8 +1,10 @@
 # weapon.py
-from ursina import *
+from ursina import Entity, Vec3, camera, color, destroy, scene
 from ursina.shaders import unlit_shader
-from ursina import Audio
-import enemy
+from sound import sounds, SHOOT_PRIORITY
+from enemy import ENEMY_COLLIDE_MASK
+from assets import assets
+from panda3d.core import CollisionTraverser, CollisionNode, CollisionHandlerQueue, CollisionRay, BitMask32
 
 
 class Weapon:
@@ -14,74 +16,239 @@ class Weapon:
 
         Attributes:
             __entity (Entity): The entity representing the weapon in the game world.
+            __bullet_pool (BulletPool): The pool that fired bullets are taken from.
+            __hitscan (HitscanResolver): Resolves shots as rays when hitscan mode is on, otherwise None.
 
         Methods:
-            shoot(): Public interface to fire the weapon, returning a Bullet instance.
+            shoot(): Public interface to fire the weapon, returning a Bullet instance,
+                     or True for a queued hitscan shot.
+            resolve_shots(): Resolves the hitscan shots queued this frame.
             entity: Property that returns the weapon's entity for manipulation in the game.
+            bullet_pool: Property that returns the weapon's bullet pool.
+            hitscan: Property that tells whether the weapon fires hitscan shots.
     """
-    def __init__(self, parent):
-        self.__entity = Entity(parent=parent, model='assets/MP5K', color=color.black, scale=(0.02, 0.01, 0.05),
+    def __init__(self, parent, bullet_capacity=64, hitscan=False):
+        self.__entity = Entity(parent=parent, model=assets.model('assets/MP5K'), color=color.black, scale=(0.02, 0.01, 0.05),
                                position=Vec3(0.5, -0.5, 1.5), shader=unlit_shader)
+        self.__bullet_pool = BulletPool(capacity=bullet_capacity)
+        self.__hitscan = HitscanResolver() if hitscan else None
 
     # Private shoot method
     def __shoot(self):
         bullet_position = self.__entity.world_position + self.__entity.forward * 1
         bullet_direction = camera.forward.normalized()
-        Audio('assets/shoot_sound.mp3', autoplay=True)
-        bullet = Bullet(position=bullet_position, direction=bullet_direction)
+        sounds.play('assets/shoot_sound.mp3', priority=SHOOT_PRIORITY)
+        if self.__hitscan is not None:
+            self.__hitscan.queue_shot(origin=bullet_position, direction=bullet_direction)
+            return True
+        bullet = self.__bullet_pool.acquire(position=bullet_position, direction=bullet_direction)
         return bullet
 
     # Public shoot interface
     def shoot(self):
         return self.__shoot()
 
+    def resolve_shots(self):
+        if self.__hitscan is not None:
+            self.__hitscan.resolve()
+
     @property
     def entity(self):
         return self.__entity
 
+    @property
+    def bullet_pool(self):
+        return self.__bullet_pool
+
+    @property
+    def hitscan(self):
+        return self.__hitscan is not None
+
+
+class HitscanResolver:
+    """
+        Resolves instant-hit shots as rays, without creating a Bullet per shot.
+
+        Shots fired during a frame are queued and then cast together in a single
+        collision traversal. The rays only collide with enemy colliders, and the
+        nearest hit of each ray damages the enemy through its parent_enemy link.
+
+        Attributes:
+            max_distance (float): Hits further away than this are ignored.
+            damage (int): The damage a shot deals to the enemy it hits.
+            pending (list): (origin, direction) pairs queued since the last resolve.
+            traverser (CollisionTraverser): Casts every queued ray in one traversal.
+            queue (CollisionHandlerQueue): Collects the hits of the traversal.
+            rays (list): Reusable (node path, CollisionRay) pairs, one per queued shot.
+
+        Methods:
+            queue_shot(origin, direction): Queues a shot for the next resolve.
+            resolve(): Casts all queued shots and applies damage for their hits.
+    """
+    def __init__(self, max_distance=9999, damage=7):
+        self.max_distance = max_distance
+        self.damage = damage
+        self.pending = []
+        self.traverser = CollisionTraverser()
+        self.queue = CollisionHandlerQueue()
+        self.rays = []
+
+    def queue_shot(self, origin, direction):
+        self.pending.append((Vec3(origin), Vec3(direction)))
+
+    def __add_ray(self):
+        node = CollisionNode('hitscan_ray')
+        node.setFromCollideMask(ENEMY_COLLIDE_MASK)
+        node.setIntoCollideMask(BitMask32.allOff())
+        ray = CollisionRay()
+        node.addSolid(ray)
+        node_path = scene.attachNewNode(node)
+        self.traverser.addCollider(node_path, self.queue)
+        self.rays.append((node_path, ray))
+
+    def resolve(self):
+        if not self.pending:
+            return
+
+        while len(self.rays) < len(self.pending):
+            self.__add_ray()
+        for index, (node_path, ray) in enumerate(self.rays):
+            if index < len(self.pending):
+                origin, direction = self.pending[index]
+                ray.setOrigin(origin)
+                ray.setDirection(direction)
+                node_path.unstash()
+            else:
+                node_path.stash()
+
+        self.traverser.traverse(scene)
+        self.queue.sortEntries()
+
+        # Entries are sorted nearest first, so the first one for each ray is its hit
+        hit_rays = set()
+        for entry in self.queue.getEntries():
+            ray_node = entry.getFromNodePath()
+            if ray_node in hit_rays:
+                continue
+            hit_rays.add(ray_node)
+            if (entry.getSurfacePoint(scene) - entry.getFrom().getOrigin()).length() > self.max_distance:
+                continue
+            hit_entity = entry.getIntoNodePath().parent.getPythonTag('Entity')
+            parent_enemy = getattr(hit_entity, 'parent_enemy', None)
+            if parent_enemy is not None and parent_enemy.health > 0:
+                parent_enemy.decrement_health(self.damage)
+
+        self.queue.clearEntries()
+        self.pending.clear()
+
+
+class BulletPool:
+    """
+        A fixed-capacity pool of Bullet entities that are recycled instead of destroyed.
+
+        Bullets are created on demand until the pool reaches its capacity. After that,
+        finished bullets are disabled and handed out again, so sustained fire does not
+        create or destroy any entities. When every bullet is in flight, the oldest one
+        is recycled for the new shot.
+
+        Attributes:
+            capacity (int): The maximum number of bullets the pool will ever create.
+            bullets (list): Every bullet created by the pool.
+            free (list): Disabled bullets that are ready to be fired again.
+            active (list): Bullets currently in flight, oldest first.
+            high_water_mark (int): The highest number of bullets that were in flight at once.
+            recycled (int): How many shots reused an existing bullet.
+
+        Methods:
+            acquire(position, direction): Fires a bullet from the pool and returns it.
+            release(bullet): Returns a finished bullet to the free list.
+            stats(): Returns a dictionary with the pool's capacity and usage counters.
+    """
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.bullets = []
+        self.free = []
+        self.active = []
+        self.high_water_mark = 0
+        self.recycled = 0
+
+    def acquire(self, position, direction):
+        if not self.free and len(self.bullets) >= self.capacity:
+            # Every bullet is in flight, so cut the oldest one short
+            self.active[0].destroy_bullet()
+
+        if self.free:
+            bullet = self.free.pop()
+            bullet.fire(position, direction)
+            self.recycled += 1
+        else:
+            bullet = Bullet(position=position, direction=direction, pool=self)
+            self.bullets.append(bullet)
+
+        self.active.append(bullet)
+        self.high_water_mark = max(self.high_water_mark, len(self.active))
+        return bullet
+
+    def release(self, bullet):
+        self.active.remove(bullet)
+        self.free.append(bullet)
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "created": len(self.bullets),
+            "active": len(self.active),
+            "free": len(self.free),
+            "high_water_mark": self.high_water_mark,
+            "recycled": self.recycled,
+        }
+
 class Bullet(Entity):
     """
         Represents a bullet fired from a weapon in the game.
 
-        This class handles the bullet's movement, collision detection, and
-        interaction with other entities in the game world.
+        This class holds the bullet's visual and flight state. Its movement, lifetime,
+        collision detection and interaction with enemies are run by the game simulation,
+        the bullet only shows its body (see SimulationView).
 
         Attributes:
             direction (Vec3): The normalized direction vector in which the bullet moves.
             speed (float): The speed of the bullet, adjustable as needed.
             world_parent (Scene): The scene in which the bullet exists.
             alive (bool): Indicates whether the bullet is active and should be updated.
+            pool (BulletPool): The pool the bullet is returned to, or None to destroy it instead.
+            generation (int): Counts how many times the bullet has been fired.
 
         Methods:
-            update(): Updates the bullet's position based on its direction and speed,
-                      checks for collisions, and applies damage to hit entities.
-            destroy_bullet(): Safely deactivates and removes the bullet from the scene.
+            fire(position, direction): Places the bullet and starts its flight.
+            destroy_bullet(): Safely deactivates the bullet and returns it to its pool or removes it from the scene.
+            sync_from(body): Copies the bullet's position from its simulation body, ending the flight with it.
     """
-    def __init__(self, position, direction):
+    def __init__(self, position, direction, pool=None):
         super().__init__(model='cube', scale=0.1, color=color.red, position=position, collider='box')
-        self.direction = direction.normalized()  # Direction vector in which the bullet should move
         self.speed = 200  # Adjust speed as necessary
         self.world_parent = scene
-        self.alive = True
-        invoke(self.destroy_bullet, delay=3)  # Automatically destroy bullet after 3 seconds
-
-    def update(self):
-        if self.alive:
-            self.position += self.direction * self.speed * time.dt
-            hit_info = self.intersects(ignore=[self])
-            if hit_info.hit:
-                print(hit_info.entity.name)
-                # Step 1: Check if the hit entity has an attribute pointing back to the parent Enemy class
-                if hasattr(hit_info.entity, 'parent_enemy'):
-                    # Step 2: Access the parent enemy and call its methods
-                    parent_enemy = hit_info.entity.parent_enemy
-                    if isinstance(parent_enemy, enemy.Enemy) or isinstance(parent_enemy, enemy.CameraMan):
-                        parent_enemy.decrement_health(7)  # Reduce health by 7
-                # Destroy bullet after collision
-                self.destroy_bullet()
+        self.pool = pool
+        self.generation = 0
+        self.fire(position, direction)
 
+    def fire(self, position, direction):
+        self.position = position
+        self.direction = direction.normalized()  # Direction vector in which the bullet should move
+        self.alive = True
+        self.enabled = True
+        self.generation += 1
 
     def destroy_bullet(self):
         if self.alive:
             self.alive = False
-            destroy(self)
\ No newline at end of file
+            if self.pool is None:
+                destroy(self)
+            else:
+                self.enabled = False
+                self.pool.release(self)
+
+    def sync_from(self, body):
+        self.position = Vec3(body.x, body.y, body.z)
+        if not body.alive:
+            self.destroy_bullet()